@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Silence trimming for synthesized clips
+Google TTS pads every clip with silence at both ends, which the caller hears
+as extra latency and as gaps between back-to-back translations. Clips are
+decoded from their WAV container (8 kHz mu-law or 16-bit PCM), leading and
+trailing frames below an energy threshold are cut with a small margin kept,
+and the new edges are faded so the cut does not click.
+"""
+
+import array
+import struct
+import audioop
+
+WAVE_PCM = 1
+WAVE_MULAW = 7
+
+
+def parse_wav(data):
+    """Return (format_tag, sample_rate, bits, payload) from a RIFF/WAVE clip"""
+    if len(data) < 12 or data[:4] != b'RIFF' or data[8:12] != b'WAVE':
+        raise ValueError("not a WAV clip")
+    fmt = payload = None
+    offset = 12
+    while offset + 8 <= len(data):
+        chunk_id = data[offset:offset + 4]
+        size = struct.unpack('<I', data[offset + 4:offset + 8])[0]
+        body = data[offset + 8:offset + 8 + size]
+        if chunk_id == b'fmt ':
+            fmt = body
+        elif chunk_id == b'data':
+            payload = body
+        offset += 8 + size + (size & 1)  # chunks are word aligned
+    if fmt is None or payload is None:
+        raise ValueError("WAV clip without fmt/data chunks")
+    format_tag, channels, sample_rate, _, _, bits = struct.unpack('<HHIIHH', fmt[:16])
+    if channels != 1 or (format_tag, bits) not in ((WAVE_PCM, 16), (WAVE_MULAW, 8)):
+        raise ValueError(f"unsupported WAV format {format_tag}/{bits}-bit/{channels}ch")
+    return format_tag, sample_rate, bits, payload
+
+
+def build_wav(payload, sample_rate, format_tag, bits):
+    """RIFF/WAVE container around raw mono samples (format 1 = PCM, 7 = mu-law)"""
+    block_align = bits // 8
+    if format_tag == WAVE_PCM:
+        fmt = struct.pack('<HHIIHH', format_tag, 1, sample_rate, sample_rate * block_align, block_align, bits)
+        extra = b''
+    else:
+        fmt = struct.pack('<HHIIHHH', format_tag, 1, sample_rate, sample_rate * block_align, block_align, bits, 0)
+        extra = b'fact' + struct.pack('<II', 4, len(payload) // block_align)
+    body = (b'WAVE' + b'fmt ' + struct.pack('<I', len(fmt)) + fmt + extra +
+            b'data' + struct.pack('<I', len(payload)) + payload)
+    return b'RIFF' + struct.pack('<I', len(body)) + body
+
+
+def fade_edges(pcm, fade_samples):
+    """Linear fade-in and fade-out over the first and last fade_samples of 16-bit PCM"""
+    samples = array.array('h', pcm)
+    fade_samples = min(fade_samples, len(samples) // 2)
+    for i in range(fade_samples):
+        gain = i / fade_samples
+        samples[i] = int(samples[i] * gain)
+        samples[-1 - i] = int(samples[-1 - i] * gain)
+    return samples.tobytes()
+
+
+def trim_silence(clip, threshold=300, frame_ms=10, margin_ms=40, fade_ms=10):
+    """
+    Trim leading/trailing silence from a WAV clip.
+    Returns (clip, seconds_removed); clips that are silent throughout are returned unchanged.
+    """
+    format_tag, sample_rate, bits, payload = parse_wav(clip)
+    pcm = audioop.ulaw2lin(payload, 2) if format_tag == WAVE_MULAW else payload
+
+    frame_bytes = sample_rate * frame_ms // 1000 * 2
+    frames = len(pcm) // frame_bytes
+    voiced = [i for i in range(frames) if audioop.rms(pcm[i * frame_bytes:(i + 1) * frame_bytes], 2) > threshold]
+    if not voiced:
+        return clip, 0.0
+
+    margin = margin_ms // frame_ms
+    start = max(0, voiced[0] - margin) * frame_bytes
+    end = min(len(pcm), (voiced[-1] + 1 + margin) * frame_bytes)
+    if start == 0 and end == len(pcm):
+        return clip, 0.0
+
+    trimmed = fade_edges(pcm[start:end], sample_rate * fade_ms // 1000)
+    removed = (len(pcm) - len(trimmed)) / 2 / sample_rate
+    if format_tag == WAVE_MULAW:
+        trimmed = audioop.lin2ulaw(trimmed, 2)
+    return build_wav(trimmed, sample_rate, format_tag, bits), removed
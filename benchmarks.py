@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for the per-frame and per-utterance hot paths
+Covers mu-law decoding (audioop and replacements), VAD RMS loops, language
+detection, translation memory hits and misses, transcript normalization, frequent phrase counting, TTS silence trimming, event logging,
+Twilio media frame parsing and TwiML rendering. Results are compared against
+benchmark_baselines.json and the run fails when a hot path regresses beyond
+the threshold.
+
+Timings are normalised by a fixed pure-Python calibration loop so baselines
+recorded on one machine stay meaningful on another.
+
+Usage:
+    python benchmarks.py                 # compare against baselines
+    python benchmarks.py --update        # re-record baselines
+    python benchmarks.py --filter ulaw   # run a subset
+"""
+
+import os
+import sys
+import json
+import array
+import base64
+import struct
+import audioop
+import argparse
+import itertools
+import contextlib
+import statistics
+import timeit
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baselines.json')
+DEFAULT_THRESHOLD = 0.25  # fail when a benchmark is 25% slower than its baseline
+
+# 20 ms Twilio frame and the 500 ms batch media_stream_translator hands to STT
+FRAME_ULAW = bytes((i * 37) & 0xFF for i in range(160))
+BATCH_ULAW = FRAME_ULAW * 25
+BATCH_PCM = audioop.ulaw2lin(BATCH_ULAW, 2)
+MEDIA_MESSAGE = json.dumps({
+    'event': 'media',
+    'streamSid': 'MZ' + '0' * 32,
+    'media': {'track': 'inbound', 'chunk': '42', 'timestamp': '840',
+              'payload': base64.b64encode(FRAME_ULAW).decode('ascii')}
+})
+
+
+# ---------------------------------------------------------------------------
+# mu-law decoding candidates
+# ---------------------------------------------------------------------------
+
+def _ulaw_sample(byte):
+    """G.711 mu-law byte -> 16-bit linear sample"""
+    byte = ~byte & 0xFF
+    sign = byte & 0x80
+    exponent = (byte >> 4) & 0x07
+    mantissa = byte & 0x0F
+    sample = ((mantissa << 3) + 0x84) << exponent
+    sample -= 0x84
+    return -sample if sign else sample
+
+
+ULAW_TABLE = [_ulaw_sample(b) for b in range(256)]
+ULAW_TABLE_BYTES = [struct.pack('<h', s) for s in ULAW_TABLE]
+
+
+def ulaw2lin_table_join(data):
+    """Pure-Python replacement: per-byte lookup of pre-packed samples"""
+    table = ULAW_TABLE_BYTES
+    return b''.join([table[b] for b in data])
+
+
+def ulaw2lin_table_array(data):
+    """Pure-Python replacement: lookup into an array('h') buffer"""
+    table = ULAW_TABLE
+    return array.array('h', [table[b] for b in data]).tobytes()
+
+
+try:
+    import numpy
+    ULAW_NUMPY = numpy.array(ULAW_TABLE, dtype='<i2')
+
+    def ulaw2lin_numpy(data):
+        """Vectorised replacement (only when numpy is installed)"""
+        return ULAW_NUMPY[numpy.frombuffer(data, dtype=numpy.uint8)].tobytes()
+except ImportError:
+    ulaw2lin_numpy = None
+
+
+# ---------------------------------------------------------------------------
+# Benchmark registry
+# ---------------------------------------------------------------------------
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    def register(fn):
+        BENCHMARKS[name] = fn
+        return fn
+    return register
+
+
+def calibration():
+    """Fixed pure-Python workload every other timing is normalised against"""
+    total = 0
+    for i in range(1000):
+        total += i * i
+    return total
+
+
+def load_translators():
+    """
+    Import the translator modules with the provider emulators in place so no
+    credentials or network are needed
+    """
+    from provider_emulators import start_emulators, emulator_env
+    emulators, control = start_emulators(services=('speech', 'tts', 'translate', 'twilio'))
+    os.environ.update(emulator_env(emulators))
+    import media_stream_translator
+    import optimized_twilio_translator
+    return media_stream_translator, optimized_twilio_translator
+
+
+def register_benchmarks(mst, ott):
+    @benchmark('ulaw2lin.audioop.frame')
+    def _():
+        return lambda: audioop.ulaw2lin(FRAME_ULAW, 2)
+
+    @benchmark('ulaw2lin.audioop.batch')
+    def _():
+        return lambda: audioop.ulaw2lin(BATCH_ULAW, 2)
+
+    @benchmark('ulaw2lin.table_join.batch')
+    def _():
+        assert ulaw2lin_table_join(BATCH_ULAW) == BATCH_PCM
+        return lambda: ulaw2lin_table_join(BATCH_ULAW)
+
+    @benchmark('ulaw2lin.table_array.batch')
+    def _():
+        assert ulaw2lin_table_array(BATCH_ULAW) == BATCH_PCM
+        return lambda: ulaw2lin_table_array(BATCH_ULAW)
+
+    if ulaw2lin_numpy:
+        @benchmark('ulaw2lin.numpy.batch')
+        def _():
+            assert ulaw2lin_numpy(BATCH_ULAW) == BATCH_PCM
+            return lambda: ulaw2lin_numpy(BATCH_ULAW)
+
+    @benchmark('vad.detect_voice.frame')
+    def _():
+        vad = ott.FastVoiceActivityDetector()
+        payload = base64.b64encode(FRAME_ULAW)
+        return lambda: vad.detect_voice(payload)
+
+    # Both decode the mu-law frame to 16-bit PCM first, as the media handler does
+    @benchmark('vad.rms_loop.frame')
+    def _():
+        def rms():
+            samples = struct.unpack('<160h', audioop.ulaw2lin(FRAME_ULAW, 2))
+            return (sum(x * x for x in samples) / len(samples)) ** 0.5
+        return rms
+
+    @benchmark('vad.audioop_rms.frame')
+    def _():
+        return lambda: audioop.rms(audioop.ulaw2lin(FRAME_ULAW, 2), 2)
+
+    @benchmark('detect_language.english')
+    def _():
+        text = "I would like to book an appointment for tomorrow afternoon."
+        return lambda: mst.detect_language(text)
+
+    @benchmark('detect_language.hindi')
+    def _():
+        text = "मेरा पता बयालीस पार्क स्ट्रीट है।"
+        return lambda: mst.detect_language(text)
+
+    @benchmark('detect_language.hinglish')
+    def _():
+        text = "aap kal aa sakte ho kya"
+        return lambda: mst.detect_language(text)
+
+    @benchmark('detect_language.stt_code')
+    def _():
+        text = "aap kal aa sakte ho kya"
+        return lambda: mst.detect_language(text, 'hi-in')
+
+    @benchmark('translate_text.cache_hit')
+    def _():
+        text = "Hello, how are you?"
+        mst.translation_memory.add(text, 'en', 'hi', "नमस्ते, आप कैसे हैं?")
+        return lambda: mst.translate_text(text, 'en', 'hi')
+
+    @benchmark('translate_text.fuzzy_hit')
+    def _():
+        mst.translation_memory.add("Can you please confirm the delivery address?", 'en', 'hi',
+                                   "क्या आप कृपया डिलीवरी का पता पुष्टि कर सकते हैं?")
+        text = "can you please confirm the delivery address okay"
+        assert mst.translate_text(text, 'en', 'hi') is not None
+        return lambda: mst.translate_text(text, 'en', 'hi')
+
+    @benchmark('translation_memory.miss')
+    def _():
+        text = "I will call you back after the meeting tomorrow"
+        return lambda: mst.translation_memory.lookup(text, 'en', 'hi')
+
+    @benchmark('text_normalizer.normalize')
+    def _():
+        from text_normalizer import TextNormalizer
+        normalizer = TextNormalizer()
+        text = "um, I I want to, uh, change the delivery address to 1,500 Main street please"
+        assert len(normalizer.normalize(text, 'en')) < len(text)
+        return lambda: normalizer.normalize(text, 'en')
+
+    @benchmark('phrase_tracker.observe_full')
+    def _():
+        from phrase_tracker import PhraseTracker
+        tracker = PhraseTracker(capacity=1000)
+        for i in range(1000):
+            tracker.observe('transcript', 'en', f"earlier sentence number {i}")
+        # Cycling through 4x the capacity, every phrase has been evicted again before it comes back
+        texts = itertools.cycle([f"a sentence never heard before {i}" for i in range(4000)])
+
+        def observe():  # worst case: every phrase is new and evicts the least counted one
+            tracker.observe('transcript', 'en', next(texts))
+        return observe
+
+    @benchmark('tts.trim_silence')
+    def _():
+        from audio_trim import build_wav, trim_silence, WAVE_MULAW
+        tone = audioop.mul(BATCH_PCM, 2, 4) * 4
+        padding = b'\x00\x00' * 1200
+        clip = build_wav(audioop.lin2ulaw(padding + tone + padding, 2), 8000, WAVE_MULAW, 8)
+        assert trim_silence(clip)[1] > 0.2
+        return lambda: trim_silence(clip)
+
+    @benchmark('event_log.event')
+    def _():
+        from event_log import EventLog
+        log = EventLog()  # no writer thread: only the caller's cost is timed
+
+        def emit():
+            log.event('pipeline', 'delivered', conference='translator-CA0', role='receiver', rate=1.15)
+            if len(log.queue) >= 1000:
+                log.queue.clear()
+        return emit
+
+    @benchmark('event_log.sampled_frame')
+    def _():
+        from event_log import EventLog
+        log = EventLog(level='debug')
+
+        def emit():
+            log.sampled('stream', 'chunk', stream='translator-CA0:caller', queue=0)
+            if len(log.queue) >= 1000:
+                log.queue.clear()
+        return emit
+
+    @benchmark('media_frame.json_loads')
+    def _():
+        return lambda: json.loads(MEDIA_MESSAGE)
+
+    @benchmark('media_frame.b64decode')
+    def _():
+        payload = json.loads(MEDIA_MESSAGE)['media']['payload']
+        return lambda: base64.b64decode(payload)
+
+    @benchmark('media_frame.parse_and_decode')
+    def _():
+        def parse():
+            data = json.loads(MEDIA_MESSAGE)
+            if data.get('event') == 'media':
+                return base64.b64decode(data['media']['payload'])
+        return parse
+
+    @benchmark('twiml.receiver_twiml')
+    def _():
+        sink = open(os.devnull, 'w')
+
+        def render():  # receiver_twiml prints call setup progress and reads no request; time the rendering only
+            with contextlib.redirect_stdout(sink):
+                return mst.receiver_twiml('translator-CA1')
+        return render
+
+    @benchmark('twiml.play_tts')
+    def _():
+        def render():
+            with mst.app.test_request_context('/play-tts/tts_1.mp3'):
+                return mst.play_tts('tts_1.mp3')
+        return render
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def measure(fn, repeat=5, min_time=0.2):
+    """Median seconds per call over `repeat` autoranged runs"""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    runs = timer.repeat(repeat=repeat, number=number)
+    return statistics.median(runs) / number
+
+
+def run(selected, repeat):
+    calibration_seconds = measure(calibration, repeat)
+    results = {}
+    for name in selected:
+        fn = BENCHMARKS[name]()
+        seconds = measure(fn, repeat)
+        results[name] = {
+            'ns_per_op': round(seconds * 1e9, 1),
+            'relative': round(seconds / calibration_seconds, 5)
+        }
+    return calibration_seconds, results
+
+
+def compare(results, baselines, threshold):
+    """Return (name, baseline, current, change) rows and the list of regressions"""
+    rows, regressions = [], []
+    for name, result in results.items():
+        baseline = baselines.get(name)
+        if not baseline:
+            rows.append((name, None, result, None))
+            continue
+        change = result['relative'] / baseline['relative'] - 1
+        rows.append((name, baseline, result, change))
+        if change > threshold:
+            regressions.append(name)
+    return rows, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--update', action='store_true', help='record the current run as the new baselines')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='allowed slowdown before failing (0.25 = 25%%)')
+    parser.add_argument('--filter', default='', help='only run benchmarks whose name contains this')
+    parser.add_argument('--repeat', type=int, default=5, help='timing repetitions per benchmark')
+    parser.add_argument('--baselines', default=BASELINE_FILE, help='baseline file')
+    args = parser.parse_args()
+
+    mst, ott = load_translators()
+    register_benchmarks(mst, ott)
+    selected = [name for name in BENCHMARKS if args.filter in name]
+
+    print(f"\n{'='*60}")
+    print(f"⏱️  HOT PATH BENCHMARKS ({len(selected)} selected)")
+    print(f"{'='*60}")
+    calibration_seconds, results = run(selected, args.repeat)
+    print(f"Calibration loop: {calibration_seconds * 1e6:.1f} µs\n")
+
+    baselines = {}
+    if os.path.exists(args.baselines):
+        with open(args.baselines) as f:
+            baselines = json.load(f).get('benchmarks', {})
+
+    if args.update:
+        baselines.update(results)
+        with open(args.baselines, 'w') as f:
+            json.dump({'threshold': args.threshold, 'benchmarks': dict(sorted(baselines.items()))}, f, indent=2)
+            f.write('\n')
+        for name, result in results.items():
+            print(f"   {name:<32} {result['ns_per_op']:>12,.0f} ns/op")
+        print(f"\n💾 Baselines written to {args.baselines}")
+        return 0
+
+    rows, regressions = compare(results, baselines, args.threshold)
+    print(f"   {'benchmark':<32} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, baseline, result, change in rows:
+        base = f"{baseline['ns_per_op']:,.0f}" if baseline else '-'
+        delta = f"{change:+.0%}" if change is not None else 'new'
+        flag = '  ❌' if name in regressions else ''
+        print(f"   {name:<32} {base:>12} {result['ns_per_op']:>12,.0f} {delta:>8}{flag}")
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} hot path(s) regressed more than {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    print(f"\n✅ No hot path regressed more than {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Bulkheads: a bounded worker pool per pipeline stage
+Each stage (translation pipeline, Twilio REST, ...) gets its own workers and
+its own queue limit, so a slow provider only backs up the stage that calls
+it. When a stage's queue is full the configured overflow policy applies:
+
+    reject       - refuse the new job (submit returns None)
+    drop_oldest  - cancel the oldest queued job to make room
+    caller_runs  - run the job in the submitting thread
+"""
+
+import time
+import threading
+from collections import deque
+from concurrent.futures import Future
+
+OVERFLOW_POLICIES = ('reject', 'drop_oldest', 'caller_runs')
+
+
+class Bulkhead:
+    def __init__(self, name, workers, max_queue, overflow='reject'):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"unknown overflow policy {overflow!r} for pool {name}")
+        self.name = name
+        self.workers = workers
+        self.max_queue = max_queue
+        self.overflow = overflow
+
+        self.queue = deque()
+        self.condition = threading.Condition()
+        self.active = 0
+
+        self.completed = 0
+        self.rejected = 0
+        self.dropped = 0
+        self.ran_in_caller = 0
+        self.peak_queue = 0
+        self.queue_wait = 0.0
+
+        for i in range(workers):
+            threading.Thread(target=self._worker, name=f"{name}-{i}", daemon=True).start()
+
+    def submit(self, fn, *args, **kwargs):
+        """Queue fn(*args, **kwargs); returns a Future, or None if the job was rejected"""
+        future = Future()
+        dropped = None
+        with self.condition:
+            if len(self.queue) >= self.max_queue:
+                if self.overflow == 'reject':
+                    self.rejected += 1
+                    return None
+                if self.overflow == 'caller_runs':
+                    self.ran_in_caller += 1
+                    future = None
+                else:
+                    dropped = self.queue.popleft()[0]
+                    self.dropped += 1
+            if future is not None:
+                self.queue.append((future, fn, args, kwargs, time.time()))
+                self.peak_queue = max(self.peak_queue, len(self.queue))
+                self.condition.notify()
+
+        if dropped is not None:
+            dropped.cancel()
+        if future is None:
+            future = Future()
+            self._run(future, fn, args, kwargs)
+        return future
+
+    def _run(self, future, fn, args, kwargs):
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+
+    def _worker(self):
+        while True:
+            with self.condition:
+                while not self.queue:
+                    self.condition.wait()
+                future, fn, args, kwargs, queued_at = self.queue.popleft()
+                self.active += 1
+                self.queue_wait += time.time() - queued_at
+            try:
+                self._run(future, fn, args, kwargs)
+            finally:
+                with self.condition:
+                    self.active -= 1
+                    self.completed += 1
+
+    def snapshot(self):
+        return {
+            'workers': self.workers,
+            'active': self.active,
+            'queued': len(self.queue),
+            'max_queue': self.max_queue,
+            'peak_queue': self.peak_queue,
+            'overflow': self.overflow,
+            'completed': self.completed,
+            'rejected': self.rejected,
+            'dropped': self.dropped,
+            'ran_in_caller': self.ran_in_caller,
+            'avg_queue_wait_ms': round(self.queue_wait / self.completed * 1000, 1) if self.completed else 0
+        }
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Per-call audio archive for QA and replay benchmarks
+The media loop and the pipeline only append records to a deque (an atomic,
+lock-free handoff under the GIL); a background OS thread writes them in
+batches. Each call gets a directory with one 8 kHz mu-law WAV per track -
+both input legs as received and the translated audio played to each leg -
+kept aligned to the call's wall clock, plus index.jsonl with the utterance
+boundaries (track, seconds, byte offset into the WAV) so a replay can seek
+straight to any utterance. WAV headers are patched on every flush, so files
+stay playable even if the worker dies mid-call. Records that arrive after a
+call is closed (a frame still in flight, a late final transcript) are
+dropped rather than reopening the finished recording.
+"""
+
+import os
+import json
+import time
+import struct
+from collections import deque, OrderedDict
+
+from audio_trim import parse_wav, build_wav, WAVE_MULAW
+
+try:
+    from gevent import monkey
+    _start_thread = monkey.get_original('_thread', 'start_new_thread')
+    _sleep = monkey.get_original('time', 'sleep')
+except ImportError:
+    import _thread
+    _start_thread = _thread.start_new_thread
+    _sleep = time.sleep
+
+SAMPLE_RATE = 8000
+SILENCE = b'\xff'              # mu-law zero
+HEADER = build_wav(b'', SAMPLE_RATE, WAVE_MULAW, 8)
+FACT_OFFSET = HEADER.index(b'fact') + 8
+DATA_SIZE_OFFSET = len(HEADER) - 4
+ALIGN_TOLERANCE = 0.2          # seconds of arrival jitter absorbed before padding with silence
+
+_AUDIO, _CLIP, _MARK, _CLOSE = range(4)
+
+
+class Track:
+    __slots__ = ('file', 'length', 'dirty')
+
+    def __init__(self, path):
+        try:
+            self.file = open(path, 'x+b')
+            self.file.write(HEADER)
+            self.length = 0
+        except FileExistsError:
+            # Never truncate a finished track: append after what it already holds
+            self.file = open(path, 'r+b')
+            self.length = max(self.file.seek(0, os.SEEK_END) - len(HEADER), 0)
+        self.dirty = False
+
+    def append(self, payload):
+        self.file.write(payload)
+        self.length += len(payload)
+        self.dirty = True
+
+    def patch_header(self):
+        """Fix up the RIFF, fact and data sizes for what has been written so far"""
+        self.file.seek(4)
+        self.file.write(struct.pack('<I', len(HEADER) - 8 + self.length))
+        self.file.seek(FACT_OFFSET)
+        self.file.write(struct.pack('<I', self.length))
+        self.file.seek(DATA_SIZE_OFFSET)
+        self.file.write(struct.pack('<I', self.length))
+        self.file.seek(0, os.SEEK_END)
+        self.file.flush()
+        self.dirty = False
+
+
+class Recording:
+    """Writer-side state of one call; only the writer thread touches it"""
+
+    def __init__(self, directory, started):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.started = started
+        self.tracks = {}
+        self.index = open(os.path.join(directory, 'index.jsonl'), 'a', encoding='utf-8')
+
+    def track(self, name):
+        track = self.tracks.get(name)
+        if track is None:
+            track = self.tracks[name] = Track(os.path.join(self.directory, f"{name}.wav"))
+        return track
+
+    def align(self, track, ts):
+        """Pad with silence up to the record's place on the call's timeline"""
+        behind = int((ts - self.started) * SAMPLE_RATE) - track.length
+        if behind > ALIGN_TOLERANCE * SAMPLE_RATE:
+            track.append(SILENCE * behind)
+
+    def mark(self, track_name, ts, kind, fields):
+        track = self.track(track_name)
+        entry = {'track': track_name, 't': round(ts - self.started, 3),
+                 'offset': len(HEADER) + track.length, 'event': kind}
+        entry.update(fields)
+        self.index.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    def flush(self):
+        for track in self.tracks.values():
+            if track.dirty:
+                track.patch_header()
+        self.index.flush()
+
+    def close(self):
+        self.flush()
+        for track in self.tracks.values():
+            track.file.close()
+        self.index.close()
+
+
+class CallArchive:
+    def __init__(self, directory, max_queue=20000, flush_interval=0.5, max_closed=10000):
+        self.directory = directory
+        self.max_queue = max_queue
+        self.flush_interval = flush_interval
+        self.max_closed = max_closed
+        os.makedirs(directory, exist_ok=True)
+
+        self.queue = deque()
+        self.closed = OrderedDict()    # recently closed conferences, whose late records are dropped (writer only)
+        self.started = False
+
+        self.calls = 0
+        self.frames = 0
+        self.clips = 0
+        self.bytes_written = 0
+        self.dropped = 0
+        self.late_dropped = 0
+        self.write_errors = 0
+
+    def _put(self, record):
+        if len(self.queue) >= self.max_queue:
+            self.dropped += 1
+            return
+        self.queue.append(record)
+
+    def audio(self, conference, track, ulaw):
+        """One frame of a leg's inbound 8 kHz mu-law audio"""
+        self._put((_AUDIO, conference, track, time.time(), ulaw))
+
+    def clip(self, conference, track, path, text=None):
+        """A synthesized clip (WAV file) played to a leg; the writer reads the file"""
+        self._put((_CLIP, conference, track, time.time(), (path, text)))
+
+    def mark(self, conference, track, kind, **fields):
+        """An utterance boundary on a track, e.g. a final transcript"""
+        self._put((_MARK, conference, track, time.time(), (kind, fields)))
+
+    def close(self, conference):
+        self.queue.append((_CLOSE, conference, None, time.time(), None))
+
+    def _apply(self, recordings, record):
+        kind, conference, track_name, ts, data = record
+        recording = recordings.get(conference)
+        if kind == _CLOSE:
+            if recording:
+                recording.close()
+                del recordings[conference]
+            self.closed[conference] = True
+            if len(self.closed) > self.max_closed:
+                self.closed.popitem(last=False)
+            return
+        if conference in self.closed:
+            self.late_dropped += 1
+            return
+        if recording is None:
+            safe_name = ''.join(c if c.isalnum() or c in '-_' else '_' for c in conference)
+            recording = recordings[conference] = Recording(os.path.join(self.directory, safe_name), ts)
+            self.calls += 1
+
+        if kind == _MARK:
+            recording.mark(track_name, ts, data[0], data[1])
+            return
+        track = recording.track(track_name)
+        if kind == _AUDIO:
+            recording.align(track, ts)
+            track.append(data)
+            self.frames += 1
+            self.bytes_written += len(data)
+        else:
+            path, text = data
+            with open(path, 'rb') as f:
+                _, _, _, payload = parse_wav(f.read())
+            recording.align(track, ts)
+            recording.mark(track_name, ts, 'playback', {'text': text, 'seconds': round(len(payload) / SAMPLE_RATE, 2)})
+            track.append(payload)
+            self.clips += 1
+            self.bytes_written += len(payload)
+
+    def _drain(self, recordings):
+        """Write out every queued record, then flush the open recordings"""
+        while self.queue:
+            try:
+                self._apply(recordings, self.queue.popleft())
+            except Exception:
+                self.write_errors += 1
+        for recording in recordings.values():
+            try:
+                recording.flush()
+            except Exception:
+                self.write_errors += 1
+
+    def _writer(self):
+        recordings = {}
+        while True:
+            _sleep(self.flush_interval)
+            self._drain(recordings)
+
+    def start(self):
+        if not self.started:
+            self.started = True
+            _start_thread(self._writer, ())
+
+    def snapshot(self):
+        return {
+            'directory': self.directory,
+            'calls': self.calls,
+            'queued': len(self.queue),
+            'frames': self.frames,
+            'clips': self.clips,
+            'bytes_written': self.bytes_written,
+            'dropped': self.dropped,
+            'late_dropped': self.late_dropped,
+            'write_errors': self.write_errors
+        }
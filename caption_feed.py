@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Live caption fan-out for operator viewers
+The pipeline publishes transcript, interim and translation events per
+conference to one hub. With nobody watching a conference, a publish is a
+single dict lookup; with viewers, the event is serialized once and appended
+to each viewer's bounded buffer. A slow viewer never slows the publisher:
+interims waiting in its buffer are replaced by the newer interim from the
+same speaker, and when the buffer is still full the oldest events are
+dropped and reported to the viewer as a gap.
+"""
+
+import json
+import time
+import threading
+from collections import deque
+
+
+class Subscriber:
+    __slots__ = ('conference', 'buffer', 'max_buffer', 'lock', 'wakeup', 'coalesced', 'dropped', 'unreported')
+
+    def __init__(self, conference, max_buffer):
+        self.conference = conference
+        self.buffer = deque()
+        self.max_buffer = max_buffer
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.coalesced = 0
+        self.dropped = 0
+        self.unreported = 0   # drops not yet reported to the viewer
+
+    def push(self, kind, role, payload):
+        with self.lock:
+            if kind == 'interim':
+                for index in range(len(self.buffer) - 1, -1, -1):
+                    if self.buffer[index][0] == 'interim' and self.buffer[index][1] == role:
+                        del self.buffer[index]
+                        self.coalesced += 1
+                        break
+            if len(self.buffer) >= self.max_buffer:
+                self.buffer.popleft()
+                self.dropped += 1
+                self.unreported += 1
+            self.buffer.append((kind, role, payload))
+        self.wakeup.set()
+
+    def take(self, timeout):
+        """Wait up to `timeout` for events; returns (events, dropped since the last take)"""
+        if not self.buffer:
+            self.wakeup.wait(timeout)
+        with self.lock:
+            self.wakeup.clear()
+            events = list(self.buffer)
+            self.buffer.clear()
+            dropped, self.unreported = self.unreported, 0
+        return events, dropped
+
+
+class CaptionHub:
+    def __init__(self, max_buffer=100, max_viewers=100):
+        self.max_buffer = max_buffer
+        self.max_viewers = max_viewers
+        self.subscribers = {}   # conference -> set of Subscriber
+        self.lock = threading.Lock()
+        self.published = 0
+        self.delivered = 0
+
+    def viewers(self):
+        return sum(len(subs) for subs in self.subscribers.values())
+
+    def subscribe(self, conference):
+        """New viewer for a conference, or None when the viewer limit is reached"""
+        with self.lock:
+            if self.viewers() >= self.max_viewers:
+                return None
+            subscriber = Subscriber(conference, self.max_buffer)
+            self.subscribers.setdefault(conference, set()).add(subscriber)
+            return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self.lock:
+            subs = self.subscribers.get(subscriber.conference)
+            if subs:
+                subs.discard(subscriber)
+                if not subs:
+                    del self.subscribers[subscriber.conference]
+
+    def publish(self, conference, kind, role, **fields):
+        subs = self.subscribers.get(conference)
+        if not subs:
+            return
+        payload = json.dumps(dict(fields, type=kind, role=role, ts=round(time.time(), 3)), ensure_ascii=False)
+        self.published += 1
+        for subscriber in list(subs):
+            subscriber.push(kind, role, payload)
+            self.delivered += 1
+
+    def close(self, conference):
+        """The conference ended: tell its viewers"""
+        self.publish(conference, 'end', None)
+
+    def snapshot(self):
+        with self.lock:
+            subscribers = [sub for subs in self.subscribers.values() for sub in subs]
+        return {
+            'conferences_watched': len(self.subscribers),
+            'viewers': len(subscribers),
+            'max_viewers': self.max_viewers,
+            'published': self.published,
+            'delivered': self.delivered,
+            'coalesced': sum(sub.coalesced for sub in subscribers),
+            'dropped': sum(sub.dropped for sub in subscribers)
+        }
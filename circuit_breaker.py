@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Per-provider circuit breakers
+A breaker opens after consecutive failures (slow calls count as failures),
+rejects calls while open, and after a cool-down lets a limited number of
+half-open probes through; a successful probe closes it again.
+"""
+
+import time
+import threading
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose breaker is open"""
+
+    def __init__(self, name, retry_in):
+        super().__init__(f"{name} circuit open, retry in {retry_in:.1f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    def __init__(self, name, failure_threshold=5, recovery_timeout=10.0, slow_call_seconds=None,
+                 half_open_max_calls=1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.slow_call_seconds = slow_call_seconds
+        self.half_open_max_calls = half_open_max_calls
+
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes_in_flight = 0
+        self.lock = threading.Lock()
+
+        self.times_opened = 0
+        self.rejected = 0
+        self.listeners = []
+
+    def on_state_change(self, listener):
+        """Register listener(name, old_state, new_state)"""
+        self.listeners.append(listener)
+
+    def _transition(self, new_state):
+        old_state, self.state = self.state, new_state
+        if new_state == OPEN:
+            self.opened_at = time.time()
+            self.times_opened += 1
+        if new_state != HALF_OPEN:
+            self.probes_in_flight = 0
+        return old_state
+
+    def _notify(self, old_state, new_state):
+        if old_state == new_state:
+            return
+        print(f"⚡ Circuit {self.name}: {old_state} → {new_state}")
+        for listener in self.listeners:
+            try:
+                listener(self.name, old_state, new_state)
+            except Exception as e:
+                print(f"   ⚠️  Circuit listener error: {e}")
+
+    def retry_in(self):
+        return max(0.0, self.opened_at + self.recovery_timeout - time.time())
+
+    def allow_request(self):
+        """True if a call may go through now (possibly as a half-open probe)"""
+        with self.lock:
+            old_state = self.state
+            if self.state == OPEN and self.retry_in() <= 0:
+                self._transition(HALF_OPEN)
+            if self.state == CLOSED:
+                allowed = True
+            elif self.state == HALF_OPEN and self.probes_in_flight < self.half_open_max_calls:
+                self.probes_in_flight += 1
+                allowed = True
+            else:
+                self.rejected += 1
+                allowed = False
+            new_state = self.state
+        self._notify(old_state, new_state)
+        return allowed
+
+    def rejects(self):
+        """True (and counted as rejected) while open and not yet due for a probe; takes no probe slot"""
+        with self.lock:
+            rejecting = self.state == OPEN and self.retry_in() > 0
+            if rejecting:
+                self.rejected += 1
+        return rejecting
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            old_state = self._transition(CLOSED)
+        self._notify(old_state, CLOSED)
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            old_state = self.state
+            # Late failures of calls already in flight must not restart an open breaker's timer
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+                self._transition(OPEN)
+            new_state = self.state
+        self._notify(old_state, new_state)
+
+    def is_open(self):
+        """Open (or probing) — callers should run in their degraded mode"""
+        return self.state != CLOSED
+
+    def call(self, fn, *args, **kwargs):
+        """Run fn through the breaker; slow successes still count as failures"""
+        if not self.allow_request():
+            raise CircuitOpenError(self.name, self.retry_in())
+        start = time.time()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        if self.slow_call_seconds and time.time() - start > self.slow_call_seconds:
+            self.record_failure()
+        else:
+            self.record_success()
+        return result
+
+    def snapshot(self):
+        return {
+            'state': self.state,
+            'consecutive_failures': self.failures,
+            'times_opened': self.times_opened,
+            'rejected': self.rejected,
+            'retry_in_s': round(self.retry_in(), 1) if self.state == OPEN else 0
+        }
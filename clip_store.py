@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Store for synthesized TTS clips
+Clips live in a tmpfs directory (/dev/shm when available) and are indexed in
+memory. Filenames are content addressed, so a phrase synthesized again reuses
+the same file and URL and Twilio's repeat fetches can be answered with a 304.
+The store enforces a size cap (least recently used clips go first) and a TTL
+since last use; a background sweeper deletes expired clips, clips released
+by ended conferences and orphaned files left by crashed or restarted workers.
+"""
+
+import os
+import time
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+
+
+def default_directory():
+    base = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+    return os.path.join(base, 'translator-clips')
+
+
+class Clip:
+    __slots__ = ('filename', 'path', 'size', 'etag', 'last_used', 'owners')
+
+    def __init__(self, filename, path, size, etag):
+        self.filename = filename
+        self.path = path
+        self.size = size
+        self.etag = etag
+        self.last_used = time.time()
+        self.owners = set()
+
+
+class ClipStore:
+    def __init__(self, directory=None, max_bytes=64 * 1024 * 1024, ttl=300, sweep_interval=30):
+        self.directory = directory or default_directory()
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
+        os.makedirs(self.directory, exist_ok=True)
+
+        self.clips = OrderedDict()  # filename -> Clip, least recently used first
+        self.bytes = 0
+        self.lock = threading.Lock()
+
+        self.stored = 0
+        self.reused = 0
+        self.evicted = 0
+        self.expired = 0
+        self.orphans_swept = 0
+
+    def put(self, content, owner, prefix='tts', suffix='.wav'):
+        """Store clip bytes for `owner` (a conference name); returns the filename to serve"""
+        digest = hashlib.blake2b(content, digest_size=12).hexdigest()
+        filename = f"{prefix}_{digest}{suffix}"
+        with self.lock:
+            clip = self.clips.get(filename)
+            if clip is None:
+                path = os.path.join(self.directory, filename)
+                with open(path, 'wb') as f:
+                    f.write(content)
+                clip = self.clips[filename] = Clip(filename, path, len(content), f'"{digest}"')
+                self.bytes += clip.size
+                self.stored += 1
+            else:
+                os.utime(clip.path)  # keep other workers' orphan sweeps off it
+                self.reused += 1
+            clip.owners.add(owner)
+            clip.last_used = time.time()
+            self.clips.move_to_end(filename)
+            victims = self._over_cap()
+        self._delete(victims)
+        return filename
+
+    def touch(self, filename, owner):
+        """Reuse a stored clip for `owner`; False if it is gone"""
+        with self.lock:
+            clip = self.clips.get(filename)
+            if clip is None:
+                return False
+            clip.owners.add(owner)
+            clip.last_used = time.time()
+            self.clips.move_to_end(filename)
+            self.reused += 1
+            return True
+
+    def get(self, filename):
+        """Clip metadata for serving, or None"""
+        with self.lock:
+            clip = self.clips.get(filename)
+            if clip is not None:
+                clip.last_used = time.time()
+                self.clips.move_to_end(filename)
+            return clip
+
+    def release(self, owner):
+        """An owner (conference) ended; clips nobody else uses are deleted on the next sweep"""
+        with self.lock:
+            for clip in self.clips.values():
+                clip.owners.discard(owner)
+
+    def _over_cap(self):
+        victims = []
+        while self.bytes > self.max_bytes and len(self.clips) > 1:
+            _, clip = self.clips.popitem(last=False)
+            self.bytes -= clip.size
+            self.evicted += 1
+            victims.append(clip.path)
+        return victims
+
+    def _delete(self, paths):
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def sweep(self):
+        """Delete expired and released clips plus orphaned files older than the TTL"""
+        now = time.time()
+        victims = []
+        with self.lock:
+            for filename, clip in list(self.clips.items()):
+                idle = now - clip.last_used
+                if idle > self.ttl or (not clip.owners and idle > self.sweep_interval):
+                    del self.clips[filename]
+                    self.bytes -= clip.size
+                    self.expired += 1
+                    victims.append(clip.path)
+            known = set(self.clips)
+        self._delete(victims)
+
+        for filename in os.listdir(self.directory):
+            if filename in known:
+                continue
+            path = os.path.join(self.directory, filename)
+            try:
+                if now - os.path.getmtime(path) > self.ttl:
+                    os.remove(path)
+                    self.orphans_swept += 1
+            except OSError:
+                pass
+
+    def start_sweeper(self):
+        def run():
+            while True:
+                time.sleep(self.sweep_interval)
+                try:
+                    self.sweep()
+                except Exception as e:
+                    print(f"⚠️  Clip sweep failed: {e}")
+        threading.Thread(target=run, name='clip-sweeper', daemon=True).start()
+
+    def snapshot(self):
+        return {
+            'directory': self.directory,
+            'clips': len(self.clips),
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+            'stored': self.stored,
+            'reused': self.reused,
+            'evicted': self.evicted,
+            'expired': self.expired,
+            'orphans_swept': self.orphans_swept
+        }
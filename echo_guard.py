@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Echo and crosstalk suppression between the two legs of a conference
+Each leg's media stream can pick up the translated audio we play to that
+participant (echo) or the other participant's voice (crosstalk). The guard
+tracks when translated audio is playing on a leg, so its STT input can be
+down-weighted, and fingerprints outgoing translations and recognized
+transcripts so repeats are dropped before they reach Translate or TTS.
+Repeats are judged by Jaccard similarity of the word sets, which is
+symmetric: a short genuine reply that reuses a few words of the
+translation just played ("yes I paid" after "I paid the bill") differs
+in length too much to count as its echo.
+"""
+
+import time
+import threading
+from collections import deque
+
+PUNCTUATION = '.,!?;:"\'()[]-।॥'
+
+
+def fingerprint(text):
+    """Order-insensitive word set used to compare transcripts"""
+    words = (word.strip(PUNCTUATION) for word in text.lower().split())
+    return frozenset(word for word in words if word)
+
+
+def similarity(heard, reference):
+    """Jaccard similarity of two word sets: shared words over all words"""
+    if not heard or not reference:
+        return 0.0
+    shared = len(heard & reference)
+    return shared / (len(heard) + len(reference) - shared)
+
+
+class EchoGuard:
+    def __init__(self, window=6.0, similarity=0.6, min_words=2, playback_tail=1.0):
+        self.window = window                # how long fingerprints and levels are kept
+        self.similarity = similarity        # Jaccard similarity of the word sets that counts as a repeat
+        self.min_words = min_words          # shorter transcripts must match exactly
+        self.playback_tail = playback_tail  # announce latency + room echo after playback
+
+        self.playing_until = {}   # (conference, role) -> time translated audio stops
+        self.outgoing = {}        # (conference, role) -> deque of (fingerprint, time) played to role
+        self.heard = {}           # (conference, role) -> deque of (fingerprint, time) recognized on role
+        self.levels = {}          # (conference, role) -> deque of (rms, time) of inbound audio
+        self.lock = threading.Lock()
+
+        self.suppressed_chunks = 0
+        self.echoes_dropped = 0
+        self.crosstalk_dropped = 0
+
+    def _recent(self, table, key, now):
+        entries = table.get(key)
+        if entries is None:
+            entries = table[key] = deque(maxlen=64)
+        while entries and now - entries[0][1] > self.window:
+            entries.popleft()
+        return entries
+
+    def mark_playback(self, conference, role, seconds, text=None):
+        """Translated audio of about `seconds` is about to play to `role`"""
+        now = time.time()
+        with self.lock:
+            until = now + seconds + self.playback_tail
+            self.playing_until[(conference, role)] = max(until, self.playing_until.get((conference, role), 0))
+            if text:
+                # Stamped with the end of playback so long clips stay matchable while they play
+                self._recent(self.outgoing, (conference, role), now).append((fingerprint(text), until))
+
+    def note_suppressed(self):
+        """One inbound chunk was attenuated because playback was running on its leg"""
+        with self.lock:
+            self.suppressed_chunks += 1
+
+    def is_playing(self, conference, role):
+        return time.time() < self.playing_until.get((conference, role), 0)
+
+    def record_level(self, conference, role, rms):
+        now = time.time()
+        with self.lock:
+            self._recent(self.levels, (conference, role), now).append((rms, now))
+
+    def _peak_level(self, conference, role, now):
+        return max((rms for rms, _ in self._recent(self.levels, (conference, role), now)), default=0)
+
+    def _matches(self, heard, entries):
+        for reference, _ in entries:
+            if len(heard) < self.min_words:
+                if heard == reference:
+                    return True
+            elif similarity(heard, reference) >= self.similarity:
+                return True
+        return False
+
+    def check(self, conference, role, other_role, text):
+        """
+        Return 'echo' if the transcript repeats audio we played to this leg,
+        'crosstalk' if it repeats what the other leg just said more loudly,
+        otherwise record it as heard on this leg and return None.
+        """
+        heard = fingerprint(text)
+        now = time.time()
+        with self.lock:
+            if self._matches(heard, self._recent(self.outgoing, (conference, role), now)):
+                self.echoes_dropped += 1
+                return 'echo'
+            other_heard = self._recent(self.heard, (conference, other_role), now)
+            if self._matches(heard, other_heard):
+                if self._peak_level(conference, role, now) <= self._peak_level(conference, other_role, now):
+                    self.crosstalk_dropped += 1
+                    return 'crosstalk'
+            self._recent(self.heard, (conference, role), now).append((heard, now))
+        return None
+
+    def forget(self, conference):
+        """Drop all state for a finished conference"""
+        with self.lock:
+            for table in (self.playing_until, self.outgoing, self.heard, self.levels):
+                for key in [key for key in table if key[0] == conference]:
+                    del table[key]
+
+    def snapshot(self):
+        return {
+            'suppressed_chunks': self.suppressed_chunks,
+            'echoes_dropped': self.echoes_dropped,
+            'crosstalk_dropped': self.crosstalk_dropped,
+            'legs_playing': sum(1 for until in self.playing_until.values() if until > time.time())
+        }
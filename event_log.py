@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Structured, non-blocking event log for the call hot paths
+Callers only append a tuple to a bounded in-memory queue; a background OS
+thread (not a greenlet, so writes never stall the gevent hub) formats the
+events as JSON lines (or readable text) and writes them in batches. When
+the queue is full, events are dropped and counted instead of blocking. Levels
+can be set per module, per-frame events are sampled, and transcripts and
+translations can also be appended to one JSONL file per call.
+"""
+
+import os
+import sys
+import json
+import time
+from collections import deque
+from datetime import datetime
+
+try:
+    from gevent import monkey
+    _start_thread = monkey.get_original('_thread', 'start_new_thread')
+    _sleep = monkey.get_original('time', 'sleep')
+except ImportError:
+    import _thread
+    _start_thread = _thread.start_new_thread
+    _sleep = time.sleep
+
+LEVELS = {'debug': 10, 'info': 20, 'warning': 30, 'error': 40}
+LEVEL_MARKS = {'debug': '·', 'info': '•', 'warning': '⚠️ ', 'error': '❌'}
+
+_CLOSE = object()  # control record: close a call's transcript file
+
+
+def parse_levels(spec):
+    """'stream=warning,pipeline=debug' -> {'stream': 'warning', 'pipeline': 'debug'}"""
+    levels = {}
+    for item in (spec or '').split(','):
+        if '=' in item:
+            module, level = item.split('=', 1)
+            if level.strip().lower() in LEVELS:
+                levels[module.strip()] = level.strip().lower()
+    return levels
+
+
+class EventLog:
+    def __init__(self, stream=None, level='info', module_levels=None, sample_every=100,
+                 max_queue=10000, fmt='json', transcript_dir=None, flush_interval=0.05):
+        self.stream = stream or sys.stdout
+        self.level = LEVELS.get(level, LEVELS['info'])
+        self.module_levels = {module: LEVELS[name] for module, name in (module_levels or {}).items()}
+        self.sample_every = max(1, sample_every)
+        self.max_queue = max_queue
+        self.fmt = fmt
+        self.transcript_dir = transcript_dir
+        self.flush_interval = flush_interval
+        if transcript_dir:
+            os.makedirs(transcript_dir, exist_ok=True)
+
+        self.queue = deque()
+        self.sample_counts = {}
+        self.started = False
+
+        self.emitted = 0
+        self.dropped = 0
+        self.sampled_out = 0
+        self.written = 0
+        self.write_errors = 0
+
+    def enabled(self, module, level):
+        return LEVELS[level] >= self.module_levels.get(module, self.level)
+
+    def event(self, module, name, level='info', **fields):
+        """Queue one event; never blocks (events beyond the queue limit are dropped)"""
+        if not self.enabled(module, level):
+            return
+        if len(self.queue) >= self.max_queue:
+            self.dropped += 1
+            return
+        self.queue.append((time.time(), level, module, name, fields))
+        self.emitted += 1
+
+    def sampled(self, module, name, level='debug', **fields):
+        """Per-frame events: only one in sample_every is queued"""
+        if not self.enabled(module, level):
+            return
+        count = self.sample_counts.get(name, 0) + 1
+        self.sample_counts[name] = count
+        if count % self.sample_every:
+            self.sampled_out += 1
+            return
+        self.event(module, name, level, sampled_1_in=self.sample_every, **fields)
+
+    def transcript(self, conference, role, kind, text, **fields):
+        """A transcript or translation: logged, and appended to the call's JSONL file if enabled"""
+        self.event('call', kind, conference=conference, role=role, text=text, **fields)
+        if self.transcript_dir and len(self.queue) < self.max_queue:
+            self.queue.append((time.time(), None, conference, kind, dict(fields, role=role, text=text)))
+
+    def close_call(self, conference):
+        if self.transcript_dir:
+            self.queue.append((time.time(), None, conference, _CLOSE, None))
+
+    def format(self, ts, level, module, name, fields):
+        if self.fmt == 'text':
+            clock = datetime.fromtimestamp(ts).strftime('%H:%M:%S.%f')[:-3]
+            details = ' '.join(f"{key}={value}" for key, value in fields.items())
+            return f"{clock} {LEVEL_MARKS[level]} {module}.{name} {details}\n"
+        return json.dumps({'ts': round(ts, 3), 'level': level, 'module': module, 'event': name, **fields},
+                          ensure_ascii=False, default=str) + '\n'
+
+    def _write_transcripts(self, records, files):
+        for ts, conference, kind, fields in records:
+            handle = files.get(conference)
+            if kind is _CLOSE:
+                if handle:
+                    handle.close()
+                    del files[conference]
+                continue
+            if handle is None:
+                safe_name = ''.join(c if c.isalnum() or c in '-_' else '_' for c in conference)
+                handle = files[conference] = open(os.path.join(self.transcript_dir, f"{safe_name}.jsonl"), 'a', encoding='utf-8')
+            handle.write(json.dumps({'ts': round(ts, 3), 'event': kind, **fields}, ensure_ascii=False) + '\n')
+        for handle in files.values():
+            handle.flush()
+
+    def _writer(self):
+        files = {}
+        while True:
+            if not self.queue:
+                _sleep(self.flush_interval)
+                continue
+            lines = []
+            transcripts = []
+            while self.queue:
+                ts, level, module, name, fields = self.queue.popleft()
+                if level is None:
+                    transcripts.append((ts, module, name, fields))
+                else:
+                    lines.append(self.format(ts, level, module, name, fields))
+            try:
+                if lines:
+                    self.stream.write(''.join(lines))
+                    self.stream.flush()
+                    self.written += len(lines)
+                if transcripts:
+                    self._write_transcripts(transcripts, files)
+            except Exception:
+                self.write_errors += 1
+
+    def start(self):
+        if not self.started:
+            self.started = True
+            _start_thread(self._writer, ())
+
+    def snapshot(self):
+        return {
+            'format': self.fmt,
+            'queued': len(self.queue),
+            'max_queue': self.max_queue,
+            'emitted': self.emitted,
+            'written': self.written,
+            'dropped': self.dropped,
+            'sampled_out': self.sampled_out,
+            'write_errors': self.write_errors,
+            'transcripts': bool(self.transcript_dir)
+        }
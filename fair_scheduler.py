@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Fair-share scheduling of pipeline work across conferences
+Jobs wait in a queue per key (conference) instead of one FIFO, and only as
+many as the pool has workers are handed to it at a time. Each free slot goes
+to the next key by smooth weighted round robin, so a talkative conference
+cannot push a quiet one's utterances to the back of the line; keys with a
+higher weight (e.g. a premium number) get proportionally more slots.
+"""
+
+import time
+import threading
+from collections import deque
+
+
+class FairScheduler:
+    def __init__(self, pool, max_in_flight, max_queue_per_key=50, on_drop=None):
+        self.pool = pool
+        self.max_in_flight = max_in_flight
+        self.max_queue_per_key = max_queue_per_key
+        self.on_drop = on_drop      # called once for every job that will never run
+
+        self.queues = {}            # key -> deque of (fn, args, queued_at)
+        self.weights = {}
+        self.current = {}           # smooth weighted round robin state
+        self.in_flight = 0
+        self.lock = threading.Lock()
+
+        self.dispatched = 0
+        self.dropped = 0
+        self.max_wait = 0.0
+        self.total_wait = 0.0
+
+    def submit(self, key, weight, fn, *args):
+        """Queue fn(*args) under `key`; the oldest job is dropped if the key's queue is full"""
+        dropped = False
+        with self.lock:
+            queue = self.queues.setdefault(key, deque())
+            if len(queue) >= self.max_queue_per_key:
+                queue.popleft()
+                self.dropped += 1
+                dropped = True
+            queue.append((fn, args, time.time()))
+            self.weights[key] = max(1, weight)
+        if dropped and self.on_drop:
+            self.on_drop()
+        self._dispatch()
+
+    def _pick(self):
+        """Smooth weighted round robin over keys with queued work"""
+        if not self.queues:
+            return None
+        total = 0
+        best = None
+        for key in self.queues:
+            weight = self.weights.get(key, 1)
+            self.current[key] = self.current.get(key, 0) + weight
+            total += weight
+            if best is None or self.current[key] > self.current[best]:
+                best = key
+        self.current[best] -= total
+        return best
+
+    def _dispatch(self):
+        while True:
+            with self.lock:
+                if self.in_flight >= self.max_in_flight:
+                    return
+                key = self._pick()
+                if key is None:
+                    return
+                queue = self.queues[key]
+                fn, args, queued_at = queue.popleft()
+                if not queue:
+                    del self.queues[key]
+                    self.current.pop(key, None)
+                self.in_flight += 1
+                self.dispatched += 1
+                waited = time.time() - queued_at
+                self.total_wait += waited
+                self.max_wait = max(self.max_wait, waited)
+
+            if self.pool.submit(self._run, fn, args) is None:
+                with self.lock:
+                    self.in_flight -= 1
+                    self.dropped += 1
+                if self.on_drop:
+                    self.on_drop()
+                return
+
+    def _run(self, fn, args):
+        try:
+            fn(*args)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+            self._dispatch()
+
+    def forget(self, key):
+        """Drop a finished conference's queued work and weight"""
+        with self.lock:
+            queue = self.queues.pop(key, ())
+            self.current.pop(key, None)
+            self.weights.pop(key, None)
+            self.dropped += len(queue)
+        if self.on_drop:
+            for _ in queue:
+                self.on_drop()
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'in_flight': self.in_flight,
+                'conferences_waiting': len(self.queues),
+                'queued': sum(len(queue) for queue in self.queues.values()),
+                'deepest_queue': max((len(queue) for queue in self.queues.values()), default=0),
+                'dispatched': self.dispatched,
+                'dropped': self.dropped,
+                'avg_wait_ms': round(self.total_wait / self.dispatched * 1000, 1) if self.dispatched else 0,
+                'max_wait_ms': round(self.max_wait * 1000, 1)
+            }
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Hedged requests for tail latency
+The primary attempt runs first; if it has not answered by the operation's
+observed p90 latency a backup attempt is started, and whichever succeeds
+first wins. Slow losers finish in the background and are ignored. Each
+backup attempt is a real provider request, so callers can make it pass
+their quota first; a hedge that cannot be paid for is skipped.
+"""
+
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+# Separate pool so hedges never wait behind the work that issued them; operations
+# registered with their own worker count get a private pool instead
+hedge_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix='hedge')
+
+HEDGE_QUANTILE = 0.9
+MIN_HEDGE_DELAY = 0.1   # never hedge sooner than this
+MIN_SAMPLES = 20        # use the default delay until this many samples exist
+
+
+class LatencyTracker:
+    """Sliding window of successful latencies for one operation"""
+
+    def __init__(self, default_delay, window=200):
+        self.default_delay = default_delay
+        self.samples = deque(maxlen=window)
+        self.lock = threading.Lock()
+
+    def record(self, seconds):
+        with self.lock:
+            self.samples.append(seconds)
+
+    def quantile(self, q):
+        with self.lock:
+            if len(self.samples) < MIN_SAMPLES:
+                return None
+            ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def hedge_delay(self):
+        observed = self.quantile(HEDGE_QUANTILE)
+        return max(MIN_HEDGE_DELAY, observed if observed is not None else self.default_delay)
+
+
+class HedgeStats:
+    def __init__(self):
+        self.calls = 0
+        self.hedged = 0
+        self.backup_wins = 0
+        self.hedges_skipped = 0
+        self.failures = 0
+
+    def as_dict(self):
+        return {
+            'calls': self.calls,
+            'hedged': self.hedged,
+            'backup_wins': self.backup_wins,
+            'hedges_skipped': self.hedges_skipped,
+            'failures': self.failures
+        }
+
+
+trackers = {}
+stats = {}
+executors = {}
+
+
+def register(operation, default_delay, workers=None):
+    """
+    Declare an operation and the hedge delay to use before latencies are known.
+    With `workers`, its attempts run in a pool of their own so a slow provider
+    cannot take threads from other operations.
+    """
+    trackers[operation] = LatencyTracker(default_delay)
+    stats[operation] = HedgeStats()
+    if workers:
+        executors[operation] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f'hedge-{operation}')
+
+
+def _timed(attempt):
+    start = time.time()
+    result = attempt()
+    return result, time.time() - start
+
+
+def hedged_call(operation, attempts, timeout, admit_hedge=None):
+    """
+    Run attempts[0], hedging with the next attempt each time the current one is
+    slower than the p90 deadline or fails. Returns the first successful result;
+    raises the last error (or TimeoutError) if none succeeds within `timeout`.
+    admit_hedge(), if given, is asked before each backup attempt (e.g. to charge
+    its quota); when it returns False no further attempts are started.
+    """
+    tracker = trackers[operation]
+    op_stats = stats[operation]
+    op_stats.calls += 1
+    executor = executors.get(operation, hedge_executor)
+
+    deadline = time.time() + timeout
+    pending = {}
+    pending[executor.submit(_timed, attempts[0])] = 0
+    next_attempt = 1
+    last_error = None
+
+    while pending:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            break
+        hedge_in = tracker.hedge_delay() if next_attempt < len(attempts) else remaining
+        done, _ = wait(pending, timeout=min(remaining, hedge_in), return_when=FIRST_COMPLETED)
+
+        for future in done:
+            index = pending.pop(future)
+            try:
+                result, seconds = future.result()
+            except Exception as e:
+                last_error = e
+                continue
+            tracker.record(seconds)
+            if index > 0:
+                op_stats.backup_wins += 1
+            return result
+
+        # Primary (or previous hedge) is slow or failed: start the next attempt
+        if next_attempt < len(attempts) and (not done or not pending):
+            if admit_hedge is not None and not admit_hedge():
+                op_stats.hedges_skipped += 1
+                next_attempt = len(attempts)
+                continue
+            op_stats.hedged += 1
+            pending[executor.submit(_timed, attempts[next_attempt])] = next_attempt
+            next_attempt += 1
+
+    op_stats.failures += 1
+    if last_error is not None and not pending:
+        raise last_error
+    raise TimeoutError(f"{operation} did not answer within {timeout:.1f}s")
+
+
+def snapshot():
+    """Hedging counters and current hedge delays, for /health"""
+    return {
+        operation: dict(stats[operation].as_dict(),
+                        hedge_delay_ms=round(trackers[operation].hedge_delay() * 1000))
+        for operation in trackers
+    }
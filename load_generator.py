@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+Concurrent-call load generator for media_stream_translator
+Plays the Twilio side of N simultaneous conferences: webhooks, conference
+callbacks and caller/receiver Media Streams at real-time pace. The Twilio REST
+emulator records the announce requests the translator sends back; with --spawn
+the Google stand-ins from provider_emulators.py are started as well.
+
+Usage:
+    python load_generator.py --spawn --ramp 1,2,4,8 --duration 30
+    python load_generator.py --base-url http://localhost:5000 --server-pid 1234
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import wave
+import base64
+import math
+import audioop
+import shlex
+import argparse
+import threading
+import subprocess
+
+import requests
+from websockets.sync.client import connect as ws_connect
+
+from provider_emulators import start_emulators, emulator_env, parse_fault_spec, FaultConfig
+
+FRAME_BYTES = 160          # 20 ms of 8 kHz mu-law
+FRAME_SECONDS = 0.02
+LATE_FRAME_SECONDS = 0.04  # a frame sent this far behind schedule counts as late
+
+
+# ---------------------------------------------------------------------------
+# Audio
+# ---------------------------------------------------------------------------
+
+def load_utterance(path):
+    """Load a WAV file as 8 kHz mu-law, or synthesize a tone burst if it is missing"""
+    if path and os.path.exists(path):
+        with wave.open(path, 'rb') as wav:
+            pcm = wav.readframes(wav.getnframes())
+            width, channels, rate = wav.getsampwidth(), wav.getnchannels(), wav.getframerate()
+        if channels == 2:
+            pcm = audioop.tomono(pcm, width, 0.5, 0.5)
+        if width != 2:
+            pcm = audioop.lin2lin(pcm, width, 2)
+        if rate != 8000:
+            pcm, _ = audioop.ratecv(pcm, 2, 1, rate, 8000, None)
+        return audioop.lin2ulaw(pcm, 2)
+
+    # 1.5 s of a 440 Hz tone
+    samples = [int(8000 * math.sin(2 * math.pi * 440 * i / 8000)) for i in range(12000)]
+    pcm = b''.join(s.to_bytes(2, 'little', signed=True) for s in samples)
+    return audioop.lin2ulaw(pcm, 2)
+
+
+def frames_of(audio):
+    audio = audio + b'\xff' * (-len(audio) % FRAME_BYTES)
+    return [audio[i:i + FRAME_BYTES] for i in range(0, len(audio), FRAME_BYTES)]
+
+
+SILENCE_FRAME = b'\xff' * FRAME_BYTES
+
+
+# ---------------------------------------------------------------------------
+# One simulated call
+# ---------------------------------------------------------------------------
+
+class SimulatedCall:
+    """Caller + receiver legs of one translated conference"""
+
+    def __init__(self, base_url, sink, utterance_frames, gap_seconds, duration):
+        self.base_url = base_url.rstrip('/')
+        self.ws_url = self.base_url.replace('http://', 'ws://').replace('https://', 'wss://')
+        self.sink = sink
+        self.utterance_frames = utterance_frames
+        self.gap_frames = int(gap_seconds / FRAME_SECONDS)
+        self.duration = duration
+
+        self.caller_sid = 'CA' + uuid.uuid4().hex
+        self.receiver_sid = None
+        self.conference_sid = 'CF' + uuid.uuid4().hex
+        self.conference_name = f"translator-{self.caller_sid}"
+
+        self.utterance_ends = {'caller': [], 'receiver': []}
+        self.late_frames = 0
+        self.frames_sent = 0
+        self.errors = []
+
+    def post(self, path, data):
+        return requests.post(f"{self.base_url}{path}", data=data, timeout=10)
+
+    def conference_event(self, event, call_sid=None):
+        self.post('/conference-status', {
+            'StatusCallbackEvent': event,
+            'ConferenceSid': self.conference_sid,
+            'FriendlyName': self.conference_name,
+            'CallSid': call_sid or ''
+        })
+
+    def setup(self):
+        self.post('/twilio-webhook', {'CallSid': self.caller_sid, 'From': '+15550000001', 'To': '+15550000002'})
+        self.receiver_sid = self.sink.wait_for_receiver(self.conference_name)
+        if not self.receiver_sid:
+            raise RuntimeError(f"receiver was never dialed for {self.conference_name}")
+        self.post(f'/receiver-twiml/{self.conference_name}', {'CallSid': self.receiver_sid})
+        self.conference_event('conference-start')
+        self.conference_event('participant-join', self.caller_sid)
+        self.conference_event('participant-join', self.receiver_sid)
+
+    def teardown(self):
+        self.post('/call-status', {'CallSid': self.receiver_sid or '', 'CallStatus': 'completed'})
+        self.conference_event('conference-end')
+
+    def stream_leg(self, role, offset_frames):
+        """Stream one leg: silence offset, then utterance/gap cycles at real-time pace"""
+        call_sid = self.caller_sid if role == 'caller' else self.receiver_sid
+        stream_sid = 'MZ' + uuid.uuid4().hex
+        url = f"{self.ws_url}/media-stream/{self.conference_name}/{role}"
+        try:
+            with ws_connect(url, open_timeout=10) as ws:
+                ws.send(json.dumps({'event': 'connected', 'protocol': 'Call', 'version': '1.0.0'}))
+                ws.send(json.dumps({'event': 'start', 'streamSid': stream_sid,
+                                    'start': {'streamSid': stream_sid, 'callSid': call_sid}}))
+
+                cycle = [None] * offset_frames
+                start = time.time()
+                total_frames = int(self.duration / FRAME_SECONDS)
+                for index in range(total_frames):
+                    if not cycle:
+                        cycle = list(self.utterance_frames) + ['END'] + [None] * self.gap_frames
+                    frame = cycle.pop(0)
+                    if frame == 'END':
+                        self.utterance_ends[role].append(time.time())
+                        frame = cycle.pop(0) if cycle else None
+                    if frame is None:
+                        frame = SILENCE_FRAME
+
+                    scheduled = start + index * FRAME_SECONDS
+                    delay = scheduled - time.time()
+                    if delay > 0:
+                        time.sleep(delay)
+                    elif -delay > LATE_FRAME_SECONDS:
+                        self.late_frames += 1
+
+                    ws.send(json.dumps({
+                        'event': 'media',
+                        'streamSid': stream_sid,
+                        'media': {'track': 'inbound', 'chunk': str(index), 'timestamp': str(index * 20),
+                                  'payload': base64.b64encode(frame).decode('ascii')}
+                    }))
+                    self.frames_sent += 1
+
+                ws.send(json.dumps({'event': 'stop', 'streamSid': stream_sid}))
+        except Exception as e:
+            self.errors.append(f"{role}: {e}")
+
+    def run(self):
+        try:
+            self.setup()
+        except Exception as e:
+            self.errors.append(f"setup: {e}")
+            return
+
+        # Receiver starts talking half a cycle after the caller
+        half_cycle = (len(self.utterance_frames) + self.gap_frames) // 2
+        legs = [threading.Thread(target=self.stream_leg, args=('caller', 0)),
+                threading.Thread(target=self.stream_leg, args=('receiver', half_cycle))]
+        for leg in legs:
+            leg.start()
+        for leg in legs:
+            leg.join()
+
+        try:
+            self.teardown()
+        except Exception as e:
+            self.errors.append(f"teardown: {e}")
+
+    def latencies(self, settle_seconds):
+        """Utterance end → translated announce to the other party, plus undelivered count"""
+        results = []
+        undelivered = 0
+        targets = {'caller': self.receiver_sid, 'receiver': self.caller_sid}
+        for role, ends in self.utterance_ends.items():
+            deliveries = self.sink.deliveries_for(targets[role])
+            utterance_seconds = len(self.utterance_frames) * FRAME_SECONDS
+            for i, end in enumerate(ends):
+                window_end = ends[i + 1] if i + 1 < len(ends) else end + settle_seconds
+                # Interim results may be delivered before the speaker finishes
+                matched = [ts for ts in deliveries if end - utterance_seconds <= ts < window_end]
+                if matched:
+                    results.append(matched[0] - end)
+                else:
+                    undelivered += 1
+        return results, undelivered
+
+
+# ---------------------------------------------------------------------------
+# Server process sampling
+# ---------------------------------------------------------------------------
+
+class ProcessSampler:
+    """Samples CPU, threads and RSS of the server (and its children) from /proc"""
+
+    def __init__(self, pid, interval=0.5):
+        self.pid = pid
+        self.interval = interval
+        self.samples = []
+        self.running = False
+        self.ticks = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+
+    def pids(self):
+        found = [self.pid]
+        try:
+            children = open(f'/proc/{self.pid}/task/{self.pid}/children').read().split()
+            found.extend(int(c) for c in children)
+        except OSError:
+            pass
+        return found
+
+    def read(self):
+        cpu_ticks = threads = rss_kb = 0
+        for pid in self.pids():
+            try:
+                stat = open(f'/proc/{pid}/stat').read().rsplit(')', 1)[1].split()
+                cpu_ticks += int(stat[11]) + int(stat[12])
+                for line in open(f'/proc/{pid}/status'):
+                    if line.startswith('Threads:'):
+                        threads += int(line.split()[1])
+                    elif line.startswith('VmRSS:'):
+                        rss_kb += int(line.split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+        return time.time(), cpu_ticks / self.ticks, threads, rss_kb
+
+    def _loop(self):
+        while self.running:
+            self.samples.append(self.read())
+            time.sleep(self.interval)
+
+    def start(self):
+        self.samples = []
+        self.running = True
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        self.thread.join()
+        self.samples.append(self.read())
+        if len(self.samples) < 2:
+            return {}
+        (t0, cpu0, _, _), (t1, cpu1, _, _) = self.samples[0], self.samples[-1]
+        return {
+            'cpu_percent': round(100 * (cpu1 - cpu0) / max(t1 - t0, 1e-6), 1),
+            'threads_max': max(s[2] for s in self.samples),
+            'rss_mb_max': round(max(s[3] for s in self.samples) / 1024, 1)
+        }
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return round(ordered[index] * 1000)
+
+
+def server_health(base_url):
+    try:
+        return requests.get(f"{base_url}/health", timeout=5).json()
+    except Exception:
+        return {}
+
+
+def wait_for_server(base_url, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if server_health(base_url):
+            return True
+        time.sleep(0.5)
+    return False
+
+
+def spawn_server(command, port, emulators):
+    env = dict(os.environ)
+    env.update(emulator_env(emulators))
+    env.update({
+        'PORT': str(port),
+        'FORWARD_TO_NUMBER': env.get('FORWARD_TO_NUMBER', '+15550000002'),
+    })
+    cmd = command.replace('$PORT', str(port))
+    print(f"🚀 Starting server: {cmd}")
+    # No shell, so the pid we sample and terminate is the server itself
+    return subprocess.Popen(shlex.split(cmd), env=env, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT)
+
+
+def run_step(n_calls, args, sink, sampler):
+    utterance = frames_of(load_utterance(args.audio))
+    calls = [SimulatedCall(args.base_url, sink, utterance, args.gap, args.duration) for _ in range(n_calls)]
+    before = server_health(args.base_url)
+    if sampler:
+        sampler.start()
+
+    threads = [threading.Thread(target=call.run) for call in calls]
+    for thread in threads:
+        thread.start()
+        time.sleep(args.stagger)
+    for thread in threads:
+        thread.join()
+    time.sleep(args.settle)
+
+    process = sampler.stop() if sampler else {}
+    after = server_health(args.base_url)
+
+    latencies, undelivered, errors = [], 0, []
+    for call in calls:
+        call_latencies, call_undelivered = call.latencies(args.settle)
+        latencies.extend(call_latencies)
+        undelivered += call_undelivered
+        errors.extend(call.errors)
+
+    return {
+        'calls': n_calls,
+        'utterances': len(latencies) + undelivered,
+        'delivered': len(latencies),
+        'undelivered': undelivered,
+        'latency_ms_p50': percentile(latencies, 50),
+        'latency_ms_p95': percentile(latencies, 95),
+        'latency_ms_p99': percentile(latencies, 99),
+        'frames_sent': sum(c.frames_sent for c in calls),
+        'late_frames': sum(c.late_frames for c in calls),
+        'chunks_queued': after.get('audio_chunks_queued', 0) - before.get('audio_chunks_queued', 0),
+        'chunks_dropped': after.get('audio_chunks_dropped', 0) - before.get('audio_chunks_dropped', 0),
+        'errors': errors[:10],
+        **process
+    }
+
+
+def print_report(results):
+    columns = ['calls', 'delivered', 'undelivered', 'latency_ms_p50', 'latency_ms_p95', 'latency_ms_p99',
+               'late_frames', 'chunks_dropped', 'cpu_percent', 'threads_max', 'rss_mb_max']
+    print(f"\n{'='*60}")
+    print("📊 LOAD TEST RESULTS")
+    print(f"{'='*60}")
+    print('  '.join(f"{c:>14}" for c in columns))
+    for row in results:
+        print('  '.join(f"{str(row.get(c, '-')):>14}" for c in columns))
+    for row in results:
+        if row['errors']:
+            print(f"⚠️  {row['calls']} calls: {len(row['errors'])} errors, e.g. {row['errors'][0]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default='http://127.0.0.1:5000', help='translator base URL')
+    parser.add_argument('--ramp', default='1,2,4,8', help='comma separated concurrent call counts')
+    parser.add_argument('--duration', type=float, default=30, help='seconds each call streams audio')
+    parser.add_argument('--gap', type=float, default=2.0, help='seconds of silence between utterances')
+    parser.add_argument('--settle', type=float, default=5.0, help='seconds to wait for late deliveries')
+    parser.add_argument('--stagger', type=float, default=0.05, help='seconds between call starts')
+    parser.add_argument('--audio', default='output_audio_1.wav', help='WAV file used as the spoken utterance')
+    parser.add_argument('--emulator-port', type=int, default=0,
+                        help='base port for the provider emulators (ephemeral when 0)')
+    parser.add_argument('--live-google', action='store_true',
+                        help='with --spawn, use real Google APIs instead of the emulators')
+    parser.add_argument('--latency', help='emulator latency in ms, e.g. tts=150,translate=40')
+    parser.add_argument('--errors', help='emulator error rate, e.g. translate=0.05')
+    parser.add_argument('--server-pid', type=int, help='pid of an already running translator to sample')
+    parser.add_argument('--spawn', action='store_true', help='start the translator as a subprocess')
+    parser.add_argument('--server-cmd', default=f'{sys.executable} media_stream_translator.py',
+                        help='command used with --spawn ($PORT is substituted)')
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    faults = {}
+    for spec, key in ((args.latency, 'latency_ms'), (args.errors, 'error_rate')):
+        for name, values in parse_fault_spec(spec, key).items():
+            faults.setdefault(name, FaultConfig()).update(values)
+
+    services = ('twilio',) if args.live_google or not args.spawn else ('speech', 'tts', 'translate', 'twilio')
+    emulators, control = start_emulators(args.emulator_port, faults=faults, services=services)
+    sink = emulators['twilio']
+    print(f"✅ Emulators running: {', '.join(services)} (stats at {control.url}/stats)")
+
+    server = None
+    pid = args.server_pid
+    if args.spawn:
+        port = int(args.base_url.rsplit(':', 1)[-1].split('/')[0])
+        server = spawn_server(args.server_cmd, port, emulators)
+        pid = server.pid
+    elif not pid:
+        print(f"⚠️  No --server-pid given; make sure the server uses TWILIO_API_URL={sink.url}")
+
+    try:
+        if not wait_for_server(args.base_url):
+            print(f"❌ Server at {args.base_url} did not become healthy")
+            return 1
+
+        sampler = ProcessSampler(pid) if pid and os.path.exists(f'/proc/{pid}') else None
+        results = []
+        for n_calls in [int(n) for n in args.ramp.split(',') if n.strip()]:
+            print(f"\n🔄 Ramp step: {n_calls} concurrent call(s) for {args.duration:.0f}s")
+            row = run_step(n_calls, args, sink, sampler)
+            results.append(row)
+            print(f"   ✅ p50={row['latency_ms_p50']}ms p99={row['latency_ms_p99']}ms "
+                  f"dropped={row['chunks_dropped']} cpu={row.get('cpu_percent', '-')}%")
+
+        print_report(results)
+        if args.json:
+            with open(args.json, 'w') as f:
+                json.dump(results, f, indent=2)
+            print(f"\n💾 Results written to {args.json}")
+        return 0
+    finally:
+        for emulator in list(emulators.values()) + [control]:
+            emulator.stop()
+        if server:
+            server.terminate()
+            server.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
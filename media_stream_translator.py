@@ -5,22 +5,44 @@ TRUE streaming recognition with async processing for ultra-low latency
 """
 
 import os
+import re
 import json
 import base64
 import audioop
-from collections import defaultdict
 from datetime import datetime
+from collections import defaultdict
 from flask import Flask, request, Response
 from flask_sock import Sock
 from google.cloud import speech_v1 as speech
-from google.cloud import translate_v2 as translate
 from google.cloud import texttospeech
-from twilio.rest import Client
 import threading
 import time
 import requests
-from concurrent.futures import ThreadPoolExecutor
 import queue
+from provider_clients import (
+    create_speech_client, create_translate_client, create_tts_client, create_twilio_client
+)
+import hedging
+from bulkhead import Bulkhead
+from fair_scheduler import FairScheduler
+from clip_store import ClipStore
+from call_archive import CallArchive
+from transcript_store import TranscriptStore
+from caption_feed import CaptionHub
+from translation_memory import TranslationMemory
+from phrase_tracker import PhraseTracker
+from text_normalizer import TextNormalizer
+from event_log import EventLog, parse_levels
+from session_registry import SessionRegistry
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+from echo_guard import EchoGuard
+from playback_pacer import PlaybackPacer
+from audio_trim import trim_silence
+from rate_limiter import (
+    QuotaScheduler, QuotaExceededError, PRIORITY_FINAL, PRIORITY_INTERIM, PRIORITY_BACKGROUND
+)
+from google.api_core.exceptions import TooManyRequests
+from twilio.base.exceptions import TwilioRestException
 
 # Load Google credentials from environment
 google_creds_json = os.environ.get('GOOGLE_APPLICATION_CREDENTIALS_JSON')
@@ -38,19 +60,182 @@ railway_domain = os.environ.get('RAILWAY_PUBLIC_DOMAIN')
 replit_domain = os.environ.get('REPLIT_DEV_DOMAIN')
 app_domain = railway_domain or replit_domain or 'localhost:5000'
 
-# Google Cloud clients
-speech_client = speech.SpeechClient()
-translate_client = translate.Client()
-tts_client = texttospeech.TextToSpeechClient()
+# Google Cloud clients (emulator endpoints are honoured, see provider_clients.py)
+speech_client = create_speech_client()
+translate_client = create_translate_client()
+tts_client = create_tts_client()
+
+# Backup endpoints for hedged requests (same endpoint again when not configured)
+TRANSLATE_BACKUP_ENDPOINT = os.environ.get('TRANSLATE_BACKUP_ENDPOINT')
+TTS_BACKUP_ENDPOINT = os.environ.get('TTS_BACKUP_ENDPOINT')
+translate_backup_client = create_translate_client(TRANSLATE_BACKUP_ENDPOINT) if TRANSLATE_BACKUP_ENDPOINT else translate_client
+tts_backup_client = create_tts_client(TTS_BACKUP_ENDPOINT) if TTS_BACKUP_ENDPOINT else tts_client
+
+# Overall time allowed for a (hedged) Translate / TTS call
+TRANSLATE_TIMEOUT = float(os.environ.get('TRANSLATE_TIMEOUT', '3.0'))
+TTS_TIMEOUT = float(os.environ.get('TTS_TIMEOUT', '5.0'))
+TWILIO_TIMEOUT = float(os.environ.get('TWILIO_TIMEOUT', '5.0'))
+STT_SESSION_TIMEOUT = 55  # streaming sessions restart at 50 s; bound a stuck one just past that
+hedging.register('translate', default_delay=0.6, workers=int(os.environ.get('POOL_TRANSLATE_WORKERS', '16')))
+hedging.register('tts', default_delay=0.8, workers=int(os.environ.get('POOL_TTS_WORKERS', '16')))
+
+# Primary (neural) and backup (cheaper standard tier) voices per target language
+TTS_VOICES = {
+    'hi': ('hi-IN', 'hi-IN-Neural2-A', 'hi-IN-Standard-A'),
+    'en': ('en-US', 'en-US-Neural2-C', 'en-US-Standard-C'),
+}
+
+# Texts waiting to be spoken with <Say> when TTS is unavailable
+say_prompts = {}
+
+# Circuit breakers per provider stage (see circuit_breaker.py)
+breakers = {
+    'stt': CircuitBreaker('stt', failure_threshold=3, recovery_timeout=15.0),
+    'translate': CircuitBreaker('translate', failure_threshold=5, recovery_timeout=10.0, slow_call_seconds=1.5),
+    'tts': CircuitBreaker('tts', failure_threshold=5, recovery_timeout=10.0, slow_call_seconds=2.5),
+    'twilio': CircuitBreaker('twilio', failure_threshold=5, recovery_timeout=10.0),
+}
+
+# Client-side quotas per minute (see rate_limiter.py) - set these to your project's Google Cloud quotas
+quota = QuotaScheduler()
+quota.add('stt', 'requests', int(os.environ.get('QUOTA_STT_RPM', '900')))
+quota.add('translate', 'requests', int(os.environ.get('QUOTA_TRANSLATE_RPM', '3000')))
+quota.add('translate', 'characters', int(os.environ.get('QUOTA_TRANSLATE_CPM', '600000')))
+quota.add('tts', 'requests', int(os.environ.get('QUOTA_TTS_RPM', '1000')))
+quota.add('tts', 'characters', int(os.environ.get('QUOTA_TTS_CPM', '150000')))
+
+# What to do for a conference while a stage's breaker is open:
+#   passthrough - unmute the conference so both parties hear each other untranslated
+#   text        - speak the translated text with Twilio <Say> instead of Google TTS
+#   prompt      - play a cached "translation unavailable" prompt
+DEGRADED_MODES = {
+    'stt': os.environ.get('DEGRADED_MODE_STT', 'passthrough'),
+    'translate': os.environ.get('DEGRADED_MODE_TRANSLATE', 'passthrough'),
+    'tts': os.environ.get('DEGRADED_MODE_TTS', 'text'),
+}
+
+UNAVAILABLE_PROMPT_TEXT = {
+    'en': "Translation is temporarily unavailable.",
+    'hi': "अनुवाद अभी उपलब्ध नहीं है।",
+}
+UNAVAILABLE_PROMPT_INTERVAL = 20  # seconds between prompts to the same participant
+
+# Worker pools per stage (bulkheads, see bulkhead.py): the translation pipeline and
+# Twilio REST calls never share threads, so a slow Twilio cannot starve translation.
+# Translate and TTS provider calls run in their own hedging pools. Comfort tones get a
+# small pool of their own that refuses tones when backed up, so a burst of them never
+# evicts queued translation announces from the twilio pool.
+def stage_pool(name, workers, max_queue, overflow):
+    env = f"POOL_{name.upper()}"
+    return Bulkhead(
+        name,
+        int(os.environ.get(f"{env}_WORKERS", workers)),
+        int(os.environ.get(f"{env}_QUEUE", max_queue)),
+        os.environ.get(f"{env}_OVERFLOW", overflow)
+    )
+
+pools = {
+    'pipeline': stage_pool('pipeline', 20, 200, 'reject'),
+    'twilio': stage_pool('twilio', 10, 100, 'drop_oldest'),
+    'comfort': stage_pool('comfort', 2, 4, 'reject'),
+}
+
+# Pipeline slots are shared fairly between conferences (see fair_scheduler.py); conferences
+# on a weighted Twilio number get proportionally more, e.g. TENANT_WEIGHTS="+14155550100=3"
+# Admission control: new calls are turned away (or held with a busy prompt) when headroom is gone
+MAX_CONFERENCES = int(os.environ.get('MAX_CONFERENCES', '50'))
+ADMISSION_MIN_HEADROOM = float(os.environ.get('ADMISSION_MIN_HEADROOM', '0.1'))
+ADMISSION_MODE = os.environ.get('ADMISSION_MODE', 'reject')   # reject | queue
+ADMISSION_QUEUE_ATTEMPTS = int(os.environ.get('ADMISSION_QUEUE_ATTEMPTS', '6'))
+ADMISSION_RETRY_SECONDS = 10
+AUDIO_QUEUE_HIGH_WATER = 0.8  # a stream's audio queue this full counts as backed up
+admission_stats = {'admitted': 0, 'rejected': 0, 'held': 0}
+# How much an open breaker eats into headroom (TTS still has the <Say> fallback)
+CIRCUIT_LOAD = {'stt': 1.0, 'translate': 1.0, 'tts': 0.5, 'twilio': 1.0}
+
+TENANT_WEIGHTS = {
+    number.strip(): int(weight)
+    for number, weight in (entry.split('=', 1) for entry in os.environ.get('TENANT_WEIGHTS', '').split(',') if '=' in entry)
+}
+
+# Translation memory: curated glossary, then exact and near-identical sentences translated before
+translation_memory = TranslationMemory(
+    threshold=float(os.environ.get('TRANSLATION_MEMORY_THRESHOLD', '0.85')),
+    max_entries=int(os.environ.get('TRANSLATION_MEMORY_SIZE', '5000'))
+)
+if os.environ.get('TRANSLATION_GLOSSARY'):
+    print(f"📖 Loaded {translation_memory.load_glossary(os.environ['TRANSLATION_GLOSSARY'])} glossary terms")
+
+# Transcripts are cleaned up before translation (fillers, stutter repeats, digits, punctuation);
+# TEXT_NORMALIZER_RULES points at a JSON file overriding the per-language rules in text_normalizer.py
+TEXT_NORMALIZATION = os.environ.get('TEXT_NORMALIZATION', 'true').lower() in ('1', 'true', 'yes')
+normalizer = (TextNormalizer.from_file(os.environ['TEXT_NORMALIZER_RULES'])
+              if os.environ.get('TEXT_NORMALIZER_RULES') else TextNormalizer())
+
+# Most frequent phrases across all calls (Space-Saving sketch, saved to PHRASE_STATS_PATH);
+# the top PHRASE_WARM_TOP are kept translated and synthesized, see warm_phrase()
+phrases = PhraseTracker(
+    capacity=int(os.environ.get('PHRASE_TRACKER_SIZE', '1000')),
+    path=os.environ.get('PHRASE_STATS_PATH'),
+    min_count=int(os.environ.get('PHRASE_WARM_MIN_COUNT', '3'))
+)
+PHRASE_WARM_TOP = int(os.environ.get('PHRASE_WARM_TOP', '50'))
+PHRASE_WARM_INTERVAL = int(os.environ.get('PHRASE_WARM_INTERVAL', '120'))  # keep below CLIP_STORE_TTL
+WARM_CLIP_OWNER = 'phrase-warmer'  # never released, so warmed clips only go by TTL or the size cap
 
-# Thread pool for parallel processing
-executor = ThreadPoolExecutor(max_workers=20)
+# Synthesized clips live in a tmpfs-backed store with a size cap and TTL (see clip_store.py)
+clip_store = ClipStore(
+    directory=os.environ.get('CLIP_STORE_DIR'),
+    max_bytes=int(os.environ.get('CLIP_STORE_MAX_MB', '64')) * 1024 * 1024,
+    ttl=int(os.environ.get('CLIP_STORE_TTL', '300'))
+)
+clip_store.start_sweeper()
 
-# Translation cache for common phrases
-translation_cache = {}
+# Stored clip for repeated phrases, keyed by language, speaking rate and text
+tts_clip_cache = {}
+tts_clip_cache_lock = threading.Lock()  # pipeline workers read, insert and evict concurrently
+TTS_CLIP_CACHE_SIZE = 1000
+tts_clip_stats = {'synthesized': 0, 'cache_hits': 0, 'trimmed_seconds': 0.0, 'trim_failures': 0}
 
-# Active audio queues for streaming
-audio_queues = {}
+# Audio chunk counters exposed on /health (used by load_generator.py)
+stream_stats = {'chunks_queued': 0, 'chunks_dropped': 0}
+
+# Optional mode: race hi-IN and en-US recognizers per stream instead of relying on
+# alternative_language_codes, locking to one once the speaker's language is clear
+DUAL_RECOGNIZERS = os.environ.get('DUAL_RECOGNIZERS', '').lower() in ('1', 'true', 'yes')
+DUAL_LANGUAGES = ('hi-IN', 'en-US')
+DUAL_RACE_WINDOW = 0.4        # seconds to wait for the other recognizer's final
+DUAL_LOCK_AFTER = 3           # consecutive wins before locking to one recognizer
+DUAL_UNLOCK_CONFIDENCE = 0.5  # finals below this count towards unlocking
+DUAL_UNLOCK_AFTER = 3         # consecutive low-confidence finals before unlocking
+recognizer_stats = {'dual_streams': 0, 'race_decisions': 0, 'locks': 0, 'unlocks': 0}
+
+# Echo / crosstalk suppression: down-weight a leg's STT input while translated audio
+# plays to it and drop transcripts that repeat our playback or the other leg's speech
+ECHO_SUPPRESSION = os.environ.get('ECHO_SUPPRESSION', 'true').lower() in ('1', 'true', 'yes')
+ECHO_ATTENUATION = float(os.environ.get('ECHO_ATTENUATION', '0.25'))  # 0 mutes the leg during playback
+TTS_BYTES_PER_SECOND = 8000       # 8 kHz mu-law clips
+SAY_CHARS_PER_SECOND = 14         # rough <Say> speaking rate
+echo_guard = EchoGuard()
+
+# Staleness-aware shedding: every utterance must be delivered within its window or it is dropped
+UTTERANCE_DEADLINE_FINAL = float(os.environ.get('UTTERANCE_DEADLINE_FINAL', '6.0'))
+UTTERANCE_DEADLINE_INTERIM = float(os.environ.get('UTTERANCE_DEADLINE_INTERIM', '2.5'))
+SHED_INTERIMS_ABOVE = int(os.environ.get('SHED_INTERIMS_ABOVE', '10'))  # queued deliveries
+
+# End-to-end latency budget from transcript to playback; each stage's timeout is what is left of it,
+# kept between a floor (so late work still gets a real attempt) and the stage's overall cap
+LATENCY_BUDGET = float(os.environ.get('LATENCY_BUDGET', '1.5'))
+STAGE_TIMEOUT_FLOORS = {'translate': 0.3, 'tts': 0.5, 'twilio': 0.5}
+TWILIO_ANNOUNCE_ESTIMATE = 0.3  # typical participant update round trip
+
+# Speed up TTS as a listener's queue of translated audio grows, within these bounds
+pacer = PlaybackPacer(
+    base_rate=float(os.environ.get('TTS_SPEAKING_RATE', '1.15')),
+    max_rate=float(os.environ.get('TTS_MAX_SPEAKING_RATE', '1.5')),
+    target_lag=float(os.environ.get('PLAYBACK_TARGET_LAG', '2.0')),
+    max_lag=float(os.environ.get('PLAYBACK_MAX_LAG', '8.0'))
+)
 
 # Twilio client - get credentials from environment or Replit connector
 def get_twilio_credentials():
@@ -113,36 +298,59 @@ def get_twilio_credentials():
 
 # Initialize Twilio client
 twilio_creds = get_twilio_credentials()
-twilio_client = None
-
-if twilio_creds:
-    if 'api_key' in twilio_creds and 'api_key_secret' in twilio_creds:
-        # Use API key authentication (from connector)
-        twilio_client = Client(
-            twilio_creds['api_key'],
-            twilio_creds['api_key_secret'],
-            twilio_creds['account_sid']
-        )
-        print(f"✅ Twilio client initialized with API key authentication")
-    elif 'auth_token' in twilio_creds:
-        # Use auth token authentication (from env vars)
-        twilio_client = Client(
-            twilio_creds['account_sid'],
-            twilio_creds['auth_token']
-        )
-        print(f"✅ Twilio client initialized with auth token authentication")
-else:
+twilio_client = create_twilio_client(twilio_creds)
+
+if not twilio_client:
     print(f"⚠️  Twilio credentials not found")
 
-# Active streams and conference participants
-active_streams = {}
-conference_participants = defaultdict(dict)
+# Structured event log for the call hot paths: JSON lines written by a background thread.
+# LOG_LEVELS overrides per module (stream, stt, pipeline, call, translate, tts, twilio),
+# e.g. "stream=warning,pipeline=debug"; CALL_LOG_DIR also keeps each call's transcript as JSONL
+log = EventLog(
+    level=os.environ.get('LOG_LEVEL', 'info').lower(),
+    module_levels=parse_levels(os.environ.get('LOG_LEVELS')),
+    sample_every=int(os.environ.get('LOG_SAMPLE_EVERY', '100')),
+    fmt=os.environ.get('LOG_FORMAT', 'json'),
+    transcript_dir=os.environ.get('CALL_LOG_DIR')
+)
+log.start()
+
+# Optional per-call recordings (both legs in, translations out) for QA and replay; see call_archive.py
+CALL_ARCHIVE_DIR = os.environ.get('CALL_ARCHIVE_DIR')
+archive = CallArchive(CALL_ARCHIVE_DIR) if CALL_ARCHIVE_DIR else None
+if archive:
+    archive.start()
+
+# Optional searchable history of final transcripts and translations (SQLite + FTS5), see /transcripts
+TRANSCRIPT_DB = os.environ.get('TRANSCRIPT_DB')
+TRANSCRIPTS_TOKEN = os.environ.get('TRANSCRIPTS_TOKEN')  # required by /transcripts and /captions if set
+transcripts = TranscriptStore(TRANSCRIPT_DB) if TRANSCRIPT_DB else None
+if transcripts:
+    transcripts.start()
+
+# Live captions for operators (/captions/<conference>, server-sent events); viewers authenticate
+# with TRANSCRIPTS_TOKEN when it is set, CAPTIONS_ALLOW_ORIGIN lets another origin's UI connect
+captions = CaptionHub(
+    max_buffer=int(os.environ.get('CAPTIONS_BUFFER', '100')),
+    max_viewers=int(os.environ.get('CAPTIONS_MAX_VIEWERS', '100'))
+)
+CAPTIONS_ALLOW_ORIGIN = os.environ.get('CAPTIONS_ALLOW_ORIGIN')
+CAPTIONS_KEEPALIVE = 15  # seconds between SSE keepalive comments
+
+# Live calls, indexed by conference name, call SID and stream SID; sessions whose
+# callbacks stop arriving are reaped after SESSION_IDLE_TIMEOUT (see session_registry.py)
+sessions = SessionRegistry(
+    ttl=int(os.environ.get('SESSION_TTL', str(4 * 3600))),
+    idle_timeout=int(os.environ.get('SESSION_IDLE_TIMEOUT', '60'))
+)
+CALL_END_GRACE = 10  # seconds to wait for conference-end after a leg's call completes
 
 # Generate comfort tone audio (short beep to indicate processing)
 def generate_comfort_tone():
     """Generate a short, subtle comfort tone"""
     try:
         # Short beep using TTS
+        quota.acquire('tts', priority=PRIORITY_BACKGROUND)
         synthesis_input = texttospeech.SynthesisInput(ssml='<speak><break time="150ms"/></speak>')
         
         voice = texttospeech.VoiceSelectionParams(
@@ -178,6 +386,33 @@ def generate_comfort_tone():
 # Initialize comfort tone
 COMFORT_TONE = generate_comfort_tone()
 
+def trim_clip(audio_content):
+    """Trim a synthesized clip's silence padding; a clip the trimmer cannot parse is kept as it is"""
+    try:
+        return trim_silence(audio_content)
+    except ValueError as e:
+        tts_clip_stats['trim_failures'] += 1
+        log.event('tts', 'trim_failed', 'warning', error=str(e), size=len(audio_content))
+        return audio_content, 0.0
+
+def generate_unavailable_prompts():
+    """Pre-synthesize the "translation unavailable" prompt for each language"""
+    prompts = {}
+    os.makedirs('static', exist_ok=True)
+    for language, text in UNAVAILABLE_PROMPT_TEXT.items():
+        filename = f"unavailable_{language}.wav"
+        try:
+            if not os.path.exists(f"static/{filename}"):
+                locale, neural_voice, _ = TTS_VOICES[language]
+                quota.acquire('tts', len(text), PRIORITY_BACKGROUND)
+                audio_content, _ = trim_clip(_synthesize_with(tts_client, text, locale, neural_voice, pacer.base_rate))
+                with open(f"static/{filename}", 'wb') as f:
+                    f.write(audio_content)
+            prompts[language] = filename
+        except Exception as e:
+            print(f"   ⚠️  Unavailable prompt ({language}) not cached, will use <Say>: {e}")
+    return prompts
+
 @app.route('/')
 def home():
     return {
@@ -195,14 +430,158 @@ def home():
         ]
     }, 200
 
+def capacity():
+    """
+    Live headroom from 1.0 (idle) to 0.0 (saturated): one minus the most loaded of
+    conference count, share of backed-up audio queues, pipeline and Twilio pool load and open breakers
+    """
+    fills = [audio_queue.qsize() / audio_queue.maxsize for audio_queue in sessions.audio_queues()]
+    backed_up = sum(1 for fill in fills if fill >= AUDIO_QUEUE_HIGH_WATER)
+    pipeline = fair_share.snapshot()
+    twilio_pool = pools['twilio'].snapshot()
+    signals = {
+        'conferences': len(sessions) / MAX_CONFERENCES,
+        # one stuck stream must not close admission for everyone: count the share of streams backed up
+        'audio_queues': backed_up / len(fills) if fills else 0.0,
+        # a full pool's worth of queued work on top of busy workers counts as saturated
+        'pipeline': (pipeline['in_flight'] + pipeline['queued']) / (2 * pools['pipeline'].workers),
+        'twilio_pool': (twilio_pool['active'] + twilio_pool['queued']) / (2 * twilio_pool['workers']),
+        'circuits': max((CIRCUIT_LOAD[name] for name, breaker in breakers.items() if breaker.is_open()), default=0.0)
+    }
+    limiting = max(signals, key=signals.get)
+    score = round(max(0.0, 1.0 - signals[limiting]), 2)
+    return {
+        'score': score,
+        'limiting': limiting,
+        'accepting_calls': score > ADMISSION_MIN_HEADROOM,
+        'signals': {name: round(min(value, 1.0), 2) for name, value in signals.items()},
+        'admission': admission_stats
+    }
+
+@app.route('/capacity')
+def capacity_check():
+    """For load balancers / autoscalers: 200 while accepting calls, 503 when saturated"""
+    status = capacity()
+    return status, 200 if status['accepting_calls'] else 503
+
 @app.route('/health')
 def health():
     return {
         "status": "healthy",
-        "active_conferences": len(conference_participants),
+        "active_conferences": len(sessions),
+        "active_streams": len(sessions.audio_queues()),
+        "sessions": sessions.snapshot(),
+        "event_log": log.snapshot(),
+        "archive": archive.snapshot() if archive else "disabled",
+        "transcripts": transcripts.snapshot() if transcripts else "disabled",
+        "captions": captions.snapshot(),
+        "translation_memory": translation_memory.snapshot(),
+        "phrases": phrases.snapshot(),
+        "normalizer": normalizer.snapshot() if TEXT_NORMALIZATION else "disabled",
+        "capacity": capacity(),
+        "audio_chunks_queued": stream_stats['chunks_queued'],
+        "audio_chunks_dropped": stream_stats['chunks_dropped'],
+        "hedging": hedging.snapshot(),
+        "quotas": quota.snapshot(),
+        "circuits": {name: breaker.snapshot() for name, breaker in breakers.items()},
+        "degraded_modes": DEGRADED_MODES,
+        "echo": echo_guard.snapshot(),
+        "playback": pacer.snapshot(),
+        "tts_clips": dict(tts_clip_stats, trimmed_seconds=round(tts_clip_stats['trimmed_seconds'], 1)),
+        "clip_store": clip_store.snapshot(),
+        "pools": {name: pool.snapshot() for name, pool in pools.items()},
+        "fair_share": fair_share.snapshot(),
+        "latency_budget": dict(budget_stats, budget_s=LATENCY_BUDGET),
+        "shedding": dict(shed_stats, pipeline_depth=pipeline_depth),
+        "recognizers": dict(recognizer_stats, mode='dual' if DUAL_RECOGNIZERS else 'single'),
         "forward_to": FORWARD_TO_NUMBER if FORWARD_TO_NUMBER else "not configured"
     }, 200
 
+def parse_time(value):
+    """Epoch seconds from a query parameter: epoch seconds or an ISO date/datetime"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+@app.route('/transcripts')
+def search_transcripts():
+    """Search past calls: ?q=phrase&number=+1555...&since=2024-05-01&until=2024-05-02&conference=...&limit=50"""
+    if not transcripts:
+        return {"error": "transcript store disabled (set TRANSCRIPT_DB)"}, 404
+    if not operator_authorized():
+        return {"error": "unauthorized"}, 401
+    try:
+        results = transcripts.search(
+            phrase=request.args.get('q'),
+            number=request.args.get('number'),
+            since=parse_time(request.args.get('since')),
+            until=parse_time(request.args.get('until')),
+            conference=request.args.get('conference'),
+            limit=request.args.get('limit', 50)
+        )
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    return {"count": len(results), "results": results}, 200
+
+def operator_authorized():
+    """Operator endpoints take the token as a bearer header or, for EventSource, a ?token= parameter"""
+    if not TRANSCRIPTS_TOKEN:
+        return True
+    return (request.headers.get('Authorization') == f"Bearer {TRANSCRIPTS_TOKEN}"
+            or request.args.get('token') == TRANSCRIPTS_TOKEN)
+
+def allow_origin(response):
+    if CAPTIONS_ALLOW_ORIGIN:
+        response.headers['Access-Control-Allow-Origin'] = CAPTIONS_ALLOW_ORIGIN
+    return response
+
+@app.route('/captions')
+def caption_conferences():
+    """Conferences that can be watched live"""
+    if not operator_authorized():
+        return allow_origin(Response('{"error": "unauthorized"}', status=401, mimetype='application/json'))
+    conferences = [{'conference': session.conference_name, 'caller': session.caller.number,
+                    'started': round(session.created)} for session in list(sessions.sessions.values())]
+    return allow_origin(Response(json.dumps({'conferences': conferences}), mimetype='application/json'))
+
+@app.route('/captions/<conference_name>')
+def caption_stream(conference_name):
+    """Server-sent events: transcript, interim, translation and end (plus gap when a slow viewer lost events)"""
+    if not operator_authorized():
+        return allow_origin(Response('{"error": "unauthorized"}', status=401, mimetype='application/json'))
+    if conference_name not in sessions:
+        return allow_origin(Response('{"error": "no such conference"}', status=404, mimetype='application/json'))
+    subscriber = captions.subscribe(conference_name)
+    if subscriber is None:
+        return allow_origin(Response('{"error": "too many viewers"}', status=503, mimetype='application/json'))
+    
+    def stream():
+        try:
+            yield 'retry: 2000\n\n'
+            while True:
+                events, dropped = subscriber.take(CAPTIONS_KEEPALIVE)
+                if dropped:
+                    yield f'event: gap\ndata: {{"dropped": {dropped}}}\n\n'
+                if not events:
+                    if conference_name not in sessions:
+                        yield 'event: end\ndata: {}\n\n'
+                        return
+                    yield ': keepalive\n\n'
+                for kind, _, payload in events:
+                    yield f"event: {kind}\ndata: {payload}\n\n"
+                    if kind == 'end':
+                        return
+        finally:
+            captions.unsubscribe(subscriber)
+    
+    response = Response(stream(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return allow_origin(response)
+
 @app.route('/twilio-webhook', methods=['POST'])
 def twilio_webhook():
     """Handle incoming calls - put caller in conference"""
@@ -219,6 +598,12 @@ def twilio_webhook():
     caller = request.form.get('From')
     to_number = request.form.get('To')
     
+    # Admission control: no headroom, no new call
+    headroom = capacity()
+    if not headroom['accepting_calls']:
+        return busy_twiml(call_sid, headroom)
+    admission_stats['admitted'] += 1
+    
     print(f"\n{'='*60}")
     print(f"📞 INCOMING CALL")
     print(f"   From: {caller}")
@@ -230,11 +615,12 @@ def twilio_webhook():
     conference_name = f"translator-{call_sid}"
     
     # Initialize conference tracking
-    conference_participants[conference_name] = {
-        'caller': {'call_sid': call_sid, 'number': caller, 'language': 'en'},
-        'receiver': {'number': FORWARD_TO_NUMBER, 'language': 'hi'},
-        'conference_sid': None
-    }
+    session = sessions.open(conference_name, tenant=to_number, weight=TENANT_WEIGHTS.get(to_number, 1))
+    session.caller.number, session.caller.language = caller, 'en'
+    session.receiver.number, session.receiver.language = FORWARD_TO_NUMBER, 'hi'
+    sessions.bind_call(session, 'caller', call_sid)
+    if transcripts:
+        transcripts.call_started(conference_name, caller, FORWARD_TO_NUMBER, to_number)
     
     # Put caller in muted conference and start Media Stream
     twiml = f"""<?xml version="1.0" encoding="UTF-8"?>
@@ -263,6 +649,30 @@ def twilio_webhook():
     
     return Response(twiml, mimetype='text/xml')
 
+def busy_twiml(call_sid, headroom):
+    """Turn a call away, or hold it with a busy prompt and retry the webhook (ADMISSION_MODE=queue)"""
+    attempt = int(request.args.get('attempt', '0'))
+    print(f"🚦 No capacity for {call_sid} (score {headroom['score']}, limited by {headroom['limiting']}, attempt {attempt})")
+    
+    if ADMISSION_MODE == 'queue' and attempt < ADMISSION_QUEUE_ATTEMPTS:
+        admission_stats['held'] += 1
+        prompt = "All translators are busy. Please hold." if attempt == 0 else ""
+        twiml = f"""<?xml version="1.0" encoding="UTF-8"?>
+<Response>
+    {f'<Say voice="alice" language="en-US">{prompt}</Say>' if prompt else ''}
+    <Pause length="{ADMISSION_RETRY_SECONDS}"/>
+    <Redirect method="POST">https://{app_domain}/twilio-webhook?attempt={attempt + 1}</Redirect>
+</Response>"""
+        return Response(twiml, mimetype='text/xml')
+    
+    admission_stats['rejected'] += 1
+    twiml = """<?xml version="1.0" encoding="UTF-8"?>
+<Response>
+    <Say voice="alice" language="en-US">Sorry, all translators are busy right now. Please try again in a few minutes.</Say>
+    <Hangup/>
+</Response>"""
+    return Response(twiml, mimetype='text/xml')
+
 def dial_receiver(conference_name, caller_call_sid, caller_number):
     """Dial the receiver and add them to the conference"""
     time.sleep(2)  # Wait for caller to join conference
@@ -279,7 +689,9 @@ def dial_receiver(conference_name, caller_call_sid, caller_number):
             status_callback_event=['answered', 'completed']
         )
         
-        conference_participants[conference_name]['receiver']['call_sid'] = call.sid
+        session = sessions.get(conference_name)
+        if session:
+            sessions.bind_call(session, 'receiver', call.sid)
         print(f"✅ Receiver call initiated: {call.sid}\n")
         
     except Exception as e:
@@ -320,8 +732,10 @@ def conference_status():
     
     print(f"📊 Conference {event}: {conference_name} (SID: {conference_sid})")
     
-    if conference_name in conference_participants:
-        conference_participants[conference_name]['conference_sid'] = conference_sid
+    session = sessions.get(conference_name)
+    if session:
+        session.conference_sid = conference_sid
+        sessions.heartbeat(session)
         
         if event == 'participant-join':
             # For Twilio conferences, the call_sid IS the participant identifier
@@ -329,147 +743,291 @@ def conference_status():
             print(f"   👤 Participant joined: {call_sid}")
             
             # Store call_sid as the participant identifier
-            if call_sid == conference_participants[conference_name]['caller']['call_sid']:
-                conference_participants[conference_name]['caller']['participant_sid'] = call_sid
-                print(f"   ✅ Stored caller participant_sid: {call_sid}")
-            elif 'call_sid' in conference_participants[conference_name]['receiver'] and call_sid == conference_participants[conference_name]['receiver']['call_sid']:
-                conference_participants[conference_name]['receiver']['participant_sid'] = call_sid
-                print(f"   ✅ Stored receiver participant_sid: {call_sid}")
+            joined, role = sessions.by_call_sid(call_sid)
+            if joined is session:
+                session.participant(role).participant_sid = call_sid
+                print(f"   ✅ Stored {role} participant_sid: {call_sid}")
         
         elif event == 'conference-end':
             print(f"🧹 Cleaning up conference: {conference_name}")
-            
-            # Delete all TTS audio files for this conference
-            if 'audio_files' in conference_participants[conference_name]:
-                for filepath in conference_participants[conference_name]['audio_files']:
-                    try:
-                        if os.path.exists(filepath):
-                            os.remove(filepath)
-                            print(f"   🗑️  Deleted: {filepath}")
-                    except Exception as e:
-                        print(f"   ⚠️  Could not delete {filepath}: {e}")
-            
-            # Remove conference tracking data
-            del conference_participants[conference_name]
+            end_session(conference_name)
             print(f"   ✅ Conference cleanup complete")
     
     return Response('', mimetype='text/xml')
 
+def end_session(conference_name):
+    """Stop a conference's streams and drop everything kept for it"""
+    sessions.close(conference_name)
+    forget_conference(conference_name)
+
+def forget_conference(conference_name):
+    # Release this conference's TTS clips; the clip store sweeper deletes them
+    clip_store.release(conference_name)
+    echo_guard.forget(conference_name)
+    pacer.forget(conference_name)
+    fair_share.forget(conference_name)
+    # Speech whose drain job fair_share just dropped would otherwise stay queued forever
+    with backlog_lock:
+        for role in ('caller', 'receiver'):
+            utterance_backlog.pop((conference_name, role), None)
+    log.close_call(conference_name)
+    if archive:
+        archive.close(conference_name)
+    if transcripts:
+        transcripts.call_ended(conference_name)
+    captions.close(conference_name)
+
+sessions.on_reap = lambda session, reason: forget_conference(session.conference_name)
+sessions.start_reaper()
+
 @app.route('/call-status', methods=['POST'])
 def call_status():
-    """Track call status"""
+    """End the session if one of its legs completes and conference-end never follows"""
+    call_sid = request.form.get('CallSid')
+    session, role = sessions.by_call_sid(call_sid)
+    if session:
+        sessions.heartbeat(session)
+        if request.form.get('CallStatus') in ('completed', 'failed', 'busy', 'no-answer', 'canceled'):
+            print(f"📴 {role.capitalize()} call {call_sid} {request.form.get('CallStatus')}")
+            # Give Twilio's conference-end callback a moment before tearing down ourselves
+            threading.Timer(CALL_END_GRACE, end_session_if_open, args=(session,)).start()
     return Response('', mimetype='text/xml')
 
-def detect_language(text):
-    """Detect if text is Hindi or English"""
+def end_session_if_open(session):
+    if sessions.get(session.conference_name) is session:
+        print(f"🧹 No conference-end for {session.conference_name}, cleaning up")
+        end_session(session.conference_name)
+
+# Unicode ranges for scripts that identify a language on their own
+SCRIPT_RANGES = re.compile('[\u0900-\u097F\uA8E0-\uA8FF]')  # Devanagari, Devanagari Extended
+
+# Compact lexicon of Romanized Hindi (Hinglish) words that are not also common English words
+HINGLISH_WORDS = frozenset("""
+    hai hain nahi nahin kya kyun kyon kaise kaisa kaisi kab kahan kaha kitna kitne
+    mera meri mere tera teri tere aap aapka aapki aapke hum humein mujhe tumhe tum
+    aaj kal abhi haan ji theek thik accha acha achha bahut kuch yeh woh wahan yahan
+    mein bhi toh sakte sakta sakti raha rahi rahe gaya gayi karo karna karenge hoon
+    tha thi dhanyavaad dhanyawad shukriya namaste chahiye lekin aur matlab bolo batao
+    """.split())
+HINGLISH_RATIO = 0.3
+
+def classify_language(text):
+    """Fallback classifier: script ranges first, then the Hinglish lexicon"""
+    if SCRIPT_RANGES.search(text):
+        return 'hi'
+    words = [w.strip('.,?!;:"\'').lower() for w in text.split()]
+    words = [w for w in words if w]
+    if words and sum(1 for w in words if w in HINGLISH_WORDS) / len(words) >= HINGLISH_RATIO:
+        return 'hi'
+    return 'en'
+
+def detect_language(text, stt_language_code=None):
+    """
+    Detect if text is Hindi or English.
+    A Hindi language_code from the recognizer is authoritative. English or
+    missing codes are ambiguous - Romanized Hindi is often returned as en-IN or
+    en-US - so the classifier confirms them.
+    """
     if not text:
         return 'en'
     
-    # Check for Devanagari characters
-    devanagari_chars = set('अआइईउऊऋएऐओऔकखगघङचछजझञटठडढणतथदधनपफबभमयरलवशषसह')
-    if any(char in devanagari_chars for char in text):
+    if (stt_language_code or '').lower().startswith('hi'):
         return 'hi'
     
-    return 'en'
+    return classify_language(text)
+
+def _translate_with(client, text, source_lang, target_lang, timeout):
+    # Same request as client.translate(), which has no per-call timeout (it waits up to 60 s)
+    response = client._connection.api_request(
+        method='POST', path='',
+        data={'q': [text], 'target': target_lang, 'source': source_lang, 'format': 'text'},
+        timeout=timeout
+    )
+    return response['data']['translations'][0]['translatedText']
 
-def translate_text(text, source_lang, target_lang):
-    """Translate text between languages with caching"""
+def note_quota_error(api, error):
+    """The provider answered 429: slow our own callers down instead of retrying into it"""
+    if isinstance(error, TooManyRequests):
+        quota.backoff(api)
+
+def quota_for_hedge(api, characters):
+    """Charge a hedge attempt to the API's quota without waiting; False skips the hedge"""
+    try:
+        quota.acquire(api, characters, PRIORITY_BACKGROUND, timeout=0)
+        return True
+    except QuotaExceededError:
+        return False
+
+def translate_text(text, source_lang, target_lang, priority=PRIORITY_FINAL, max_wait=None, timeout=None):
+    """
+    Translate text between languages, served from the translation memory when it has a
+    glossary entry or a close enough earlier sentence, otherwise hedged against slow responses.
+    Returns None when translation failed, timed out or the translate circuit is open;
+    raises QuotaExceededError if quota could not be had within max_wait seconds.
+    """
+    timeout = timeout or TRANSLATE_TIMEOUT
     if not text or source_lang == target_lang:
         return text
     
-    # Check cache
-    cache_key = f"{source_lang}:{target_lang}:{text.lower()}"
-    if cache_key in translation_cache:
-        return translation_cache[cache_key]
+    remembered = translation_memory.lookup(text, source_lang, target_lang)
+    if remembered is not None:
+        return remembered
     
+    # An open circuit must not take (or wait for) quota the other calls need
+    if breakers['translate'].rejects():
+        return None
+    quota.acquire('translate', len(text), priority, max_wait)
     try:
-        result = translate_client.translate(
-            text,
-            source_language=source_lang,
-            target_language=target_lang
-        )
-        translated = result['translatedText']
-        
-        # Cache translation
-        translation_cache[cache_key] = translated
-        
-        # Limit cache size
-        if len(translation_cache) > 1000:
-            translation_cache.clear()
+        translated = breakers['translate'].call(hedging.hedged_call, 'translate', [
+            lambda: _translate_with(translate_client, text, source_lang, target_lang, timeout),
+            lambda: _translate_with(translate_backup_client, text, source_lang, target_lang, timeout)
+        ], timeout, lambda: quota_for_hedge('translate', len(text)))
         
+        translation_memory.add(text, source_lang, target_lang, translated)
         return translated
+    except CircuitOpenError:
+        quota.release('translate', len(text))
+        return None
     except Exception as e:
-        print(f"   ❌ Translation error: {e}")
-        return text
+        note_quota_error('translate', e)
+        log.event('translate', 'error', 'error', error=str(e))
+        return None
 
-def synthesize_speech_url(text, language_code, conference_name):
-    """Generate TTS audio and save to temporary file, return filename - FASTER"""
+def _synthesize_with(client, text, language_code, voice_name, speaking_rate, timeout=None):
+    synthesis_input = texttospeech.SynthesisInput(text=text)
+    
+    voice = texttospeech.VoiceSelectionParams(
+        language_code=language_code,
+        name=voice_name,
+        ssml_gender=texttospeech.SsmlVoiceGender.FEMALE
+    )
+    
+    # Audio configuration - 8 kHz mu-law WAV (phone quality, cheap to trim), paced to the listener's backlog
+    audio_config = texttospeech.AudioConfig(
+        audio_encoding=texttospeech.AudioEncoding.MULAW,
+        sample_rate_hertz=8000,
+        speaking_rate=speaking_rate
+    )
+    
+    response = client.synthesize_speech(
+        input=synthesis_input,
+        voice=voice,
+        audio_config=audio_config,
+        timeout=timeout or TTS_TIMEOUT
+    )
+    return response.audio_content
+
+def synthesize_speech_url(text, language_code, conference_name, speaking_rate=None,
+                          priority=PRIORITY_FINAL, max_wait=None, timeout=None):
+    """
+    Generate TTS audio into the clip store, return its filename.
+    A standard-tier voice (or backup endpoint) is hedged in when the neural voice is slow.
+    Raises QuotaExceededError if TTS quota could not be had within max_wait seconds.
+    """
+    speaking_rate = speaking_rate or pacer.base_rate
+    timeout = timeout or TTS_TIMEOUT
     try:
-        synthesis_input = texttospeech.SynthesisInput(text=text)
-        
-        # Voice configuration based on language - using faster neural voices
-        if language_code == 'hi':
-            voice = texttospeech.VoiceSelectionParams(
-                language_code="hi-IN",
-                name="hi-IN-Neural2-A",
-                ssml_gender=texttospeech.SsmlVoiceGender.FEMALE
-            )
-        else:
-            voice = texttospeech.VoiceSelectionParams(
-                language_code="en-US",
-                name="en-US-Neural2-C",
-                ssml_gender=texttospeech.SsmlVoiceGender.FEMALE
-            )
-        
-        # Audio configuration - MP3 for better quality and size, faster speaking rate
-        audio_config = texttospeech.AudioConfig(
-            audio_encoding=texttospeech.AudioEncoding.MP3,
-            speaking_rate=1.15  # Slightly faster for lower latency
-        )
-        
-        response = tts_client.synthesize_speech(
-            input=synthesis_input,
-            voice=voice,
-            audio_config=audio_config
-        )
+        cache_key = f"{language_code}:{speaking_rate}:{text}"
+        with tts_clip_cache_lock:
+            filename = tts_clip_cache.get(cache_key)
         
-        # Save to file
-        timestamp = int(time.time() * 1000000)
-        filename = f"tts_{timestamp}.mp3"
-        filepath = f"static/{filename}"
+        if filename and clip_store.touch(filename, conference_name):
+            tts_clip_stats['cache_hits'] += 1
+            return filename
         
-        # Create static directory if it doesn't exist
-        os.makedirs('static', exist_ok=True)
+        if breakers['tts'].rejects():
+            return None
+        quota.acquire('tts', len(text), priority, max_wait)
+        locale, neural_voice, standard_voice = TTS_VOICES.get(language_code, TTS_VOICES['en'])
+        audio_content = breakers['tts'].call(hedging.hedged_call, 'tts', [
+            lambda: _synthesize_with(tts_client, text, locale, neural_voice, speaking_rate, timeout),
+            lambda: _synthesize_with(tts_backup_client, text, locale, standard_voice, speaking_rate, timeout)
+        ], timeout, lambda: quota_for_hedge('tts', len(text)))
+        tts_clip_stats['synthesized'] += 1
         
-        with open(filepath, 'wb') as f:
-            f.write(response.audio_content)
+        # Cut Google's silence padding so playback starts speaking sooner
+        audio_content, trimmed = trim_clip(audio_content)
+        tts_clip_stats['trimmed_seconds'] += trimmed
         
-        # Track file for cleanup
-        if conference_name in conference_participants:
-            if 'audio_files' not in conference_participants[conference_name]:
-                conference_participants[conference_name]['audio_files'] = []
-            conference_participants[conference_name]['audio_files'].append(filepath)
+        # Store the clip; it is reclaimed after the conference ends or its TTL passes
+        filename = clip_store.put(audio_content, conference_name)
+        with tts_clip_cache_lock:
+            tts_clip_cache[cache_key] = filename
+            while len(tts_clip_cache) > TTS_CLIP_CACHE_SIZE:
+                del tts_clip_cache[next(iter(tts_clip_cache))]
         
-        # Return filename only
         return filename
+    except CircuitOpenError:
+        quota.release('tts', len(text))
+        return None
+    except QuotaExceededError:
+        raise
     except Exception as e:
-        print(f"   ❌ TTS error: {e}")
+        note_quota_error('tts', e)
+        log.event('tts', 'error', 'error', error=str(e))
         return None
 
-def play_audio_to_participant(conference_sid, participant_sid, audio_filename):
+def warm_phrase(kind, lang, text):
+    """Translate a frequent transcript (or take a frequent translation) and synthesize it at the base rate"""
+    if kind == 'transcript':
+        target_lang = "hi" if lang == "en" else "en"
+        text = translate_text(text, lang, target_lang, PRIORITY_BACKGROUND, max_wait=0)
+        lang = target_lang
+    if text:
+        synthesize_speech_url(text, lang, WARM_CLIP_OWNER, priority=PRIORITY_BACKGROUND, max_wait=0)
+
+phrases.start_warmer(warm_phrase, PHRASE_WARM_TOP, PHRASE_WARM_INTERVAL)
+
+# Initialize "translation unavailable" prompts
+UNAVAILABLE_PROMPTS = generate_unavailable_prompts()
+
+def update_participant(conference_sid, participant_sid, timeout=None, **params):
+    """
+    Update a conference participant (Twilio parameter names, e.g. AnnounceUrl, Muted).
+    Same request as participants(...).update(), which has no per-call timeout.
+    """
+    uri = (f"{twilio_client.api.base_url}/2010-04-01/Accounts/{twilio_client.account_sid}"
+           f"/Conferences/{conference_sid}/Participants/{participant_sid}.json")
+    response = twilio_client.request('POST', uri, data=params, timeout=timeout or TWILIO_TIMEOUT)
+    if response.status_code >= 400:
+        raise TwilioRestException(response.status_code, uri, response.text, method='POST')
+    return response
+
+def play_audio_to_participant(conference_sid, participant_sid, audio_filename, timeout=None):
     """Play audio to a specific conference participant using announce_url"""
     try:
         # Use the Conference Participant API to play audio
         # announce_url needs to point to a TwiML endpoint
         announce_twiml_url = f"https://{app_domain}/play-tts/{audio_filename}"
         
-        twilio_client.conferences(conference_sid).participants(participant_sid).update(
-            announce_url=announce_twiml_url,
-            announce_method='GET'
+        breakers['twilio'].call(
+            update_participant, conference_sid, participant_sid, timeout,
+            AnnounceUrl=announce_twiml_url,
+            AnnounceMethod='GET'
+        )
+        return True
+    except Exception as e:
+        log.event('twilio', 'announce_error', 'error', participant=participant_sid, error=str(e))
+        return False
+
+def say_to_participant(conference_sid, participant_sid, text, language_code):
+    """Fallback when TTS is down: have Twilio speak the translation with <Say>"""
+    token = f"say_{int(time.time() * 1000000)}"
+    say_prompts[token] = (text, TTS_VOICES.get(language_code, TTS_VOICES['en'])[0])
+    
+    # Keep the prompt table bounded (dicts preserve insertion order)
+    while len(say_prompts) > 500:
+        del say_prompts[next(iter(say_prompts))]
+    
+    try:
+        breakers['twilio'].call(
+            update_participant, conference_sid, participant_sid,
+            AnnounceUrl=f"https://{app_domain}/say-tts/{token}",
+            AnnounceMethod='GET'
         )
         return True
     except Exception as e:
-        print(f"   ❌ Error playing audio: {e}")
+        log.event('twilio', 'say_error', 'error', participant=participant_sid, error=str(e))
         return False
 
 def play_comfort_tone(conference_sid, participant_sid):
@@ -477,32 +1035,381 @@ def play_comfort_tone(conference_sid, participant_sid):
     if COMFORT_TONE and conference_sid and participant_sid:
         try:
             announce_twiml_url = f"https://{app_domain}/play-tts/{COMFORT_TONE}"
-            twilio_client.conferences(conference_sid).participants(participant_sid).update(
-                announce_url=announce_twiml_url,
-                announce_method='GET'
+            breakers['twilio'].call(
+                update_participant, conference_sid, participant_sid, STAGE_TIMEOUT_FLOORS['twilio'],
+                AnnounceUrl=announce_twiml_url,
+                AnnounceMethod='GET'
             )
         except Exception as e:
             pass  # Silently fail for comfort tone
 
-def stream_audio_processor(audio_queue, stream_id, participant_role, conference_name, primary_lang, alt_langs):
+def set_passthrough(conference_name, enabled):
+    """Unmute (or re-mute) both participants so they hear each other untranslated"""
+    session = sessions.get(conference_name)
+    if not session or not session.conference_sid:
+        return
+    if session.passthrough == enabled:
+        return
+    
+    conference_sid = session.conference_sid
+    try:
+        for participant in (session.caller, session.receiver):
+            participant_sid = participant.participant_sid
+            if participant_sid:
+                breakers['twilio'].call(
+                    update_participant, conference_sid, participant_sid,
+                    Muted='false' if enabled else 'true'
+                )
+        session.passthrough = enabled
+        print(f"   {'🔊 Passthrough ON' if enabled else '🔇 Passthrough OFF'} for {conference_name}")
+    except Exception as e:
+        print(f"   ❌ Could not switch passthrough for {conference_name}: {e}")
+
+def play_unavailable_prompt(conference_name, target_role, language):
+    """Tell the listener translation is unavailable, at most once per interval"""
+    session = sessions.get(conference_name)
+    if not session:
+        return
+    participant = session.participant(target_role)
+    conference_sid = session.conference_sid
+    participant_sid = participant.participant_sid
+    if not conference_sid or not participant_sid:
+        return
+    
+    now = time.time()
+    if now - participant.last_unavailable_prompt < UNAVAILABLE_PROMPT_INTERVAL:
+        return
+    participant.last_unavailable_prompt = now
+    
+    if language in UNAVAILABLE_PROMPTS:
+        play_audio_to_participant(conference_sid, participant_sid, UNAVAILABLE_PROMPTS[language])
+    else:
+        say_to_participant(conference_sid, participant_sid, UNAVAILABLE_PROMPT_TEXT.get(language, UNAVAILABLE_PROMPT_TEXT['en']), language)
+
+def playback_seconds(audio_filename=None, text=None):
+    """Rough duration of translated audio we are about to play"""
+    if audio_filename:
+        try:
+            clip = clip_store.get(audio_filename)
+            return (clip.size if clip else os.path.getsize(f"static/{audio_filename}")) / TTS_BYTES_PER_SECOND
+        except OSError:
+            pass
+    return len(text or '') / SAY_CHARS_PER_SECOND
+
+def degrade(stage, conference_name, target_role, target_lang, text=None):
+    """Apply the configured degraded mode for a failed or open stage"""
+    mode = DEGRADED_MODES.get(stage, 'prompt')
+    if mode == 'passthrough':
+        set_passthrough(conference_name, True)
+    elif mode == 'text' and text:
+        session = sessions.get(conference_name)
+        participant_sid = session and session.participant(target_role).participant_sid
+        if session and session.conference_sid and participant_sid:
+            seconds = playback_seconds(text=text)
+            if ECHO_SUPPRESSION:
+                echo_guard.mark_playback(conference_name, target_role, seconds, text)
+            say_to_participant(session.conference_sid, participant_sid, text, target_lang)
+            pacer.scheduled((conference_name, target_role), seconds)
+    else:
+        play_unavailable_prompt(conference_name, target_role, target_lang)
+
+def refresh_passthrough(name, old_state, new_state):
+    """Breaker listener: enter or leave passthrough on every active conference"""
+    needed = any(
+        breaker.is_open() and DEGRADED_MODES.get(stage) == 'passthrough'
+        for stage, breaker in breakers.items()
+    )
+    for conference_name in list(sessions.sessions):
+        pools['twilio'].submit(set_passthrough, conference_name, needed)
+
+for _breaker in breakers.values():
+    if _breaker.name != 'twilio':
+        _breaker.on_state_change(refresh_passthrough)
+
+class TranscriptGate:
+    """Decides which recognition results are worth translating for one stream"""
+    
+    def __init__(self):
+        self.last_transcript = ""
+        self.last_timestamp = time.time()
+    
+    def admit(self, transcript, is_final, confidence):
+        """Final results with good confidence, or interim results if enough time passed"""
+        current_time = time.time()
+        time_since_last = current_time - self.last_timestamp
+        
+        should_process = (
+            (is_final and confidence > 0.5 and transcript != self.last_transcript) or
+            (not is_final and time_since_last > 1.5 and len(transcript) > 5 and transcript != self.last_transcript)
+        )
+        
+        if should_process and transcript:
+            self.last_transcript = transcript
+            self.last_timestamp = current_time
+            return True
+        return False
+
+class Utterance:
+    """A transcript waiting for translation, with the time after which it is useless"""
+    
+    def __init__(self, text, is_final, lang, created, deadline):
+        self.text = text
+        self.is_final = is_final
+        self.lang = lang
+        self.created = created
+        self.deadline = deadline
+    
+    def merged(self, later):
+        """Collapse a later final into this one, taking on its deadline"""
+        return Utterance(f"{self.text} {later.text}", True, self.lang, self.created, later.deadline)
+
+# Utterances waiting for a worker, per speaking leg (conference, role)
+utterance_backlog = defaultdict(list)
+backlog_lock = threading.Lock()
+pipeline_depth = 0  # deliveries submitted to the pipeline pool and not yet finished
+shed_stats = {
+    'shed_on_admission': 0,   # interims refused because the pipeline is backed up
+    'superseded_interim': 0,  # interims replaced by newer speech before a worker got to them
+    'expired_interim': 0,
+    'expired_final': 0,
+    'collapsed': 0,           # finals merged into the next final from the same speaker
+    'too_late': 0,            # dropped because translation + TTS would finish past the deadline
+    'call_ended': 0,          # dropped because the conference ended while the utterance was in the pipeline
+    'rate_limited': 0         # no API quota available before the deadline
+}
+
+def expected_delivery_seconds(stages=('translate', 'tts')):
+    """Typical remaining latency, from the hedging latency trackers"""
+    total = 0
+    for stage in stages:
+        if stage == 'twilio':
+            total += TWILIO_ANNOUNCE_ESTIMATE
+            continue
+        tracker = hedging.trackers[stage]
+        median = tracker.quantile(0.5)
+        total += median if median is not None else tracker.default_delay
+    return total
+
+budget_stats = {'within_budget': 0, 'over_budget': 0, 'overruns': {'translate': 0, 'tts': 0, 'twilio': 0}}
+
+class LatencyBudget:
+    """Time left for one utterance; each stage takes its timeout out of it"""
+    
+    def __init__(self, started):
+        self.deadline = started + LATENCY_BUDGET
+    
+    def timeout(self, stage, later_stages=()):
+        """What is left after reserving typical time for the later stages, within the stage's floor and cap"""
+        cap = {'translate': TRANSLATE_TIMEOUT, 'tts': TTS_TIMEOUT, 'twilio': TWILIO_TIMEOUT}[stage]
+        left = self.deadline - time.time() - expected_delivery_seconds(later_stages)
+        return min(cap, max(STAGE_TIMEOUT_FLOORS[stage], left))
+    
+    def check(self, stage, started, timeout):
+        """Count a stage that used up its whole timeout"""
+        if time.time() - started >= timeout:
+            budget_stats['overruns'][stage] += 1
+    
+    def finish(self):
+        budget_stats['within_budget' if time.time() <= self.deadline else 'over_budget'] += 1
+
+def enqueue_utterance(conference_name, participant_role, text, is_final, lang):
+    """Queue an utterance for translation; interims are shed first when the pipeline backs up"""
+    global pipeline_depth
+    if not is_final and pipeline_depth >= SHED_INTERIMS_ABOVE:
+        shed_stats['shed_on_admission'] += 1
+        log.event('pipeline', 'shed_interim', 'debug', conference=conference_name, role=participant_role, depth=pipeline_depth)
+        return
+    
+    now = time.time()
+    window = UTTERANCE_DEADLINE_FINAL if is_final else UTTERANCE_DEADLINE_INTERIM
+    with backlog_lock:
+        utterance_backlog[(conference_name, participant_role)].append(Utterance(text, is_final, lang, now, now + window))
+        pipeline_depth += 1
+    session = sessions.get(conference_name)
+    weight = session.weight if session else 1
+    fair_share.submit(conference_name, weight, drain_utterances, conference_name, participant_role)
+
+def release_pipeline_slot():
+    """A drain job finished or was dropped (its utterances stay in the backlog until drained or expired)"""
+    global pipeline_depth
+    with backlog_lock:
+        pipeline_depth -= 1
+
+fair_share = FairScheduler(pools['pipeline'], pools['pipeline'].workers, on_drop=release_pipeline_slot)
+
+def take_utterances(key):
     """
-    ASYNC processor that consumes audio from queue and performs streaming recognition
-    Automatically restarts every 50 seconds to avoid Google's 60-second limit
-    This runs in a separate thread to keep the WebSocket non-blocking
+    Pop everything pending for one leg: expired and superseded work is shed and
+    consecutive same-language finals are collapsed into a single delivery
     """
-    print(f"🎯 Started audio processor thread for {stream_id} ({participant_role})")
+    with backlog_lock:
+        pending = utterance_backlog.pop(key, [])
     
-    last_transcript = ""
-    last_timestamp = time.time()
-    session_count = 0
+    now = time.time()
+    batches = []
+    for index, utterance in enumerate(pending):
+        if now > utterance.deadline:
+            shed_stats['expired_final' if utterance.is_final else 'expired_interim'] += 1
+        elif not utterance.is_final and index < len(pending) - 1:
+            shed_stats['superseded_interim'] += 1
+        elif batches and batches[-1].is_final and utterance.is_final and batches[-1].lang == utterance.lang:
+            batches[-1] = batches[-1].merged(utterance)
+            shed_stats['collapsed'] += 1
+        else:
+            batches.append(utterance)
+    return batches
+
+def drain_utterances(conference_name, participant_role):
+    """Pipeline task: deliver whatever is still worth delivering for this leg"""
+    try:
+        for utterance in take_utterances((conference_name, participant_role)):
+            translate_and_play(utterance, conference_name, participant_role)
+    finally:
+        release_pipeline_slot()
+
+def too_late(utterance, stages):
+    if time.time() + expected_delivery_seconds(stages) <= utterance.deadline:
+        return False
+    shed_stats['too_late'] += 1
+    log.event('pipeline', 'shed_stale', age_s=round(time.time() - utterance.created, 2), text=utterance.text[:40])
+    return True
+
+def call_ended(conference_name):
+    """True (and counted) when the conference is gone, so no more API calls are spent on it"""
+    if sessions.get(conference_name):
+        return False
+    shed_stats['call_ended'] += 1
+    return True
+
+def announce_translation(budget, conference_sid, participant_sid, audio_filename):
+    """Twilio pool task: play a synthesized translation with whatever budget is left"""
+    timeout = budget.timeout('twilio')
+    started = time.time()
+    play_audio_to_participant(conference_sid, participant_sid, audio_filename, timeout)
+    budget.check('twilio', started, timeout)
+    budget.finish()
+
+def translate_and_play(utterance, conference_name, participant_role):
+    """Translate, synthesize and play one utterance to the other participant"""
+    target_lang = "hi" if utterance.lang == "en" else "en"
+    target_role = "receiver" if participant_role == "caller" else "caller"
     
-    # Create streaming config
-    config = speech.StreamingRecognitionConfig(
+    # Finals queue for quota ahead of interims, but nobody waits past their deadline
+    priority = PRIORITY_FINAL if utterance.is_final else PRIORITY_INTERIM
+    budget = LatencyBudget(utterance.created)
+    
+    if too_late(utterance, ('translate', 'tts')) or call_ended(conference_name):
+        return
+    
+    text = utterance.text
+    if TEXT_NORMALIZATION:
+        text = normalizer.normalize(utterance.text, utterance.lang)
+        if not text:
+            return  # nothing but fillers
+        if utterance.is_final:
+            normalizer.compare(utterance.text, text, utterance.lang)
+    
+    try:
+        max_wait = max(0.0, utterance.deadline - time.time() - expected_delivery_seconds(('translate', 'tts')))
+        timeout = budget.timeout('translate', ('tts', 'twilio'))
+        started = time.time()
+        translated_text = translate_text(text, utterance.lang, target_lang, priority, max_wait, timeout)
+        budget.check('translate', started, timeout)
+        if translated_text is None:
+            pools['twilio'].submit(degrade, 'translate', conference_name, target_role, target_lang)
+            return
+        log.transcript(conference_name, target_role, 'translation', translated_text, lang=target_lang,
+                       source=utterance.text, final=utterance.is_final)
+        if transcripts and utterance.is_final:
+            transcripts.record(conference_name, target_role, 'translation', target_lang, translated_text, utterance.text)
+        if utterance.is_final:
+            phrases.observe('transcript', utterance.lang, text)
+            phrases.observe('translation', target_lang, translated_text)
+        captions.publish(conference_name, 'translation', target_role, text=translated_text, lang=target_lang,
+                         source=utterance.text, final=utterance.is_final)
+        
+        if too_late(utterance, ('tts',)) or call_ended(conference_name):
+            return
+        
+        speaking_rate = pacer.speaking_rate((conference_name, target_role))
+        max_wait = max(0.0, utterance.deadline - time.time() - expected_delivery_seconds(('tts',)))
+        timeout = budget.timeout('tts', ('twilio',))
+        started = time.time()
+        audio_filename = synthesize_speech_url(translated_text, target_lang, conference_name, speaking_rate,
+                                               priority, max_wait, timeout)
+        budget.check('tts', started, timeout)
+    except QuotaExceededError as e:
+        shed_stats['rate_limited'] += 1
+        log.event('pipeline', 'shed_quota', conference=conference_name, quota=e.name, waited_s=round(e.waited, 2))
+        return
+    
+    session = sessions.get(conference_name)
+    conference_sid = session and session.conference_sid
+    target_participant_sid = session and session.participant(target_role).participant_sid
+    
+    if audio_filename and conference_sid and target_participant_sid:
+        seconds = playback_seconds(audio_filename)
+        if ECHO_SUPPRESSION:
+            echo_guard.mark_playback(conference_name, target_role, seconds, translated_text)
+        backlog = pacer.scheduled((conference_name, target_role), seconds)
+        pools['twilio'].submit(announce_translation, budget, conference_sid, target_participant_sid, audio_filename)
+        clip = archive and clip_store.get(audio_filename)
+        if clip:
+            archive.clip(conference_name, f"to_{target_role}", clip.path, translated_text)
+        log.event('pipeline', 'delivered', conference=conference_name, role=target_role,
+                  rate=speaking_rate, backlog_s=round(backlog, 1), latency_s=round(time.time() - utterance.created, 3))
+    elif not audio_filename:
+        pools['twilio'].submit(degrade, 'tts', conference_name, target_role, target_lang, text=translated_text)
+        log.event('pipeline', 'degraded', 'warning', conference=conference_name, role=target_role, mode=DEGRADED_MODES['tts'])
+
+def route_transcript(transcript, is_final, confidence, result_language, participant_role, conference_name):
+    """Detect the utterance language, play comfort tone and hand translation + playback to the pipeline pool"""
+    target_role = "receiver" if participant_role == "caller" else "caller"
+    
+    # Drop our own playback (echo) or the other party's voice (crosstalk) picked up on this leg
+    if ECHO_SUPPRESSION:
+        repeat = echo_guard.check(conference_name, participant_role, target_role, transcript)
+        if repeat:
+            log.event('call', f"dropped_{repeat}", conference=conference_name, role=participant_role, text=transcript)
+            return
+    
+    # Route by the language the recognizer heard for this utterance
+    detected_lang = detect_language(transcript, result_language)
+    if is_final:
+        log.transcript(conference_name, participant_role, 'transcript', transcript, lang=detected_lang,
+                       stt_lang=result_language, confidence=round(confidence, 2))
+        if archive:
+            archive.mark(conference_name, participant_role, 'transcript', text=transcript, lang=detected_lang)
+        if transcripts:
+            transcripts.record(conference_name, participant_role, 'transcript', detected_lang, transcript)
+    else:
+        log.event('stt', 'interim', 'debug', conference=conference_name, role=participant_role,
+                  text=transcript, lang=detected_lang)
+    captions.publish(conference_name, 'transcript' if is_final else 'interim', participant_role,
+                     text=transcript, lang=detected_lang)
+    
+    session = sessions.get(conference_name)
+    if not session:
+        return
+    
+    conference_sid = session.conference_sid
+    target_participant_sid = session.participant(target_role).participant_sid
+    
+    # Play comfort tone immediately (not while translation is degraded)
+    if conference_sid and target_participant_sid and COMFORT_TONE and not breakers['translate'].is_open():
+        pools['comfort'].submit(play_comfort_tone, conference_sid, target_participant_sid)
+    
+    # Translate and synthesize in parallel thread, unless it is already too late to matter
+    enqueue_utterance(conference_name, participant_role, transcript, is_final, detected_lang)
+
+def recognition_config(primary_lang, alt_langs=None):
+    """Streaming config for one recognizer"""
+    return speech.StreamingRecognitionConfig(
         config=speech.RecognitionConfig(
             encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
             sample_rate_hertz=8000,
             language_code=primary_lang,
-            alternative_language_codes=alt_langs,
+            alternative_language_codes=alt_langs or [],
             enable_automatic_punctuation=True,
             model="latest_short",
             use_enhanced=True
@@ -510,19 +1417,53 @@ def stream_audio_processor(audio_queue, stream_id, participant_role, conference_
         interim_results=True,  # Get interim results for faster response
         single_utterance=False
     )
+
+def run_recognition_sessions(audio_queue, label, config, on_result, keep_running, on_degraded):
+    """
+    Feed queued audio to streaming recognition until keep_running() is False.
+    Restarts the session every 50 seconds to avoid Google's 60-second limit; while
+    the STT circuit is open, audio is discarded and on_degraded() is called instead, once
+    when the circuit opens and then every UNAVAILABLE_PROMPT_INTERVAL seconds.
+    Returns the number of sessions started.
+    """
+    session_count = 0
+    degraded_notice = None  # when on_degraded() last ran in the current outage
     
     # CONTINUOUS LOOP - Restart streaming session every 50 seconds to avoid 60-second timeout
-    while stream_id in audio_queues:
+    while keep_running():
+        if not breakers['stt'].allow_request():
+            # Degraded: drop audio rather than let it back up behind a dead recognizer
+            if degraded_notice is None or time.time() - degraded_notice >= UNAVAILABLE_PROMPT_INTERVAL:
+                degraded_notice = time.time()
+                on_degraded()
+            while True:
+                try:
+                    if audio_queue.get_nowait() is None:
+                        break
+                except queue.Empty:
+                    break
+            time.sleep(0.5)
+            continue
+        degraded_notice = None
+        
+        # New streaming sessions count against the STT request quota
+        try:
+            quota.acquire('stt', priority=PRIORITY_FINAL, timeout=2.0)
+        except QuotaExceededError as e:
+            log.event('stt', 'quota_wait', 'warning', stream=label, error=str(e))
+            continue
+        
         session_count += 1
+        session_healthy = False
         session_start_time = time.time()
-        print(f"🔄 Starting streaming session #{session_count} for {participant_role}")
+        log.event('stt', 'session_start', stream=label, session=session_count)
         
         def request_generator():
             """Generate audio chunks for streaming recognition"""
-            while stream_id in audio_queues:
+            while keep_running():
                 # Auto-restart after 50 seconds to avoid Google's 60-second limit
                 if time.time() - session_start_time > 50:
-                    print(f"⏰ Session #{session_count} reached 50s limit, restarting...")
+                    log.event('stt', 'session_restart', 'debug', stream=label, session=session_count)
                     break
                     
                 try:
@@ -535,80 +1476,222 @@ def stream_audio_processor(audio_queue, stream_id, participant_role, conference_
         
         try:
             # Use streaming_recognize for true streaming with interim results
-            responses = speech_client.streaming_recognize(config, request_generator())
+            responses = speech_client.streaming_recognize(config, request_generator(), timeout=STT_SESSION_TIMEOUT)
             
             for response in responses:
-                if stream_id not in audio_queues:  # Stream closed
+                if not session_healthy:
+                    breakers['stt'].record_success()
+                    session_healthy = True
+                if not keep_running():  # Stream closed
                     break
                     
                 for result in response.results:
-                    if not result.alternatives:
-                        continue
-                        
-                    transcript = result.alternatives[0].transcript.strip()
-                    confidence = result.alternatives[0].confidence if result.is_final else 0.7
-                    is_final = result.is_final
-                    
-                    # Process final results with good confidence, or interim results if enough time passed
-                    current_time = time.time()
-                    time_since_last = current_time - last_timestamp
-                    
-                    should_process = (
-                        (is_final and confidence > 0.5 and transcript != last_transcript) or
-                        (not is_final and time_since_last > 1.5 and len(transcript) > 5 and transcript != last_transcript)
-                    )
-                    
-                    if should_process and transcript:
-                        print(f"\n🎤 {participant_role.upper()} {'[FINAL]' if is_final else '[INTERIM]'}: {transcript} (conf: {confidence:.2f})")
-                        last_transcript = transcript
-                        last_timestamp = current_time
-                        
-                        # Detect language
-                        detected_lang = detect_language(transcript)
-                        print(f"   🔍 Detected language: {detected_lang}")
-                        
-                        # Determine target language
-                        target_lang = "hi" if detected_lang == "en" else "en"
-                        target_role = "receiver" if participant_role == "caller" else "caller"
-                        
-                        if conference_name in conference_participants:
-                            conf_info = conference_participants[conference_name]
-                            conference_sid = conf_info.get('conference_sid')
-                            target_participant = conf_info.get(target_role, {})
-                            target_participant_sid = target_participant.get('participant_sid')
-                            
-                            # Play comfort tone immediately
-                            if conference_sid and target_participant_sid and COMFORT_TONE:
-                                executor.submit(play_comfort_tone, conference_sid, target_participant_sid)
-                            
-                            # Translate and synthesize in parallel thread
-                            def translate_and_play():
-                                translated_text = translate_text(transcript, detected_lang, target_lang)
-                                print(f"   🔄 Translated to {target_lang}: {translated_text}")
-                                
-                                audio_filename = synthesize_speech_url(translated_text, target_lang, conference_name)
-                                
-                                if audio_filename and conference_sid and target_participant_sid:
-                                    play_audio_to_participant(conference_sid, target_participant_sid, audio_filename)
-                                    print(f"   ✅ Translation delivered to {target_role}")
-                            
-                            executor.submit(translate_and_play)
+                    if result.alternatives:
+                        on_result(result)
+            
+            if not session_healthy:
+                # Session ended cleanly without results (e.g. silence) - recognizer is fine
+                breakers['stt'].record_success()
         
         except Exception as e:
-            print(f"❌ Stream processor error for {stream_id} session #{session_count}: {e}")
-            import traceback
-            traceback.print_exc()
-            # Wait a bit before restarting after error
-            time.sleep(1)
+            # The breaker decides when to try again; no traceback per stream during an outage
+            breakers['stt'].record_failure()
+            note_quota_error('stt', e)
+            log.event('stt', 'session_error', 'error', stream=label, session=session_count, error=str(e))
+            time.sleep(0.5)
         
         # Check if we should continue (stream still active)
-        if stream_id not in audio_queues:
+        if not keep_running():
             break
         
         # Brief pause before restarting session
         time.sleep(0.1)
     
-    print(f"🛑 Audio processor thread stopped for {stream_id} after {session_count} sessions")
+    return session_count
+
+def stream_audio_processor(audio_queue, stream_id, participant_role, conference_name, primary_lang, alt_langs):
+    """
+    ASYNC processor that consumes audio from queue and performs streaming recognition
+    This runs in a separate thread to keep the WebSocket non-blocking
+    With DUAL_RECOGNIZERS enabled, hi-IN and en-US recognizers race instead
+    """
+    log.event('stt', 'processor_start', stream=stream_id)
+    
+    if DUAL_RECOGNIZERS:
+        DualRecognizer(audio_queue, stream_id, participant_role, conference_name, primary_lang).run()
+        return
+    
+    other_role = "receiver" if participant_role == "caller" else "caller"
+    other_lang = "hi" if participant_role == "caller" else "en"
+    gate = TranscriptGate()
+    
+    def on_result(result):
+        transcript = result.alternatives[0].transcript.strip()
+        confidence = result.alternatives[0].confidence if result.is_final else 0.7
+        if gate.admit(transcript, result.is_final, confidence):
+            route_transcript(transcript, result.is_final, confidence, result.language_code,
+                             participant_role, conference_name)
+    
+    session_count = run_recognition_sessions(
+        audio_queue, f"{stream_id} ({participant_role})",
+        recognition_config(primary_lang, alt_langs), on_result,
+        keep_running=lambda: sessions.is_streaming(conference_name, participant_role, audio_queue),
+        on_degraded=lambda: pools['twilio'].submit(degrade, 'stt', conference_name, other_role, other_lang)
+    )
+    
+    log.event('stt', 'processor_stop', stream=stream_id, sessions=session_count)
+
+class DualRecognizer:
+    """
+    Runs a hi-IN and an en-US recognizer side by side on the same audio and picks
+    each utterance by final-result confidence. Once one language has won
+    DUAL_LOCK_AFTER utterances in a row the other recognizer is stopped; repeated
+    low-confidence finals unlock it again.
+    """
+    
+    def __init__(self, audio_queue, stream_id, participant_role, conference_name, primary_lang):
+        self.audio_queue = audio_queue
+        self.stream_id = stream_id
+        self.participant_role = participant_role
+        self.conference_name = conference_name
+        self.primary_lang = primary_lang if primary_lang in DUAL_LANGUAGES else DUAL_LANGUAGES[0]
+        self.other_role = "receiver" if participant_role == "caller" else "caller"
+        self.other_lang = "hi" if participant_role == "caller" else "en"
+        
+        self.lanes = {code: {'queue': queue.Queue(maxsize=100), 'active': False} for code in DUAL_LANGUAGES}
+        self.results = queue.Queue()
+        self.pending = {}        # lane -> (transcript, confidence, received_at)
+        self.gate = TranscriptGate()
+        self.streak_lane = None
+        self.streak = 0
+        self.locked = None
+        self.low_confidence = 0
+    
+    def stream_open(self):
+        return sessions.is_streaming(self.conference_name, self.participant_role, self.audio_queue)
+    
+    def leader(self):
+        return self.locked or self.streak_lane or self.primary_lang
+    
+    def start_lane(self, code):
+        lane = self.lanes[code]
+        lane['active'] = True
+        lane['queue'] = queue.Queue(maxsize=100)
+        threading.Thread(target=self.lane_worker, args=(code, lane), daemon=True).start()
+    
+    def stop_lane(self, code):
+        lane = self.lanes[code]
+        lane['active'] = False
+        try:
+            lane['queue'].put_nowait(None)
+        except queue.Full:
+            pass
+    
+    def lane_worker(self, code, lane):
+        run_recognition_sessions(
+            lane['queue'], f"{self.stream_id} ({self.participant_role}, {code})",
+            recognition_config(code), lambda result: self.results.put((code, result)),
+            keep_running=lambda: self.stream_open() and lane['active'],
+            on_degraded=lambda: pools['twilio'].submit(degrade, 'stt', self.conference_name, self.other_role, self.other_lang)
+        )
+    
+    def fan_out(self):
+        """Copy every audio chunk to each active recognizer"""
+        while self.stream_open():
+            try:
+                chunk = self.audio_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if chunk is None:
+                break
+            for lane in self.lanes.values():
+                if lane['active']:
+                    try:
+                        lane['queue'].put_nowait(chunk)
+                    except queue.Full:
+                        pass
+        for code in self.lanes:
+            self.stop_lane(code)
+    
+    def deliver(self, code, transcript, is_final, confidence):
+        if self.gate.admit(transcript, is_final, confidence):
+            route_transcript(transcript, is_final, confidence, code, self.participant_role, self.conference_name)
+    
+    def decide(self, force=False):
+        """Pick the best pending final once every active lane answered or the race window closed"""
+        if not self.pending:
+            return
+        active = [code for code, lane in self.lanes.items() if lane['active']]
+        oldest = min(received for _, _, received in self.pending.values())
+        if not force and len(self.pending) < len(active) and time.time() - oldest < DUAL_RACE_WINDOW:
+            return
+        
+        winner = max(self.pending, key=lambda code: (self.pending[code][1], code == self.primary_lang))
+        transcript, confidence, _ = self.pending[winner]
+        self.pending = {}
+        recognizer_stats['race_decisions'] += 1
+        self.deliver(winner, transcript, True, confidence)
+        
+        self.streak = self.streak + 1 if winner == self.streak_lane else 1
+        self.streak_lane = winner
+        if self.streak >= DUAL_LOCK_AFTER and confidence >= DUAL_UNLOCK_CONFIDENCE:
+            self.lock(winner)
+    
+    def lock(self, code):
+        self.locked = code
+        self.low_confidence = 0
+        recognizer_stats['locks'] += 1
+        for other in self.lanes:
+            if other != code:
+                self.stop_lane(other)
+        log.event('stt', 'locked', stream=self.stream_id, lang=code)
+    
+    def unlock(self):
+        log.event('stt', 'unlocked', stream=self.stream_id, lang=self.locked)
+        self.locked = None
+        self.streak = 0
+        recognizer_stats['unlocks'] += 1
+        for code, lane in self.lanes.items():
+            if not lane['active']:
+                self.start_lane(code)
+    
+    def handle(self, code, result):
+        transcript = result.alternatives[0].transcript.strip()
+        is_final = result.is_final
+        confidence = result.alternatives[0].confidence if is_final else 0.7
+        
+        if self.locked:
+            if code != self.locked:
+                return
+            if is_final:
+                self.low_confidence = self.low_confidence + 1 if confidence < DUAL_UNLOCK_CONFIDENCE else 0
+            self.deliver(code, transcript, is_final, confidence)
+            if self.low_confidence >= DUAL_UNLOCK_AFTER:
+                self.unlock()
+            return
+        
+        if is_final:
+            self.pending[code] = (transcript, confidence, time.time())
+            self.decide()
+        elif code == self.leader():
+            self.deliver(code, transcript, False, confidence)
+    
+    def run(self):
+        recognizer_stats['dual_streams'] += 1
+        for code in self.lanes:
+            self.start_lane(code)
+        threading.Thread(target=self.fan_out, daemon=True).start()
+        
+        while self.stream_open():
+            try:
+                code, result = self.results.get(timeout=0.1)
+                self.handle(code, result)
+            except queue.Empty:
+                pass
+            self.decide()
+        
+        self.decide(force=True)
+        log.event('stt', 'processor_stop', stream=self.stream_id, locked=self.locked)
 
 @sock.route('/media-stream/<conference_name>/<participant_role>')
 def media_stream(ws, conference_name, participant_role):
@@ -620,20 +1703,15 @@ def media_stream(ws, conference_name, participant_role):
     stream_sid = None
     stream_id = f"{conference_name}:{participant_role}"
     
-    # Create audio queue for this stream
+    # Create audio queue for this stream; a stream for a conference we never saw still gets a session
     audio_queue = queue.Queue(maxsize=100)
-    audio_queues[stream_id] = audio_queue
+    session = sessions.get_or_open(conference_name)
+    sessions.bind_stream(session, participant_role, audio_queue, ws)
     
     # Buffer for accumulating small chunks
     audio_buffer = bytearray()
     
-    print(f"\n{'='*60}")
-    print(f"🔌 WebSocket CONNECTED (NON-BLOCKING)")
-    print(f"   Conference: {conference_name}")
-    print(f"   Role: {participant_role}")
-    print(f"   Stream ID: {stream_id}")
-    print(f"   Time: {datetime.now().strftime('%H:%M:%S')}")
-    print(f"{'='*60}\n")
+    log.event('stream', 'connected', conference=conference_name, role=participant_role)
     
     # Determine language config
     if participant_role == "caller":
@@ -660,18 +1738,19 @@ def media_stream(ws, conference_name, participant_role):
             data = json.loads(message)
             event = data.get('event')
             
-            if event == 'connected':
-                print(f"✅ Stream connected for {participant_role}")
-                
-            elif event == 'start':
+            if event == 'start':
                 stream_sid = data['start']['streamSid']
-                print(f"🎤 Stream started: {stream_sid}")
+                sessions.stream_started(session, participant_role, stream_sid)
+                log.event('stream', 'started', conference=conference_name, role=participant_role, stream_sid=stream_sid)
                 
             elif event == 'media':
                 # CRITICAL: Process audio IMMEDIATELY without blocking
+                sessions.heartbeat(session, participant_role)
                 payload = data['media']['payload']
                 audio_chunk = base64.b64decode(payload)
                 audio_buffer.extend(audio_chunk)
+                if archive:
+                    archive.audio(conference_name, participant_role, audio_chunk)
                 
                 # Queue audio chunks for async processing (smaller chunks for lower latency)
                 if len(audio_buffer) >= 4000:  # ~500ms at 8kHz for ultra-low latency
@@ -679,38 +1758,42 @@ def media_stream(ws, conference_name, participant_role):
                         # Convert mulaw to linear PCM
                         audio_pcm = audioop.ulaw2lin(bytes(audio_buffer), 2)
                         
+                        # Down-weight this leg while our translation is playing to it
+                        if ECHO_SUPPRESSION:
+                            if echo_guard.is_playing(conference_name, participant_role):
+                                audio_pcm = audioop.mul(audio_pcm, 2, ECHO_ATTENUATION)
+                                echo_guard.note_suppressed()
+                            else:
+                                echo_guard.record_level(conference_name, participant_role, audioop.rms(audio_pcm, 2))
+                        
                         # Queue for async processing - non-blocking
                         audio_queue.put_nowait(audio_pcm)
+                        stream_stats['chunks_queued'] += 1
+                        log.sampled('stream', 'chunk', stream=stream_id, queue=audio_queue.qsize())
                         
                         # Clear buffer immediately
                         audio_buffer = bytearray()
                     except queue.Full:
                         # If queue full, clear buffer to avoid buildup
+                        stream_stats['chunks_dropped'] += 1
+                        log.sampled('stream', 'chunk_dropped', 'warning', stream=stream_id)
                         audio_buffer = bytearray()
                     except Exception as e:
-                        print(f"   ⚠️  Queue error: {e}")
+                        log.event('stream', 'queue_error', 'error', stream=stream_id, error=str(e))
                         audio_buffer = bytearray()
             
             elif event == 'stop':
-                print(f"⏹️  Stream stopped: {stream_sid}")
+                log.event('stream', 'stopped', stream=stream_id, stream_sid=stream_sid)
                 break
                 
     except Exception as e:
-        print(f"❌ WebSocket error: {e}")
-        import traceback
-        traceback.print_exc()
+        log.event('stream', 'error', 'error', stream=stream_id, error=repr(e))
     
     finally:
-        # Cleanup
-        if stream_id in audio_queues:
-            audio_queue.put(None)  # Shutdown signal
-            del audio_queues[stream_id]
+        # Cleanup: stops the processor thread unless a newer stream took over this leg
+        sessions.unbind_stream(session, participant_role, audio_queue)
         
-        print(f"\n{'='*60}")
-        print(f"🔌 WebSocket DISCONNECTED")
-        print(f"   Conference: {conference_name}")
-        print(f"   Role: {participant_role}")
-        print(f"{'='*60}\n")
+        log.event('stream', 'disconnected', conference=conference_name, role=participant_role)
 
 # Serve TwiML endpoint for playing TTS audio
 @app.route('/play-tts/<filename>')
@@ -722,11 +1805,32 @@ def play_tts(filename):
 </Response>"""
     return Response(twiml, mimetype='text/xml')
 
+# Serve TwiML for the <Say> fallback when TTS is unavailable
+@app.route('/say-tts/<token>')
+def say_tts(token):
+    """Return TwiML that speaks a stored translation with Twilio's built-in voice"""
+    from xml.sax.saxutils import escape
+    text, language = say_prompts.get(token, ('', 'en-US'))
+    twiml = f"""<?xml version="1.0" encoding="UTF-8"?>
+<Response>
+    <Say voice="alice" language="{language}">{escape(text)}</Say>
+</Response>"""
+    return Response(twiml, mimetype='text/xml')
+
 # Serve static files for TTS audio
 @app.route('/static/<filename>')
 def serve_static(filename):
-    from flask import send_from_directory
-    return send_from_directory('static', filename)
+    from flask import send_file, send_from_directory
+    clip = clip_store.get(filename)
+    if clip is None:
+        # Comfort tone and pre-rendered prompts
+        return send_from_directory('static', filename, max_age=3600)
+    # Content-addressed clip: Twilio's repeat fetches get a 304, bodies go out via sendfile
+    response = send_file(clip.path, mimetype='audio/wav', conditional=True,
+                         etag=clip.etag.strip('"'), max_age=clip_store.ttl)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
 
 if __name__ == "__main__":
     port = int(os.environ.get('PORT', 5000))
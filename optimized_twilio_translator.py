@@ -7,11 +7,13 @@ import threading
 import time
 import struct
 from collections import deque
+from functools import lru_cache
 from flask import Flask, request, Response
 import websockets
 from google.cloud import speech
 from google.cloud import texttospeech
-from google.cloud import translate_v2 as translate
+
+from provider_clients import create_speech_client, create_translate_client, create_tts_client
 
 # Set Google Cloud credentials
 os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = "/Users/apple/text_to_voice_translator/google-credentials.json"
@@ -105,6 +107,10 @@ class FastLanguageDetector:
         
         return None
 
+# Clients are created once, on first use; provider_clients honours the emulator settings
+translate_client = lru_cache(maxsize=None)(create_translate_client)
+tts_client = lru_cache(maxsize=None)(create_tts_client)
+
 # Optimized translation functions with caching
 translation_cache = {}
 CACHE_SIZE = 100
@@ -115,7 +121,7 @@ def translate_hindi_to_english(hindi_text):
         return translation_cache[hindi_text]
     
     try:
-        client = translate.Client()
+        client = translate_client()
         result = client.translate(hindi_text, source_language='hi', target_language='en')
         english_text = result['translatedText']
         
@@ -135,7 +141,7 @@ def translate_english_to_hindi(english_text):
         return translation_cache[english_text]
     
     try:
-        client = translate.Client()
+        client = translate_client()
         result = client.translate(english_text, source_language='en', target_language='hi')
         hindi_text = result['translatedText']
         
@@ -150,10 +156,10 @@ def translate_english_to_hindi(english_text):
         return None
 
 # Optimized TTS functions
-def synthesize_english_speech(english_text, file_counter):
+def synthesize_english_speech(english_text):
     """Convert English text to speech with optimized settings"""
     try:
-        client = texttospeech.TextToSpeechClient()
+        client = tts_client()
         synthesis_input = texttospeech.SynthesisInput(text=english_text)
         voice = texttospeech.VoiceSelectionParams(
             language_code="en-US", 
@@ -172,21 +178,15 @@ def synthesize_english_speech(english_text, file_counter):
             audio_config=audio_config
         )
         
-        # Save for debugging (optional)
-        if file_counter % 5 == 0:  # Save every 5th file to reduce I/O
-            audio_file_name = f"/Users/apple/text_to_voice_translator/english_output_{file_counter}.wav"
-            with open(audio_file_name, "wb") as audio_file:
-                audio_file.write(response.audio_content)
-
         return response.audio_content
     except Exception as e:
         print(f"English Text-to-Speech error: {e}")
         return None
 
-def synthesize_hindi_speech(hindi_text, file_counter):
+def synthesize_hindi_speech(hindi_text):
     """Convert Hindi text to speech with optimized settings"""
     try:
-        client = texttospeech.TextToSpeechClient()
+        client = tts_client()
         synthesis_input = texttospeech.SynthesisInput(text=hindi_text)
         voice = texttospeech.VoiceSelectionParams(
             language_code="hi-IN", 
@@ -205,12 +205,6 @@ def synthesize_hindi_speech(hindi_text, file_counter):
             audio_config=audio_config
         )
         
-        # Save for debugging (optional)
-        if file_counter % 5 == 0:  # Save every 5th file to reduce I/O
-            audio_file_name = f"/Users/apple/text_to_voice_translator/hindi_output_{file_counter}.wav"
-            with open(audio_file_name, "wb") as audio_file:
-                audio_file.write(response.audio_content)
-
         return response.audio_content
     except Exception as e:
         print(f"Hindi Text-to-Speech error: {e}")
@@ -221,7 +215,7 @@ async def twilio_websocket(websocket, path):
     print("New WebSocket connection established")
     
     # Initialize components
-    speech_client = speech.SpeechClient()
+    speech_client = create_speech_client()
     vad = FastVoiceActivityDetector()
     lang_detector = FastLanguageDetector()
     
@@ -248,13 +242,11 @@ async def twilio_websocket(websocket, path):
     call_session = None
     current_language = 'hi-IN'  # Start with Hindi detection
     last_processed_transcript = ""
-    file_counter = 0
     stream_sid = None
     min_translation_interval = 1.5  # Reduced from 2.0 seconds
 
     async def stream_audio_to_speech():
         nonlocal stream_sid, call_session, current_language, last_processed_transcript
-        nonlocal file_counter
         
         async for message in websocket:
             try:
@@ -341,8 +333,7 @@ async def twilio_websocket(websocket, path):
                     # Hindi speaker → translate to English → synthesize English
                     english_text = translate_hindi_to_english(transcript)
                     if english_text:
-                        file_counter += 1
-                        audio_content = synthesize_english_speech(english_text, file_counter)
+                        audio_content = synthesize_english_speech(english_text)
                         if audio_content and stream_sid:
                             await websocket.send(json.dumps({
                                 'event': 'media',
@@ -355,8 +346,7 @@ async def twilio_websocket(websocket, path):
                     # English speaker → translate to Hindi → synthesize Hindi
                     hindi_text = translate_english_to_hindi(transcript)
                     if hindi_text:
-                        file_counter += 1
-                        audio_content = synthesize_hindi_speech(hindi_text, file_counter)
+                        audio_content = synthesize_hindi_speech(hindi_text)
                         if audio_content and stream_sid:
                             await websocket.send(json.dumps({
                                 'event': 'media',
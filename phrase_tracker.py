@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Frequent phrase tracking across all calls, driving translation and TTS warm-up
+Final transcripts and translations are counted with the Space-Saving
+heavy-hitters sketch: at most `capacity` phrases are tracked, and a new
+phrase arriving when the table is full replaces the least counted one,
+inheriting its count as a possible overestimate (the error). Any phrase
+seen more than total/capacity times is guaranteed to be tracked. Phrases
+are keyed by kind, language and normalized text, so casing and punctuation
+variants count together. The counts are saved to disk periodically and
+reloaded at startup, and a background warmer re-runs the top phrases
+through a callback so their translations and clips are hot before anyone
+says them.
+"""
+
+import os
+import json
+import time
+import threading
+
+from translation_memory import normalize
+
+
+class PhraseTracker:
+    def __init__(self, capacity=1000, path=None, min_count=3):
+        self.capacity = capacity
+        self.path = path
+        self.min_count = min_count    # guaranteed count (count - error) a phrase needs before warming
+        self.counters = {}            # (kind, lang, normalized) -> [count, error, latest text]
+        self.floor = []               # keys that had the lowest count when last scanned: next to be replaced
+        self.floor_count = 0
+        self.lock = threading.Lock()
+
+        self.observed = 0
+        self.replaced = 0
+        self.warm_runs = 0
+        self.warmed = 0
+        self.warm_errors = 0
+        self.saved_at = None
+        if path:
+            self.load()
+
+    def observe(self, kind, lang, text):
+        """Count one final transcript (kind='transcript') or translation (kind='translation')"""
+        normalized = normalize(text)
+        if not normalized:
+            return
+        key = (kind, lang, normalized)
+        with self.lock:
+            self.observed += 1
+            counter = self.counters.get(key)
+            if counter is not None:
+                counter[0] += 1
+                counter[2] = text
+            elif len(self.counters) < self.capacity:
+                self.counters[key] = [1, 0, text]
+            else:
+                floor = self.counters.pop(self._least_counted())[0]
+                self.counters[key] = [floor + 1, floor, text]
+                self.replaced += 1
+
+    def _least_counted(self):
+        """A key with the lowest count; one scan serves every phrase tied at that count"""
+        while True:
+            while self.floor:
+                key = self.floor.pop()
+                counter = self.counters.get(key)
+                if counter is not None and counter[0] == self.floor_count:
+                    return key
+            self.floor_count = min(counter[0] for counter in self.counters.values())
+            self.floor = [key for key, counter in self.counters.items() if counter[0] == self.floor_count]
+
+    def top(self, k, min_count=None):
+        """Up to k (kind, lang, text, count, error), most counted first, seen at least min_count times for sure"""
+        min_count = self.min_count if min_count is None else min_count
+        with self.lock:
+            items = [(kind, lang, text, count, error)
+                     for (kind, lang, _), (count, error, text) in self.counters.items()
+                     if count - error >= min_count]
+        items.sort(key=lambda item: item[3], reverse=True)
+        return items[:k]
+
+    def load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Phrase stats not loaded from {self.path}: {e}")
+            return
+        for kind, lang, normalized, count, error, text in data.get('phrases', [])[:self.capacity]:
+            self.counters[(kind, lang, normalized)] = [count, error, text]
+        self.observed = data.get('observed', 0)
+        print(f"📈 Loaded {len(self.counters)} frequent phrases from {self.path}")
+
+    def save(self):
+        """Write the counters atomically (temp file, then rename)"""
+        with self.lock:
+            phrases = [[kind, lang, normalized, count, error, text]
+                       for (kind, lang, normalized), (count, error, text) in self.counters.items()]
+            observed = self.observed
+        phrases.sort(key=lambda phrase: phrase[3], reverse=True)
+        temporary = f"{self.path}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump({'observed': observed, 'phrases': phrases}, f, ensure_ascii=False)
+        os.replace(temporary, self.path)
+        self.saved_at = time.time()
+
+    def start_warmer(self, warm, top_k=50, interval=120):
+        """Call warm(kind, lang, text) for the top phrases and save, now (phrases loaded from disk) and every `interval` seconds"""
+        def run():
+            while True:
+                self.warm_runs += 1
+                for kind, lang, text, _, _ in self.top(top_k):
+                    try:
+                        warm(kind, lang, text)
+                        self.warmed += 1
+                    except Exception:
+                        self.warm_errors += 1
+                if self.path:
+                    try:
+                        self.save()
+                    except OSError as e:
+                        print(f"⚠️  Phrase stats not saved: {e}")
+                time.sleep(interval)
+        threading.Thread(target=run, name='phrase-warmer', daemon=True).start()
+
+    def snapshot(self, top_n=10):
+        return {
+            'tracked': len(self.counters),
+            'capacity': self.capacity,
+            'observed': self.observed,
+            'replaced': self.replaced,
+            'warm_runs': self.warm_runs,
+            'warmed': self.warmed,
+            'warm_errors': self.warm_errors,
+            'saved_at': self.saved_at,
+            'top': [{'kind': kind, 'lang': lang, 'text': text, 'count': count, 'error': error}
+                    for kind, lang, text, count, error in self.top(top_n, min_count=0)]
+        }
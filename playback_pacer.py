@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Backlog-aware pacing of translated playback
+Tracks how much translated audio is still queued for each listener and raises
+the TTS speaking rate as that backlog grows, so a listener whose counterpart
+talks continuously falls behind by a bounded amount instead of drifting.
+"""
+
+import time
+import threading
+
+
+class PlaybackPacer:
+    def __init__(self, base_rate=1.15, max_rate=1.5, target_lag=2.0, max_lag=8.0):
+        self.base_rate = base_rate    # rate used while the listener keeps up
+        self.max_rate = max_rate      # never speak faster than this
+        self.target_lag = target_lag  # backlog (seconds) tolerated before speeding up
+        self.max_lag = max_lag        # backlog at which max_rate is reached
+        self.busy_until = {}          # listener -> time its queued playback ends
+        self.lock = threading.Lock()
+
+        self.adjusted = 0
+        self.peak_lag = 0.0
+
+    def backlog(self, listener):
+        """Seconds of translated audio still queued for this listener"""
+        return max(0.0, self.busy_until.get(listener, 0) - time.time())
+
+    def speaking_rate(self, listener):
+        """Rate for the next clip: base rate, rising linearly towards max_rate with the backlog"""
+        lag = self.backlog(listener)
+        if lag <= self.target_lag:
+            return self.base_rate
+        with self.lock:
+            self.adjusted += 1
+        pressure = min(1.0, (lag - self.target_lag) / (self.max_lag - self.target_lag))
+        return round(self.base_rate + (self.max_rate - self.base_rate) * pressure, 2)
+
+    def scheduled(self, listener, seconds):
+        """A clip of `seconds` was queued for the listener; returns the backlog including it"""
+        now = time.time()
+        with self.lock:
+            until = max(now, self.busy_until.get(listener, 0)) + seconds
+            self.busy_until[listener] = until
+        lag = until - now
+        self.peak_lag = max(self.peak_lag, lag)
+        return lag
+
+    def forget(self, conference):
+        """Drop listeners of a finished conference (listeners are (conference, role) keys)"""
+        with self.lock:
+            for listener in [listener for listener in self.busy_until if listener[0] == conference]:
+                del self.busy_until[listener]
+
+    def snapshot(self):
+        lags = [self.backlog(listener) for listener in list(self.busy_until)]
+        return {
+            'listeners_behind': sum(1 for lag in lags if lag > self.target_lag),
+            'max_backlog_s': round(max(lags, default=0), 1),
+            'peak_backlog_s': round(self.peak_lag, 1),
+            'rate_adjustments': self.adjusted
+        }
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Provider client factories for Google Cloud and Twilio
+Each factory honours an emulator setting so the translators can run against
+the local stand-ins in provider_emulators.py instead of the real services:
+
+    SPEECH_EMULATOR_HOST=127.0.0.1:9081     gRPC Speech-to-Text
+    TTS_EMULATOR_HOST=127.0.0.1:9082        gRPC Text-to-Speech
+    TRANSLATE_EMULATOR_HOST=127.0.0.1:9083  Translate v2 REST
+    TWILIO_API_URL=http://127.0.0.1:9084    Twilio REST
+"""
+
+import os
+
+import grpc
+from google.auth.credentials import AnonymousCredentials
+from google.cloud import speech_v1 as speech
+from google.cloud import translate_v2 as translate
+from google.cloud import texttospeech
+from google.cloud.speech_v1.services.speech.transports import SpeechGrpcTransport
+from google.cloud.texttospeech_v1.services.text_to_speech.transports import TextToSpeechGrpcTransport
+from twilio.rest import Client
+
+SPEECH_EMULATOR_HOST = os.environ.get('SPEECH_EMULATOR_HOST')
+TTS_EMULATOR_HOST = os.environ.get('TTS_EMULATOR_HOST')
+TRANSLATE_EMULATOR_HOST = os.environ.get('TRANSLATE_EMULATOR_HOST')
+TWILIO_API_URL = os.environ.get('TWILIO_API_URL')
+
+
+def create_speech_client():
+    """Speech-to-Text client, pointed at the emulator when SPEECH_EMULATOR_HOST is set"""
+    if SPEECH_EMULATOR_HOST:
+        print(f"🧪 Speech-to-Text → emulator at {SPEECH_EMULATOR_HOST}")
+        transport = SpeechGrpcTransport(
+            channel=grpc.insecure_channel(SPEECH_EMULATOR_HOST),
+            credentials=AnonymousCredentials()
+        )
+        return speech.SpeechClient(transport=transport)
+    return speech.SpeechClient()
+
+
+def create_tts_client(api_endpoint=None):
+    """
+    Text-to-Speech client, pointed at the emulator when TTS_EMULATOR_HOST is set
+    or at a specific (e.g. regional) endpoint when one is given
+    """
+    if TTS_EMULATOR_HOST:
+        print(f"🧪 Text-to-Speech → emulator at {TTS_EMULATOR_HOST}")
+        transport = TextToSpeechGrpcTransport(
+            channel=grpc.insecure_channel(TTS_EMULATOR_HOST),
+            credentials=AnonymousCredentials()
+        )
+        return texttospeech.TextToSpeechClient(transport=transport)
+    if api_endpoint:
+        return texttospeech.TextToSpeechClient(client_options={'api_endpoint': api_endpoint})
+    return texttospeech.TextToSpeechClient()
+
+
+def create_translate_client(api_endpoint=None):
+    """
+    Translate v2 client, pointed at the emulator when TRANSLATE_EMULATOR_HOST is set
+    or at a specific endpoint when one is given
+    """
+    if TRANSLATE_EMULATOR_HOST:
+        print(f"🧪 Translate → emulator at {TRANSLATE_EMULATOR_HOST}")
+        return translate.Client(
+            credentials=AnonymousCredentials(),
+            client_options={'api_endpoint': f"http://{TRANSLATE_EMULATOR_HOST}"}
+        )
+    if api_endpoint:
+        return translate.Client(client_options={'api_endpoint': api_endpoint})
+    return translate.Client()
+
+
+def create_twilio_client(creds):
+    """Twilio REST client from a credentials dict, redirected when TWILIO_API_URL is set"""
+    if not creds:
+        return None
+
+    if 'api_key' in creds and 'api_key_secret' in creds:
+        client = Client(creds['api_key'], creds['api_key_secret'], creds['account_sid'])
+        print(f"✅ Twilio client initialized with API key authentication")
+    elif 'auth_token' in creds:
+        client = Client(creds['account_sid'], creds['auth_token'])
+        print(f"✅ Twilio client initialized with auth token authentication")
+    else:
+        return None
+
+    if TWILIO_API_URL:
+        client.api.base_url = TWILIO_API_URL
+        print(f"🧪 Twilio REST → {TWILIO_API_URL}")
+    return client
@@ -0,0 +1,661 @@
+#!/usr/bin/env python3
+"""
+Local stand-ins for Google Speech-to-Text, Translate, Text-to-Speech and the Twilio REST API
+Lets the translators run (and be load tested) without credentials or network access.
+Every emulator has tunable latency, jitter and error injection, adjustable at
+runtime through the control server.
+
+Usage:
+    python provider_emulators.py --base-port 9081 --latency tts=150,translate=40 --errors speech=0.02
+
+Point a translator at them with the environment printed on startup
+(see provider_clients.py for how each variable is used).
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import math
+import array
+import random
+import re
+import struct
+import audioop
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import grpc
+from google.cloud import speech_v1 as speech
+from google.cloud import texttospeech
+
+# Scripted recognition results per recognizer language. Entries can be a plain
+# transcript or a dict with transcript / language_code / confidence.
+DEFAULT_SCRIPT = {
+    'en-US': [
+        "Hello, how are you?",
+        "Can you hear me clearly?",
+        "I would like to book an appointment for tomorrow.",
+        "My address is 42 Park Street.",
+        "Yes, that is correct.",
+        "Thank you very much.",
+    ],
+    # Replies rather than translations of the caller's lines, which the translator treats as echo
+    'hi-IN': [
+        "मैं ठीक हूँ, धन्यवाद।",
+        "हाँ, मैं आपको सुन सकता हूँ।",
+        {"transcript": "aap kal aa sakte ho kya", "language_code": "hi-in", "confidence": 0.82},
+        "मेरा पता बयालीस पार्क स्ट्रीट है।",
+        "ठीक है, मैंने नोट कर लिया।",
+        "आपका दिन शुभ हो।",
+    ],
+}
+
+# Phrasebook used by the Translate emulator; anything else is tagged with the target language
+DEFAULT_PHRASEBOOK = {
+    ('en', 'hi'): {
+        "hello, how are you?": "नमस्ते, आप कैसे हैं?",
+        "can you hear me clearly?": "क्या आप मुझे साफ़ सुन सकते हैं?",
+        "yes, that is correct.": "जी हाँ, यह सही है।",
+        "thank you very much.": "बहुत बहुत धन्यवाद।",
+    },
+    ('hi', 'en'): {
+        "नमस्ते, आप कैसे हैं?": "Hello, how are you?",
+        "हाँ, मैं आपको सुन सकता हूँ।": "Yes, I can hear you.",
+        "जी हाँ, यह सही है।": "Yes, that is correct.",
+        "बहुत बहुत धन्यवाद।": "Thank you very much.",
+        "मैं ठीक हूँ, धन्यवाद।": "I am fine, thank you.",
+        "ठीक है, मैंने नोट कर लिया।": "Okay, I have noted it down.",
+        "आपका दिन शुभ हो।": "Have a good day.",
+    },
+}
+
+TTS_CHARS_PER_SECOND = 14.0  # roughly a neural voice at speaking_rate 1.0
+TTS_PADDING_SECONDS = 0.15   # Google pads clips with silence at both ends
+
+
+# ---------------------------------------------------------------------------
+# Fault injection
+# ---------------------------------------------------------------------------
+
+class FaultConfig:
+    """Latency, jitter and error injection shared by every emulator"""
+
+    def __init__(self, latency_ms=0, jitter_ms=0, error_rate=0.0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.requests = 0
+        self.errors = 0
+        self.lock = threading.Lock()
+
+    def update(self, settings):
+        for key in ('latency_ms', 'jitter_ms', 'error_rate'):
+            if key in settings:
+                setattr(self, key, float(settings[key]))
+
+    def delay(self):
+        """Sleep for the configured latency plus jitter"""
+        seconds = (self.latency_ms + random.uniform(0, self.jitter_ms)) / 1000
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def begin(self):
+        """Count a request, apply latency, and report whether it should fail"""
+        self.delay()
+        failed = random.random() < self.error_rate
+        with self.lock:
+            self.requests += 1
+            if failed:
+                self.errors += 1
+        return failed
+
+    def stats(self):
+        return {
+            'latency_ms': self.latency_ms,
+            'jitter_ms': self.jitter_ms,
+            'error_rate': self.error_rate,
+            'requests': self.requests,
+            'errors': self.errors
+        }
+
+
+class HttpEmulator:
+    """Base class for the JSON-over-HTTP emulators"""
+
+    def __init__(self, port, faults):
+        self.faults = faults or FaultConfig()
+        emulator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def respond(self, method):
+                length = int(self.headers.get('Content-Length', 0))
+                body = self.rfile.read(length) if length else b''
+                status, payload = emulator.dispatch(method, self.path, self.headers, body)
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self.respond('GET')
+
+            def do_POST(self):
+                self.respond('POST')
+
+            def do_DELETE(self):
+                self.respond('DELETE')
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.url = f"http://127.0.0.1:{self.port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def dispatch(self, method, path, headers, body):
+        raise NotImplementedError
+
+    def stop(self):
+        self.server.shutdown()
+
+
+# ---------------------------------------------------------------------------
+# Google Speech-to-Text (gRPC streaming recognize)
+# ---------------------------------------------------------------------------
+
+class SpeechEmulator:
+    """
+    Streaming recognizer that detects utterances by energy and answers with
+    scripted interim and final results for the configured language
+    """
+
+    def __init__(self, port=0, script=None, faults=None, interim_ms=500, endpoint_ms=400,
+                 energy_threshold=300, max_workers=256):
+        self.script = script or DEFAULT_SCRIPT
+        self.faults = faults or FaultConfig()
+        self.interim_ms = interim_ms
+        self.endpoint_ms = endpoint_ms
+        self.energy_threshold = energy_threshold
+        self.active_streams = 0
+
+        handler = grpc.method_handlers_generic_handler('google.cloud.speech.v1.Speech', {
+            'StreamingRecognize': grpc.stream_stream_rpc_method_handler(
+                self.streaming_recognize,
+                request_deserializer=speech.StreamingRecognizeRequest.deserialize,
+                response_serializer=speech.StreamingRecognizeResponse.serialize
+            )
+        })
+        self.server = grpc.server(ThreadPoolExecutor(max_workers=max_workers))
+        self.server.add_generic_rpc_handlers((handler,))
+        self.port = self.server.add_insecure_port(f'127.0.0.1:{port}')
+        self.host = f'127.0.0.1:{self.port}'
+        self.server.start()
+
+    def phrases_for(self, language_code):
+        for key, phrases in self.script.items():
+            if key.lower() == language_code.lower():
+                return phrases
+        return next(iter(self.script.values()))
+
+    @staticmethod
+    def scripted(entry, language_code):
+        if isinstance(entry, str):
+            entry = {'transcript': entry}
+        return (entry['transcript'],
+                entry.get('language_code', language_code.lower()),
+                entry.get('confidence', 0.92))
+
+    def result(self, entry, language_code, progress, is_final, end_seconds):
+        transcript, result_language, confidence = self.scripted(entry, language_code)
+        if not is_final:
+            words = transcript.split()
+            transcript = ' '.join(words[:max(1, int(len(words) * progress))])
+        return speech.StreamingRecognizeResponse(results=[
+            speech.StreamingRecognitionResult(
+                alternatives=[speech.SpeechRecognitionAlternative(
+                    transcript=transcript,
+                    confidence=confidence if is_final else 0.0
+                )],
+                is_final=is_final,
+                stability=0.0 if is_final else 0.8,
+                result_end_time={'seconds': int(end_seconds), 'nanos': int((end_seconds % 1) * 1e9)},
+                language_code=result_language
+            )
+        ])
+
+    def streaming_recognize(self, request_iterator, context):
+        if self.faults.begin():
+            context.abort(grpc.StatusCode.UNAVAILABLE, 'emulated Speech-to-Text outage')
+
+        self.active_streams += 1
+        try:
+            language_code, sample_rate, mulaw = 'en-US', 8000, False
+            phrases, phrase_index = None, 0
+            speech_ms = silence_ms = since_interim_ms = stream_ms = 0.0
+
+            for req in request_iterator:
+                if req._pb.HasField('streaming_config'):
+                    config = req.streaming_config.config
+                    language_code = config.language_code or language_code
+                    sample_rate = config.sample_rate_hertz or sample_rate
+                    mulaw = config.encoding == speech.RecognitionConfig.AudioEncoding.MULAW
+                    phrases = self.phrases_for(language_code)
+                    continue
+
+                audio = req.audio_content
+                if not audio:
+                    continue
+                pcm = audioop.ulaw2lin(audio, 2) if mulaw else audio
+                chunk_ms = len(pcm) / 2 / sample_rate * 1000
+                stream_ms += chunk_ms
+                voiced = audioop.rms(pcm, 2) > self.energy_threshold
+                phrases = phrases or self.phrases_for(language_code)
+                entry = phrases[phrase_index % len(phrases)]
+
+                if voiced:
+                    speech_ms += chunk_ms
+                    since_interim_ms += chunk_ms
+                    silence_ms = 0
+                    if since_interim_ms >= self.interim_ms:
+                        since_interim_ms = 0
+                        self.faults.delay()
+                        progress = min(1.0, speech_ms / 2000)
+                        yield self.result(entry, language_code, progress, False, stream_ms / 1000)
+                elif speech_ms:
+                    silence_ms += chunk_ms
+                    if silence_ms >= self.endpoint_ms:
+                        self.faults.delay()
+                        yield self.result(entry, language_code, 1.0, True, stream_ms / 1000)
+                        phrase_index += 1
+                        speech_ms = since_interim_ms = silence_ms = 0
+        finally:
+            self.active_streams -= 1
+
+    def stats(self):
+        return dict(self.faults.stats(), active_streams=self.active_streams)
+
+    def stop(self):
+        self.server.stop(0)
+
+
+# ---------------------------------------------------------------------------
+# Google Text-to-Speech (gRPC synthesize)
+# ---------------------------------------------------------------------------
+
+_tone_cache = {}
+
+
+def tone_samples(seconds, sample_rate):
+    """Speech-band tone with TTS-style silence padding, as 16-bit PCM bytes"""
+    key = sample_rate
+    if key not in _tone_cache:
+        period = array.array('h', (int(6000 * math.sin(2 * math.pi * 300 * i / sample_rate))
+                                   for i in range(sample_rate)))
+        _tone_cache[key] = period.tobytes()
+    second = _tone_cache[key]
+    voiced_bytes = int(seconds * sample_rate) * 2
+    padding = b'\x00\x00' * int(TTS_PADDING_SECONDS * sample_rate)
+    voiced = (second * (voiced_bytes // len(second) + 1))[:voiced_bytes]
+    return padding + voiced + padding
+
+
+def wav_bytes(payload, sample_rate, format_tag, bits):
+    """RIFF/WAVE container around raw samples (format 1 = PCM, 7 = mu-law)"""
+    channels = 1
+    block_align = channels * bits // 8
+    if format_tag == 1:
+        fmt = struct.pack('<HHIIHH', format_tag, channels, sample_rate,
+                          sample_rate * block_align, block_align, bits)
+        extra = b''
+    else:
+        fmt = struct.pack('<HHIIHHH', format_tag, channels, sample_rate,
+                          sample_rate * block_align, block_align, bits, 0)
+        extra = b'fact' + struct.pack('<II', 4, len(payload) // block_align)
+    body = (b'WAVE' + b'fmt ' + struct.pack('<I', len(fmt)) + fmt + extra +
+            b'data' + struct.pack('<I', len(payload)) + payload)
+    return b'RIFF' + struct.pack('<I', len(body)) + body
+
+
+# MPEG-2 Layer III, 32 kbps, 24 kHz, mono: 96-byte frames of 576 samples
+MP3_FRAME = b'\xff\xf3\x44\xc0' + b'\x00' * 92
+MP3_FRAME_SECONDS = 576 / 24000
+
+
+class TtsEmulator:
+    """Text-to-Speech stand-in returning correctly sized LINEAR16/MULAW/MP3 audio"""
+
+    def __init__(self, port=0, faults=None, max_workers=64):
+        self.faults = faults or FaultConfig()
+        self.characters = 0
+
+        handler = grpc.method_handlers_generic_handler('google.cloud.texttospeech.v1.TextToSpeech', {
+            'SynthesizeSpeech': grpc.unary_unary_rpc_method_handler(
+                self.synthesize_speech,
+                request_deserializer=texttospeech.SynthesizeSpeechRequest.deserialize,
+                response_serializer=texttospeech.SynthesizeSpeechResponse.serialize
+            )
+        })
+        self.server = grpc.server(ThreadPoolExecutor(max_workers=max_workers))
+        self.server.add_generic_rpc_handlers((handler,))
+        self.port = self.server.add_insecure_port(f'127.0.0.1:{port}')
+        self.host = f'127.0.0.1:{self.port}'
+        self.server.start()
+
+    def synthesize_speech(self, request, context):
+        if self.faults.begin():
+            context.abort(grpc.StatusCode.UNAVAILABLE, 'emulated Text-to-Speech outage')
+
+        text = request.input.text
+        if not text and request.input.ssml:
+            # Strip tags; SSML-only input (e.g. a <break>) still yields a short clip
+            text = re.sub(r'<[^>]+>', '', request.input.ssml)
+        self.characters += len(text)
+
+        config = request.audio_config
+        rate = config.speaking_rate or 1.0
+        seconds = len(text.strip()) / (TTS_CHARS_PER_SECOND * rate)
+        encoding = config.audio_encoding
+        AudioEncoding = texttospeech.AudioEncoding
+
+        if encoding == AudioEncoding.MP3:
+            total = seconds + 2 * TTS_PADDING_SECONDS
+            audio = MP3_FRAME * max(1, math.ceil(total / MP3_FRAME_SECONDS))
+        elif encoding == AudioEncoding.MULAW:
+            sample_rate = config.sample_rate_hertz or 8000
+            audio = wav_bytes(audioop.lin2ulaw(tone_samples(seconds, sample_rate), 2), sample_rate, 7, 8)
+        elif encoding in (AudioEncoding.LINEAR16, AudioEncoding.AUDIO_ENCODING_UNSPECIFIED):
+            sample_rate = config.sample_rate_hertz or 24000
+            audio = wav_bytes(tone_samples(seconds, sample_rate), sample_rate, 1, 16)
+        else:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, f'emulator does not produce {encoding.name}')
+
+        return texttospeech.SynthesizeSpeechResponse(audio_content=audio)
+
+    def stats(self):
+        return dict(self.faults.stats(), characters=self.characters)
+
+    def stop(self):
+        self.server.stop(0)
+
+
+# ---------------------------------------------------------------------------
+# Google Translate v2 (REST)
+# ---------------------------------------------------------------------------
+
+class TranslateEmulator(HttpEmulator):
+    """Translate v2 stand-in: phrasebook lookups, otherwise the text tagged with its target"""
+
+    def __init__(self, port=0, faults=None, phrasebook=None):
+        self.phrasebook = phrasebook or DEFAULT_PHRASEBOOK
+        self.characters = 0
+        super().__init__(port, faults)
+
+    @staticmethod
+    def detect(text):
+        return 'hi' if any('ऀ' <= ch <= 'ॿ' for ch in text) else 'en'
+
+    def translate_one(self, text, source, target):
+        known = self.phrasebook.get((source, target), {})
+        return known.get(text.lower(), known.get(text, f"[{target}] {text}"))
+
+    def dispatch(self, method, path, headers, body):
+        if self.faults.begin():
+            return 503, {'error': {'code': 503, 'message': 'emulated Translate outage', 'status': 'UNAVAILABLE'}}
+
+        parsed = urlparse(path)
+        params = {k: v for k, v in parse_qs(parsed.query).items()}
+        if body:
+            try:
+                params.update(json.loads(body))
+            except ValueError:
+                params.update(parse_qs(body.decode()))
+        queries = params.get('q', [])
+        if isinstance(queries, str):
+            queries = [queries]
+
+        if parsed.path.endswith('/detect'):
+            return 200, {'data': {'detections': [[{'language': self.detect(q), 'confidence': 1.0}]
+                                                 for q in queries]}}
+        if parsed.path.endswith('/languages'):
+            return 200, {'data': {'languages': [{'language': 'en'}, {'language': 'hi'}]}}
+
+        target = params.get('target')
+        source = params.get('source')
+        target = target[0] if isinstance(target, list) else target
+        source = source[0] if isinstance(source, list) else source
+        translations = []
+        for q in queries:
+            self.characters += len(q)
+            detected = source or self.detect(q)
+            entry = {'translatedText': self.translate_one(q, detected, target)}
+            if not source:
+                entry['detectedSourceLanguage'] = detected
+            translations.append(entry)
+        return 200, {'data': {'translations': translations}}
+
+    def stats(self):
+        return dict(self.faults.stats(), characters=self.characters)
+
+
+# ---------------------------------------------------------------------------
+# Twilio REST
+# ---------------------------------------------------------------------------
+
+class TwilioEmulator(HttpEmulator):
+    """
+    Twilio REST stand-in for calls, conferences and participants.
+    Records every announce so load tests can measure delivery latency.
+    """
+
+    def __init__(self, port=0, faults=None, comfort_tone_file='comfort_tone.mp3'):
+        self.lock = threading.Lock()
+        self.calls = {}            # call sid -> call resource
+        self.conferences = {}      # conference sid -> {sid, participants: {call sid: resource}}
+        self.receiver_calls = {}   # conference name -> receiver call sid
+        self.announces = []        # (timestamp, participant_sid, announce_url)
+        self.comfort_tone_file = comfort_tone_file
+        super().__init__(port, faults)
+
+    def dispatch(self, method, path, headers, body):
+        now = time.time()
+        if self.faults.begin():
+            return 500, {'code': 20500, 'message': 'Emulated Twilio error', 'status': 500}
+
+        form = {k: v[0] for k, v in parse_qs(body.decode()).items()} if body else {}
+        parts = urlparse(path).path.strip('/').split('/')
+        account_sid = parts[2] if len(parts) > 2 else 'AC' + '0' * 32
+        resource = parts[-1].replace('.json', '')
+
+        with self.lock:
+            # /2010-04-01/Accounts/{AC}/Calls[.json|/{CA}.json]
+            if len(parts) >= 4 and parts[3].startswith('Calls'):
+                if resource == 'Calls' and method == 'POST':
+                    call = {'sid': 'CA' + uuid.uuid4().hex, 'account_sid': account_sid, 'status': 'queued',
+                            'to': form.get('To'), 'from': form.get('From'), 'url': form.get('Url')}
+                    self.calls[call['sid']] = call
+                    conference_name = (form.get('Url') or '').rstrip('/').rsplit('/', 1)[-1]
+                    self.receiver_calls[conference_name] = call['sid']
+                    return 201, call
+                if resource == 'Calls':
+                    return 200, {'calls': list(self.calls.values())}
+                call = self.calls.get(resource)
+                if not call:
+                    return 404, {'code': 20404, 'message': 'Call not found', 'status': 404}
+                if method == 'POST':
+                    call.update({k.lower(): v for k, v in form.items()})
+                return 200, call
+
+            # /2010-04-01/Accounts/{AC}/Conferences[/{CF}[/Participants[/{CA}]]].json
+            if len(parts) >= 4 and parts[3].startswith('Conferences'):
+                if resource == 'Conferences':
+                    return 200, {'conferences': [{'sid': sid, 'account_sid': account_sid}
+                                                 for sid in self.conferences]}
+                conference_sid = parts[4].replace('.json', '')
+                conference = self.conferences.setdefault(conference_sid, {'sid': conference_sid, 'participants': {}})
+                if len(parts) == 5:
+                    if method == 'POST':
+                        conference.update({k.lower(): v for k, v in form.items()})
+                    return 200, {'sid': conference_sid, 'account_sid': account_sid,
+                                 'status': conference.get('status', 'in-progress')}
+                if resource == 'Participants':
+                    return 200, {'participants': list(conference['participants'].values())}
+
+                participant = conference['participants'].setdefault(resource, {
+                    'call_sid': resource, 'conference_sid': conference_sid,
+                    'account_sid': account_sid, 'status': 'connected', 'muted': True
+                })
+                if method == 'POST':
+                    if form.get('AnnounceUrl'):
+                        self.announces.append((now, resource, form['AnnounceUrl']))
+                    if 'Muted' in form:
+                        participant['muted'] = form['Muted'].lower() == 'true'
+                return 200, participant
+
+        return 404, {'code': 20404, 'message': 'Resource not found', 'status': 404}
+
+    def wait_for_receiver(self, conference_name, timeout=15):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            with self.lock:
+                if conference_name in self.receiver_calls:
+                    return self.receiver_calls[conference_name]
+            time.sleep(0.05)
+        return None
+
+    def deliveries_for(self, participant_sid):
+        """Announce timestamps for a participant, ignoring comfort tones"""
+        with self.lock:
+            return [ts for ts, sid, url in self.announces
+                    if sid == participant_sid and not url.endswith(self.comfort_tone_file)]
+
+    def stats(self):
+        return dict(self.faults.stats(), calls=len(self.calls), announces=len(self.announces))
+
+
+# ---------------------------------------------------------------------------
+# Control server and startup
+# ---------------------------------------------------------------------------
+
+class ControlServer(HttpEmulator):
+    """GET /stats for counters, POST /faults/<emulator> with latency_ms/jitter_ms/error_rate"""
+
+    def __init__(self, port, emulators):
+        self.emulators = emulators
+        super().__init__(port, FaultConfig())
+
+    def dispatch(self, method, path, headers, body):
+        parts = urlparse(path).path.strip('/').split('/')
+        if parts[0] == 'stats':
+            return 200, {name: emulator.stats() for name, emulator in self.emulators.items()}
+        if parts[0] == 'faults' and len(parts) == 2 and parts[1] in self.emulators:
+            faults = self.emulators[parts[1]].faults
+            if method == 'POST':
+                faults.update(json.loads(body or b'{}'))
+            return 200, faults.stats()
+        return 404, {'error': 'unknown control path'}
+
+
+def start_emulators(base_port=0, script=None, faults=None, services=('speech', 'tts', 'translate', 'twilio')):
+    """Start the requested emulators (ports base_port..base_port+4, or ephemeral when 0)"""
+    faults = faults or {}
+
+    def port(offset):
+        return base_port + offset if base_port else 0
+
+    emulators = {}
+    if 'speech' in services:
+        emulators['speech'] = SpeechEmulator(port(0), script=script, faults=faults.get('speech'))
+    if 'tts' in services:
+        emulators['tts'] = TtsEmulator(port(1), faults=faults.get('tts'))
+    if 'translate' in services:
+        emulators['translate'] = TranslateEmulator(port(2), faults=faults.get('translate'))
+    if 'twilio' in services:
+        emulators['twilio'] = TwilioEmulator(port(3), faults=faults.get('twilio'))
+    emulators_control = ControlServer(port(4), emulators)
+    return emulators, emulators_control
+
+
+def emulator_env(emulators):
+    """Environment variables that point provider_clients.py at running emulators"""
+    env = {}
+    if 'speech' in emulators:
+        env['SPEECH_EMULATOR_HOST'] = emulators['speech'].host
+    if 'tts' in emulators:
+        env['TTS_EMULATOR_HOST'] = emulators['tts'].host
+    if 'translate' in emulators:
+        env['TRANSLATE_EMULATOR_HOST'] = emulators['translate'].url.replace('http://', '')
+    if 'twilio' in emulators:
+        env['TWILIO_API_URL'] = emulators['twilio'].url
+        env['TWILIO_ACCOUNT_SID'] = os.environ.get('TWILIO_ACCOUNT_SID', 'AC' + '0' * 32)
+        env['TWILIO_AUTH_TOKEN'] = os.environ.get('TWILIO_AUTH_TOKEN', 'emulator')
+    return env
+
+
+def parse_fault_spec(spec, key):
+    """'tts=150,translate=40' -> {'tts': {key: 150.0}, 'translate': {key: 40.0}}"""
+    settings = {}
+    for item in (spec or '').split(','):
+        if '=' in item:
+            name, value = item.split('=', 1)
+            settings.setdefault(name.strip(), {})[key] = float(value)
+    return settings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-port', type=int, default=9081,
+                        help='speech, tts, translate, twilio and control use base-port..base-port+4')
+    parser.add_argument('--script', help='JSON file of scripted transcripts per language code')
+    parser.add_argument('--latency', help='per-emulator latency in ms, e.g. tts=150,translate=40')
+    parser.add_argument('--jitter', help='per-emulator jitter in ms, e.g. speech=20')
+    parser.add_argument('--errors', help='per-emulator error rate, e.g. twilio=0.05')
+    args = parser.parse_args()
+
+    script = None
+    if args.script:
+        with open(args.script) as f:
+            script = json.load(f)
+
+    settings = {}
+    for spec, key in ((args.latency, 'latency_ms'), (args.jitter, 'jitter_ms'), (args.errors, 'error_rate')):
+        for name, values in parse_fault_spec(spec, key).items():
+            settings.setdefault(name, {}).update(values)
+    faults = {}
+    for name, values in settings.items():
+        faults[name] = FaultConfig()
+        faults[name].update(values)
+
+    emulators, control = start_emulators(args.base_port, script=script, faults=faults)
+
+    print(f"\n{'='*60}")
+    print(f"🧪 PROVIDER EMULATORS RUNNING")
+    print(f"{'='*60}")
+    for name, emulator in emulators.items():
+        print(f"   {name:<10} port {emulator.port}  {emulator.faults.stats()}")
+    print(f"   control    {control.url}/stats  (POST /faults/<name>)")
+    print(f"\nexport the following before starting a translator:\n")
+    for key, value in emulator_env(emulators).items():
+        print(f"export {key}={value}")
+    print(f"{'='*60}\n")
+
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print("Emulators stopped by user.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
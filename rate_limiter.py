@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Client-side quota limiting for provider APIs
+Each quota (requests or characters per minute) is a token bucket. Callers that
+find the bucket empty queue for tokens in priority order, so playback-critical
+work is served before interims and background warm-up, and give up once their
+own wait limit passes instead of bursting into the provider's 429s.
+"""
+
+import time
+import heapq
+import itertools
+import threading
+
+PRIORITY_FINAL = 0       # final results and the TTS that plays them
+PRIORITY_INTERIM = 1     # interim results
+PRIORITY_BACKGROUND = 2  # prompt warm-up and other work nobody is waiting on
+
+
+class QuotaExceededError(Exception):
+    """Raised when a caller could not get quota within its wait limit"""
+
+    def __init__(self, name, waited):
+        super().__init__(f"{name} quota exhausted after waiting {waited:.2f}s")
+        self.name = name
+        self.waited = waited
+
+
+class RateLimiter:
+    def __init__(self, name, per_minute, burst=None):
+        self.name = name
+        self.rate = per_minute / 60.0
+        self.capacity = burst or max(1.0, self.rate)  # one second's worth by default
+        self.tokens = self.capacity
+        self.updated = time.time()
+        self.waiters = []  # heap of (priority, sequence)
+        self.sequence = itertools.count()
+        self.condition = threading.Condition()
+
+        self.granted = 0
+        self.rejected = 0
+        self.used = 0.0
+        self.wait_seconds = 0.0
+        self.max_wait = 0.0
+        self.started = time.time()
+
+    def _refill(self):
+        now = time.time()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, cost=1, priority=PRIORITY_FINAL, timeout=None):
+        """
+        Take `cost` tokens, queueing behind higher-priority callers.
+        Returns False if they could not be had within `timeout` seconds (None waits forever).
+        """
+        cost = min(cost, self.capacity)
+        start = time.time()
+        entry = (priority, next(self.sequence))
+        with self.condition:
+            heapq.heappush(self.waiters, entry)
+            try:
+                while True:
+                    self._refill()
+                    if self.waiters[0] == entry and self.tokens >= cost:
+                        self.tokens -= cost
+                        waited = time.time() - start
+                        self.granted += 1
+                        self.used += cost
+                        self.wait_seconds += waited
+                        self.max_wait = max(self.max_wait, waited)
+                        return True
+                    remaining = None if timeout is None else start + timeout - time.time()
+                    if remaining is not None and remaining <= 0:
+                        self.rejected += 1
+                        return False
+                    refill_in = max(0.005, (cost - self.tokens) / self.rate)
+                    self.condition.wait(refill_in if remaining is None else min(refill_in, remaining))
+            finally:
+                self.waiters.remove(entry)
+                heapq.heapify(self.waiters)
+                self.condition.notify_all()
+
+    def release(self, cost=1):
+        """Give back tokens taken for a call that was never made"""
+        with self.condition:
+            self.tokens = min(self.capacity, self.tokens + cost)
+            self.used -= cost
+            self.condition.notify_all()
+
+    def backoff(self):
+        """The provider answered 429: empty the bucket so callers slow down to the refill rate"""
+        with self.condition:
+            self._refill()
+            self.tokens = 0
+
+    def snapshot(self):
+        elapsed_minutes = max(1 / 60, (time.time() - self.started) / 60)
+        with self.condition:
+            self._refill()
+            return {
+                'limit_per_minute': round(self.rate * 60),
+                'used_per_minute': round(self.used / elapsed_minutes, 1),
+                'available': round(self.tokens, 1),
+                'queued': len(self.waiters),
+                'granted': self.granted,
+                'rejected': self.rejected,
+                'avg_wait_ms': round(self.wait_seconds / self.granted * 1000, 1) if self.granted else 0,
+                'max_wait_ms': round(self.max_wait * 1000, 1)
+            }
+
+
+class QuotaScheduler:
+    """The request and character quotas of each API, acquired together"""
+
+    def __init__(self):
+        self.limiters = {}
+
+    def add(self, api, quota, per_minute, burst=None):
+        self.limiters[(api, quota)] = RateLimiter(f"{api}.{quota}", per_minute, burst)
+
+    def acquire(self, api, characters=0, priority=PRIORITY_FINAL, timeout=None):
+        """Take one request (and `characters`) of the API's quota or raise QuotaExceededError"""
+        start = time.time()
+        taken = []
+        for (name, quota), limiter in self.limiters.items():
+            if name != api:
+                continue
+            cost = characters if quota == 'characters' else 1
+            if not cost:
+                continue
+            remaining = None if timeout is None else max(0.0, timeout - (time.time() - start))
+            if not limiter.acquire(cost, priority, remaining):
+                for granted_limiter, granted_cost in taken:
+                    granted_limiter.release(granted_cost)
+                raise QuotaExceededError(limiter.name, time.time() - start)
+            taken.append((limiter, cost))
+
+    def release(self, api, characters=0):
+        """Give back what acquire() took for a call that was never made"""
+        for (name, quota), limiter in self.limiters.items():
+            if name != api:
+                continue
+            cost = characters if quota == 'characters' else 1
+            if cost:
+                limiter.release(min(cost, limiter.capacity))
+
+    def backoff(self, api):
+        for (name, _), limiter in self.limiters.items():
+            if name == api:
+                limiter.backoff()
+
+    def snapshot(self):
+        return {limiter.name: limiter.snapshot() for limiter in self.limiters.values()}
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Registry of live call sessions
+One compact record per conference (and per leg) replaces the loose dicts of
+call state. Sessions are indexed by conference name, call SID and stream SID,
+so status callbacks and media events find their session without scanning.
+Every webhook and media event refreshes a session's heartbeat; a reaper
+thread ends sessions that go quiet (the websocket or conference-end callback
+never arrived) or outlive the TTL, stopping their audio processors.
+"""
+
+import sys
+import time
+import queue
+import threading
+
+
+def stop_processor(audio_queue):
+    """Send the shutdown signal; with a full queue the processor stops at its next keep_running check"""
+    try:
+        audio_queue.put_nowait(None)
+    except queue.Full:
+        pass
+
+
+class Participant:
+    __slots__ = ('role', 'number', 'language', 'call_sid', 'participant_sid',
+                 'stream_sid', 'audio_queue', 'socket', 'last_seen', 'last_unavailable_prompt')
+
+    def __init__(self, role):
+        self.role = role
+        self.number = None
+        self.language = None
+        self.call_sid = None
+        self.participant_sid = None
+        self.stream_sid = None
+        self.audio_queue = None   # set while the leg's media stream is connected
+        self.socket = None
+        self.last_seen = time.time()
+        self.last_unavailable_prompt = 0
+
+
+class Session:
+    __slots__ = ('conference_name', 'conference_sid', 'tenant', 'weight', 'passthrough',
+                 'caller', 'receiver', 'created', 'last_seen')
+
+    def __init__(self, conference_name, tenant=None, weight=1):
+        self.conference_name = conference_name
+        self.conference_sid = None
+        self.tenant = tenant
+        self.weight = weight
+        self.passthrough = False
+        self.caller = Participant('caller')
+        self.receiver = Participant('receiver')
+        self.created = self.last_seen = time.time()
+
+    def participant(self, role):
+        return self.caller if role == 'caller' else self.receiver
+
+    def streams(self):
+        return [leg for leg in (self.caller, self.receiver) if leg.audio_queue is not None]
+
+    def memory(self):
+        """Approximate bytes held by this session, including audio waiting to be recognized"""
+        size = sys.getsizeof(self)
+        for leg in (self.caller, self.receiver):
+            size += sys.getsizeof(leg)
+            for name in Participant.__slots__:
+                value = getattr(leg, name)
+                if isinstance(value, str):
+                    size += sys.getsizeof(value)
+            if leg.audio_queue is not None:
+                size += sum(len(chunk) for chunk in list(leg.audio_queue.queue) if chunk)
+        for name in ('conference_name', 'conference_sid', 'tenant'):
+            value = getattr(self, name)
+            if isinstance(value, str):
+                size += sys.getsizeof(value)
+        return size
+
+
+class SessionRegistry:
+    def __init__(self, ttl=4 * 3600, idle_timeout=60, reap_interval=15, on_reap=None):
+        self.ttl = ttl                    # hard limit on a session's age
+        self.idle_timeout = idle_timeout  # no webhook or media event for this long
+        self.reap_interval = reap_interval
+        self.on_reap = on_reap            # called with (session, reason) for every reaped session
+
+        self.sessions = {}                # conference name -> Session
+        self.by_call = {}                 # call SID -> (Session, role)
+        self.by_stream = {}               # stream SID -> (Session, role)
+        self.lock = threading.Lock()
+
+        self.opened = 0
+        self.closed = 0
+        self.reaped = {'idle': 0, 'ttl': 0}
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def __contains__(self, conference_name):
+        return conference_name in self.sessions
+
+    def open(self, conference_name, tenant=None, weight=1):
+        session = Session(conference_name, tenant, weight)
+        with self.lock:
+            previous = self.sessions.get(conference_name)
+            if previous is not None:
+                self._unindex(previous)
+            self.sessions[conference_name] = session
+            self.opened += 1
+        return session
+
+    def get(self, conference_name):
+        return self.sessions.get(conference_name)
+
+    def get_or_open(self, conference_name):
+        return self.sessions.get(conference_name) or self.open(conference_name)
+
+    def by_call_sid(self, call_sid):
+        """(session, role) for a call SID, or (None, None)"""
+        return self.by_call.get(call_sid, (None, None))
+
+    def by_stream_sid(self, stream_sid):
+        return self.by_stream.get(stream_sid, (None, None))
+
+    def bind_call(self, session, role, call_sid):
+        with self.lock:
+            session.participant(role).call_sid = call_sid
+            self.by_call[call_sid] = (session, role)
+
+    def bind_stream(self, session, role, audio_queue, socket=None):
+        """A leg's media stream connected; replaces (and stops) any earlier stream for the leg"""
+        leg = session.participant(role)
+        with self.lock:
+            stale = leg.audio_queue
+            leg.audio_queue = audio_queue
+            leg.socket = socket
+            leg.last_seen = session.last_seen = time.time()
+        if stale is not None:
+            stop_processor(stale)
+
+    def stream_started(self, session, role, stream_sid):
+        with self.lock:
+            session.participant(role).stream_sid = stream_sid
+            self.by_stream[stream_sid] = (session, role)
+
+    def unbind_stream(self, session, role, audio_queue):
+        """The leg's websocket closed; a newer stream for the same leg is left alone"""
+        leg = session.participant(role)
+        with self.lock:
+            if leg.audio_queue is not audio_queue:
+                return
+            leg.audio_queue = None
+            leg.socket = None
+            self.by_stream.pop(leg.stream_sid, None)
+        stop_processor(audio_queue)
+
+    def is_streaming(self, conference_name, role, audio_queue):
+        """Whether this audio queue is still the live stream for the leg"""
+        session = self.sessions.get(conference_name)
+        return session is not None and session.participant(role).audio_queue is audio_queue
+
+    def heartbeat(self, session, role=None):
+        now = time.time()
+        session.last_seen = now
+        if role:
+            session.participant(role).last_seen = now
+
+    def close(self, conference_name):
+        """Remove a session and stop its streams; returns it, or None if it was already gone"""
+        with self.lock:
+            session = self.sessions.pop(conference_name, None)
+            if session is None:
+                return None
+            self._unindex(session)
+            self.closed += 1
+        self._stop_streams(session)
+        return session
+
+    def _unindex(self, session):
+        for leg in (session.caller, session.receiver):
+            if self.by_call.get(leg.call_sid, (None,))[0] is session:
+                del self.by_call[leg.call_sid]
+            if self.by_stream.get(leg.stream_sid, (None,))[0] is session:
+                del self.by_stream[leg.stream_sid]
+
+    def _stop_streams(self, session):
+        for leg in session.streams():
+            stop_processor(leg.audio_queue)
+            leg.audio_queue = None
+            if leg.socket is not None:
+                try:
+                    leg.socket.close()
+                except Exception:
+                    pass
+                leg.socket = None
+
+    def audio_queues(self):
+        return [leg.audio_queue for session in list(self.sessions.values()) for leg in session.streams()]
+
+    def reap(self):
+        """End sessions that went quiet or outlived the TTL"""
+        now = time.time()
+        expired = []
+        for session in list(self.sessions.values()):
+            if now - session.created > self.ttl:
+                expired.append((session, 'ttl'))
+            elif now - session.last_seen > self.idle_timeout:
+                expired.append((session, 'idle'))
+        for session, reason in expired:
+            if self.close(session.conference_name) is None:
+                continue
+            self.reaped[reason] += 1
+            print(f"🧟 Reaped {reason} session {session.conference_name} "
+                  f"(age {now - session.created:.0f}s, idle {now - session.last_seen:.0f}s)")
+            if self.on_reap:
+                self.on_reap(session, reason)
+
+    def start_reaper(self):
+        def run():
+            while True:
+                time.sleep(self.reap_interval)
+                try:
+                    self.reap()
+                except Exception as e:
+                    print(f"⚠️  Session reap failed: {e}")
+        threading.Thread(target=run, name='session-reaper', daemon=True).start()
+
+    def snapshot(self):
+        sessions = list(self.sessions.values())
+        sizes = [session.memory() for session in sessions]
+        return {
+            'sessions': len(sessions),
+            'streams': sum(len(session.streams()) for session in sessions),
+            'indexed_calls': len(self.by_call),
+            'indexed_streams': len(self.by_stream),
+            'opened': self.opened,
+            'closed': self.closed,
+            'reaped': dict(self.reaped),
+            'memory_bytes': sum(sizes),
+            'bytes_per_session': round(sum(sizes) / len(sizes)) if sizes else 0,
+            'ttl_s': self.ttl,
+            'idle_timeout_s': self.idle_timeout
+        }
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Tests for silence trimming of synthesized clips
+Run with: python -m pytest test_audio_trim.py
+"""
+
+import math
+import array
+import audioop
+
+import pytest
+
+from audio_trim import trim_silence, parse_wav, build_wav, WAVE_PCM, WAVE_MULAW
+
+RATE = 8000
+
+
+def tone(seconds, amplitude=8000):
+    samples = array.array('h', (int(amplitude * math.sin(2 * math.pi * 440 * i / RATE))
+                                for i in range(int(seconds * RATE))))
+    return samples.tobytes()
+
+
+def silence(seconds):
+    return b'\x00\x00' * int(seconds * RATE)
+
+
+def padded_clip(format_tag=WAVE_MULAW):
+    pcm = silence(0.5) + tone(1.0) + silence(0.5)
+    if format_tag == WAVE_MULAW:
+        return build_wav(audioop.lin2ulaw(pcm, 2), RATE, WAVE_MULAW, 8)
+    return build_wav(pcm, RATE, WAVE_PCM, 16)
+
+
+@pytest.mark.parametrize('format_tag, bits', [(WAVE_MULAW, 8), (WAVE_PCM, 16)])
+def test_padding_is_cut_with_margin(format_tag, bits):
+    clip, removed = trim_silence(padded_clip(format_tag))
+    # 0.5 s on each side, less the 40 ms margin kept on each side
+    assert removed == pytest.approx(0.92, abs=0.011)
+    tag, rate, width, payload = parse_wav(clip)
+    assert (tag, rate, width) == (format_tag, RATE, bits)
+    assert len(payload) / (bits // 8) / RATE == pytest.approx(1.08, abs=0.011)
+
+
+def test_silent_clip_is_unchanged():
+    clip = build_wav(silence(1.0), RATE, WAVE_PCM, 16)
+    assert trim_silence(clip) == (clip, 0.0)
+
+
+def test_unpadded_clip_is_unchanged():
+    clip = build_wav(tone(0.5), RATE, WAVE_PCM, 16)
+    assert trim_silence(clip) == (clip, 0.0)
+
+
+def test_not_a_wav_raises_value_error():
+    with pytest.raises(ValueError):
+        trim_silence(b'ID3\x03' + b'\x00' * 100)    # an MP3
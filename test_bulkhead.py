@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-stage worker pools and their overflow policies
+Run with: python -m pytest test_bulkhead.py
+
+Each pool has one worker, held busy by a job waiting on an event, so
+further jobs stay queued until the test releases it.
+"""
+
+import threading
+
+import pytest
+
+from bulkhead import Bulkhead
+
+
+def busy_pool(overflow, max_queue=2):
+    pool = Bulkhead(f"test-{overflow}", workers=1, max_queue=max_queue, overflow=overflow)
+    release = threading.Event()
+    started = threading.Event()
+
+    def hold():
+        started.set()
+        release.wait(2.0)
+        return 'held'
+
+    holder = pool.submit(hold)
+    started.wait(2.0)
+    return pool, release, holder
+
+
+def test_unknown_policy_is_refused():
+    with pytest.raises(ValueError):
+        Bulkhead('test', 1, 1, 'drop_newest')
+
+
+def test_reject_refuses_when_full():
+    pool, release, _ = busy_pool('reject')
+    queued = [pool.submit(lambda n=n: n) for n in range(2)]
+    assert pool.submit(lambda: 'late') is None
+    release.set()
+    assert [future.result(2.0) for future in queued] == [0, 1]
+    assert pool.rejected == 1
+
+
+def test_drop_oldest_cancels_the_oldest_queued_job():
+    pool, release, _ = busy_pool('drop_oldest')
+    oldest = pool.submit(lambda: 'oldest')
+    second = pool.submit(lambda: 'second')
+    newest = pool.submit(lambda: 'newest')
+    assert oldest.cancelled()
+    release.set()
+    assert (second.result(2.0), newest.result(2.0)) == ('second', 'newest')
+    assert pool.dropped == 1
+
+
+def test_caller_runs_when_full():
+    pool, release, _ = busy_pool('caller_runs', max_queue=1)
+    pool.submit(lambda: 'queued')
+    caller = threading.current_thread().name
+    future = pool.submit(lambda: threading.current_thread().name)
+    assert future.done() and future.result() == caller
+    assert pool.ran_in_caller == 1
+    release.set()
+
+
+def test_job_errors_land_in_the_future():
+    pool = Bulkhead('test-errors', workers=1, max_queue=1)
+
+    def fail():
+        raise RuntimeError("provider down")
+
+    with pytest.raises(RuntimeError):
+        pool.submit(fail).result(2.0)
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Tests for the call archive's handling of records after a call is closed
+Run with: python -m pytest test_call_archive.py
+
+The writer thread is not started; the tests drain the queue synchronously.
+"""
+
+import os
+
+from call_archive import CallArchive, HEADER
+
+FRAME = b'\x7f' * 160    # 20 ms of 8 kHz mu-law
+
+
+def record_call(archive, recordings, frames=50):
+    for _ in range(frames):
+        archive.audio('translator-CA1', 'caller', FRAME)
+    archive.close('translator-CA1')
+    archive._drain(recordings)
+
+
+def test_frame_after_close_keeps_the_recording(tmp_path):
+    archive = CallArchive(str(tmp_path))
+    recordings = {}
+    record_call(archive, recordings)
+    path = os.path.join(str(tmp_path), 'translator-CA1', 'caller.wav')
+    size = os.path.getsize(path)
+    assert size == len(HEADER) + 50 * len(FRAME)
+
+    archive.audio('translator-CA1', 'caller', FRAME)
+    archive.mark('translator-CA1', 'caller', 'transcript', text='late final')
+    archive._drain(recordings)
+
+    assert os.path.getsize(path) == size
+    assert recordings == {}
+    assert archive.late_dropped == 2
+    assert archive.calls == 1
+
+
+def test_existing_track_is_appended_not_truncated(tmp_path):
+    first = CallArchive(str(tmp_path))
+    record_call(first, {})
+    path = os.path.join(str(tmp_path), 'translator-CA1', 'caller.wav')
+
+    # e.g. a restarted server seeing the same conference again
+    second = CallArchive(str(tmp_path))
+    record_call(second, {}, frames=10)
+    assert os.path.getsize(path) == len(HEADER) + 60 * len(FRAME)
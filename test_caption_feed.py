@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Tests for live caption fan-out to slow and fast viewers
+Run with: python -m pytest test_caption_feed.py
+"""
+
+import json
+
+from caption_feed import CaptionHub
+
+
+def kinds(events):
+    return [(kind, json.loads(payload).get('text')) for kind, _, payload in events]
+
+
+def test_unwatched_conference_publishes_nothing():
+    hub = CaptionHub()
+    hub.publish('translator-CA1', 'transcript', 'caller', text="hello")
+    assert hub.published == 0
+
+
+def test_viewers_get_events_of_their_conference_only():
+    hub = CaptionHub()
+    viewer = hub.subscribe('translator-CA1')
+    other = hub.subscribe('translator-CA2')
+    hub.publish('translator-CA1', 'transcript', 'caller', text="hello")
+    events, dropped = viewer.take(0)
+    assert kinds(events) == [('transcript', "hello")] and dropped == 0
+    assert other.take(0) == ([], 0)
+
+
+def test_newer_interim_replaces_waiting_one_from_same_speaker():
+    hub = CaptionHub()
+    viewer = hub.subscribe('translator-CA1')
+    hub.publish('translator-CA1', 'interim', 'caller', text="I will")
+    hub.publish('translator-CA1', 'interim', 'receiver', text="हाँ")
+    hub.publish('translator-CA1', 'interim', 'caller', text="I will pay")
+    events, _ = viewer.take(0)
+    assert kinds(events) == [('interim', "हाँ"), ('interim', "I will pay")]
+    assert viewer.coalesced == 1
+
+
+def test_full_buffer_drops_oldest_and_reports_the_gap_once():
+    hub = CaptionHub(max_buffer=2)
+    viewer = hub.subscribe('translator-CA1')
+    for n in range(5):
+        hub.publish('translator-CA1', 'transcript', 'caller', text=str(n))
+    events, dropped = viewer.take(0)
+    assert kinds(events) == [('transcript', "3"), ('transcript', "4")]
+    assert dropped == 3
+    assert viewer.take(0) == ([], 0)
+
+
+def test_viewer_limit_and_unsubscribe():
+    hub = CaptionHub(max_viewers=1)
+    viewer = hub.subscribe('translator-CA1')
+    assert hub.subscribe('translator-CA2') is None
+    hub.unsubscribe(viewer)
+    assert hub.subscribers == {}
+    assert hub.subscribe('translator-CA2') is not None
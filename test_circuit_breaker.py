@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Tests for circuit breaker state transitions
+Run with: python -m pytest test_circuit_breaker.py
+"""
+
+import time
+
+import pytest
+
+from circuit_breaker import CircuitBreaker, CircuitOpenError, CLOSED, OPEN, HALF_OPEN
+
+
+def opened_breaker(recovery_timeout=0.2):
+    breaker = CircuitBreaker('translate', failure_threshold=3, recovery_timeout=recovery_timeout)
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.state == OPEN
+    return breaker
+
+
+def test_late_failures_do_not_reopen():
+    transitions = []
+    breaker = opened_breaker()
+    breaker.on_state_change(lambda name, old, new: transitions.append((old, new)))
+    opened_at = breaker.opened_at
+
+    # calls that were in flight when the breaker opened fail afterwards
+    for _ in range(5):
+        breaker.record_failure()
+
+    assert breaker.opened_at == opened_at
+    assert breaker.times_opened == 1
+    assert transitions == []
+
+
+def test_late_failures_do_not_extend_recovery():
+    breaker = opened_breaker()
+    time.sleep(0.15)
+    breaker.record_failure()
+    time.sleep(0.1)
+    assert breaker.allow_request()
+    assert breaker.state == HALF_OPEN
+
+
+def test_open_breaker_rejects_calls():
+    breaker = opened_breaker(recovery_timeout=10)
+    assert breaker.rejects()
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: 'translated')
+    assert breaker.rejected == 2
+
+
+def test_failed_probe_reopens_and_success_closes():
+    breaker = opened_breaker(recovery_timeout=0)
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == OPEN and breaker.times_opened == 2
+
+    assert breaker.call(lambda: 'translated') == 'translated'
+    assert breaker.state == CLOSED and breaker.failures == 0
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for the TTS clip store's addressing, size cap and sweeping
+Run with: python -m pytest test_clip_store.py
+"""
+
+import os
+import time
+
+from clip_store import ClipStore
+
+
+def store(tmp_path, **options):
+    return ClipStore(directory=str(tmp_path), **options)
+
+
+def test_same_content_reuses_the_file(tmp_path):
+    clips = store(tmp_path)
+    first = clips.put(b'clip-a', 'translator-CA1')
+    again = clips.put(b'clip-a', 'translator-CA2')
+    assert first == again
+    assert os.listdir(str(tmp_path)) == [first]
+    assert (clips.stored, clips.reused) == (1, 1)
+    assert clips.get(first).owners == {'translator-CA1', 'translator-CA2'}
+
+
+def test_size_cap_evicts_least_recently_used(tmp_path):
+    clips = store(tmp_path, max_bytes=20)
+    oldest = clips.put(b'a' * 8, 'translator-CA1')
+    used = clips.put(b'b' * 8, 'translator-CA1')
+    clips.touch(used, 'translator-CA1')
+    newest = clips.put(b'c' * 8, 'translator-CA1')
+    assert clips.get(oldest) is None
+    assert not os.path.exists(os.path.join(str(tmp_path), oldest))
+    assert clips.get(used) and clips.get(newest)
+    assert clips.evicted == 1
+
+
+def test_released_clips_are_swept_after_the_interval(tmp_path):
+    clips = store(tmp_path, sweep_interval=0.05)
+    shared = clips.put(b'shared', 'translator-CA1')
+    clips.touch(shared, 'translator-CA2')
+    own = clips.put(b'own', 'translator-CA1')
+    clips.release('translator-CA1')
+    time.sleep(0.1)
+    clips.sweep()
+    assert clips.get(own) is None
+    assert clips.get(shared) is not None
+
+
+def test_orphaned_files_are_swept_after_the_ttl(tmp_path):
+    clips = store(tmp_path, ttl=60)
+    orphan = tmp_path / 'tts_orphan.wav'
+    orphan.write_bytes(b'left by a crashed worker')
+    recent = tmp_path / 'tts_recent.wav'
+    recent.write_bytes(b'another worker is serving this')
+    old = time.time() - 120
+    os.utime(str(orphan), (old, old))
+    clips.sweep()
+    assert not orphan.exists()
+    assert recent.exists()
+    assert clips.orphans_swept == 1
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Tests for telling echoes of played translations from genuine replies
+Run with: python -m pytest test_echo_guard.py
+"""
+
+from echo_guard import EchoGuard, fingerprint, similarity
+
+
+def guard_after_playing(text):
+    guard = EchoGuard()
+    guard.mark_playback('translator-CA1', 'caller', 2.0, text)
+    return guard
+
+
+def test_similarity_is_symmetric():
+    short, long = fingerprint("yes I paid"), fingerprint("I paid the bill")
+    assert similarity(short, long) == similarity(long, short) == 0.4
+
+
+def test_short_reply_reusing_words_is_not_echo():
+    guard = guard_after_playing("I paid the bill")
+    assert guard.check('translator-CA1', 'caller', 'receiver', "yes I paid") is None
+    assert guard.echoes_dropped == 0
+
+
+def test_echo_of_played_translation_is_dropped():
+    guard = guard_after_playing("I paid the bill yesterday evening")
+    assert guard.check('translator-CA1', 'caller', 'receiver', "I paid the bill yesterday evening.") == 'echo'
+    # one word misrecognized
+    assert guard.check('translator-CA1', 'caller', 'receiver', "I paid the bell yesterday evening") == 'echo'
+    assert guard.echoes_dropped == 2
+
+
+def test_echo_on_other_leg_is_not_matched():
+    guard = guard_after_playing("I paid the bill")
+    assert guard.check('translator-CA1', 'receiver', 'caller', "I paid the bill") is None
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests for the non-blocking structured event log
+Run with: python -m pytest test_event_log.py
+"""
+
+import io
+import json
+import time
+
+from event_log import EventLog, parse_levels
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_parse_levels_skips_unknown_levels():
+    assert parse_levels('stream=warning, pipeline=DEBUG,tts=loud,bad') == {'stream': 'warning', 'pipeline': 'debug'}
+    assert parse_levels(None) == {}
+
+
+def test_module_levels_filter_events():
+    log = EventLog(level='info', module_levels={'pipeline': 'debug', 'stream': 'warning'})
+    log.event('pipeline', 'shed_interim', 'debug')
+    log.event('stream', 'frame', 'info')
+    log.event('tts', 'cache_hit', 'debug')
+    log.event('tts', 'error', 'error')
+    assert [record[2:4] for record in log.queue] == [('pipeline', 'shed_interim'), ('tts', 'error')]
+
+
+def test_full_queue_drops_instead_of_blocking():
+    log = EventLog(max_queue=2)
+    for _ in range(5):
+        log.event('pipeline', 'delivered')
+    assert (len(log.queue), log.dropped) == (2, 3)
+
+
+def test_per_frame_events_are_sampled():
+    log = EventLog(level='debug', sample_every=10)
+    for _ in range(25):
+        log.sampled('stream', 'frame')
+    assert len(log.queue) == 2
+    assert log.sampled_out == 23
+    assert log.queue[0][4] == {'sampled_1_in': 10}
+
+
+def test_writer_emits_json_lines():
+    out = io.StringIO()
+    log = EventLog(stream=out)
+    log.start()
+    log.event('pipeline', 'delivered', conference='translator-CA1', latency_s=0.8)
+    assert wait_until(lambda: log.written == 1)
+    record = json.loads(out.getvalue())
+    assert (record['module'], record['event'], record['latency_s']) == ('pipeline', 'delivered', 0.8)
+
+
+def test_text_format_is_readable():
+    log = EventLog(fmt='text')
+    line = log.format(0, 'warning', 'tts', 'error', {'error': 'timeout'})
+    assert line.endswith("⚠️  tts.error error=timeout\n")
+
+
+def test_transcripts_go_to_one_file_per_call(tmp_path):
+    log = EventLog(stream=io.StringIO(), transcript_dir=str(tmp_path))
+    log.start()
+    log.transcript('translator-CA1', 'caller', 'transcript', 'hello', lang='en')
+    log.transcript('translator-CA1', 'receiver', 'translation', 'नमस्ते', lang='hi')
+    log.close_call('translator-CA1')
+    path = tmp_path / 'translator-CA1.jsonl'
+    assert wait_until(lambda: path.exists() and len(path.read_text(encoding='utf-8').splitlines()) == 2)
+    lines = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+    assert [(line['event'], line['role'], line['text']) for line in lines] == [
+        ('transcript', 'caller', 'hello'), ('translation', 'receiver', 'नमस्ते')]
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for fair-share scheduling across conferences
+Run with: python -m pytest test_fair_scheduler.py
+
+A stand-in pool holds submitted jobs until the test runs them, so dispatch
+order is deterministic.
+"""
+
+from fair_scheduler import FairScheduler
+
+
+class HeldPool:
+    def __init__(self, accept=True):
+        self.accept = accept
+        self.jobs = []
+
+    def submit(self, fn, *args):
+        if not self.accept:
+            return None
+        self.jobs.append((fn, args))
+        return True
+
+    def run_next(self):
+        fn, args = self.jobs.pop(0)
+        fn(*args)
+
+
+def run_all(pool):
+    while pool.jobs:
+        pool.run_next()
+
+
+def test_in_flight_is_capped():
+    pool = HeldPool()
+    scheduler = FairScheduler(pool, max_in_flight=2)
+    for n in range(5):
+        scheduler.submit('translator-CA1', 1, print, n)
+    assert len(pool.jobs) == 2
+    assert scheduler.snapshot()['queued'] == 3
+
+
+def test_quiet_conference_is_not_stuck_behind_a_talkative_one():
+    pool = HeldPool()
+    ran = []
+    scheduler = FairScheduler(pool, max_in_flight=1)
+    for n in range(4):
+        scheduler.submit('talkative', 1, ran.append, f"talkative-{n}")
+    scheduler.submit('quiet', 1, ran.append, 'quiet-0')
+    run_all(pool)
+    assert ran.index('quiet-0') <= 2
+
+
+def test_weights_share_slots_proportionally():
+    pool = HeldPool()
+    ran = []
+    scheduler = FairScheduler(pool, max_in_flight=1)
+    scheduler.submit('blocker', 1, ran.append, 'blocker')
+    for n in range(20):
+        scheduler.submit('premium', 3, ran.append, 'premium')
+        scheduler.submit('standard', 1, ran.append, 'standard')
+    for _ in range(9):
+        pool.run_next()
+    assert ran[1:9].count('premium') == 6
+
+
+def test_full_queue_drops_oldest_and_reports_it():
+    pool = HeldPool()
+    drops = []
+    ran = []
+    scheduler = FairScheduler(pool, max_in_flight=1, max_queue_per_key=2, on_drop=lambda: drops.append(1))
+    for n in range(4):
+        scheduler.submit('translator-CA1', 1, ran.append, n)
+    run_all(pool)
+    assert ran == [0, 2, 3]
+    assert len(drops) == scheduler.dropped == 1
+
+
+def test_forget_drops_queued_work():
+    pool = HeldPool()
+    drops = []
+    scheduler = FairScheduler(pool, max_in_flight=1, on_drop=lambda: drops.append(1))
+    for n in range(3):
+        scheduler.submit('translator-CA1', 1, print, n)
+    scheduler.forget('translator-CA1')
+    assert len(drops) == scheduler.dropped == 2
+    assert scheduler.snapshot()['queued'] == 0
+
+
+def test_pool_refusal_is_a_drop():
+    drops = []
+    scheduler = FairScheduler(HeldPool(accept=False), max_in_flight=1, on_drop=lambda: drops.append(1))
+    scheduler.submit('translator-CA1', 1, print, 'refused')
+    assert len(drops) == 1
+    assert scheduler.in_flight == 0
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests for hedged provider calls
+Run with: python -m pytest test_hedging.py
+
+Each test registers its own operation, so the module-level counters start at zero.
+"""
+
+import time
+import itertools
+
+import pytest
+
+import hedging
+
+operation_names = (f"test-{n}" for n in itertools.count())
+
+
+def operation():
+    name = next(operation_names)
+    hedging.register(name, default_delay=0.1)
+    return name
+
+
+def slow(result, seconds):
+    def attempt():
+        time.sleep(seconds)
+        return result
+    return attempt
+
+
+def failing():
+    raise ConnectionError("provider unavailable")
+
+
+def test_fast_primary_is_not_hedged():
+    name = operation()
+    assert hedging.hedged_call(name, [slow('primary', 0), slow('backup', 0)], 2.0) == 'primary'
+    assert hedging.stats[name].hedged == 0
+
+
+def test_slow_primary_is_hedged_and_backup_wins():
+    name = operation()
+    assert hedging.hedged_call(name, [slow('primary', 1.0), slow('backup', 0)], 2.0) == 'backup'
+    assert hedging.stats[name].hedged == 1
+    assert hedging.stats[name].backup_wins == 1
+
+
+def test_failed_primary_starts_backup_at_once():
+    name = operation()
+    started = time.time()
+    assert hedging.hedged_call(name, [failing, slow('backup', 0)], 2.0) == 'backup'
+    assert time.time() - started < hedging.MIN_HEDGE_DELAY
+
+
+def test_refused_hedge_waits_for_primary():
+    name = operation()
+    admissions = []
+
+    def admit():
+        admissions.append(time.time())
+        return False
+
+    assert hedging.hedged_call(name, [slow('primary', 0.3), slow('backup', 0)], 2.0, admit) == 'primary'
+    assert len(admissions) == 1
+    assert hedging.stats[name].hedges_skipped == 1
+    assert hedging.stats[name].hedged == 0
+
+
+def test_all_attempts_failing_raises_last_error():
+    name = operation()
+    with pytest.raises(ConnectionError):
+        hedging.hedged_call(name, [failing, failing], 2.0)
+    assert hedging.stats[name].failures == 1
+
+
+def test_no_answer_within_timeout():
+    name = operation()
+    with pytest.raises(TimeoutError):
+        hedging.hedged_call(name, [slow('primary', 1.0)], 0.2)
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for the frequent phrase sketch and its persistence
+Run with: python -m pytest test_phrase_tracker.py
+"""
+
+from phrase_tracker import PhraseTracker
+
+
+def test_variants_count_as_one_phrase():
+    tracker = PhraseTracker(capacity=10, min_count=1)
+    for text in ("Thank you!", "thank you", "THANK YOU."):
+        tracker.observe('transcript', 'en', text)
+    assert tracker.top(5) == [('transcript', 'en', "THANK YOU.", 3, 0)]
+
+
+def test_kinds_and_languages_are_kept_apart():
+    tracker = PhraseTracker(capacity=10, min_count=1)
+    tracker.observe('transcript', 'en', "okay")
+    tracker.observe('translation', 'en', "okay")
+    tracker.observe('transcript', 'hi', "okay")
+    assert len(tracker.top(5)) == 3
+
+
+def test_new_phrase_replaces_least_counted_and_inherits_its_count():
+    tracker = PhraseTracker(capacity=2, min_count=0)
+    for _ in range(5):
+        tracker.observe('transcript', 'en', "hello")
+    tracker.observe('transcript', 'en', "one moment please")
+    tracker.observe('transcript', 'en', "can you hear me")
+    top = {text: (count, error) for _, _, text, count, error in tracker.top(5)}
+    assert top == {"hello": (5, 0), "can you hear me": (2, 1)}
+    assert tracker.replaced == 1
+
+
+def test_frequent_phrase_survives_a_stream_of_one_offs():
+    tracker = PhraseTracker(capacity=20, min_count=3)
+    for n in range(500):
+        tracker.observe('transcript', 'en', f"order number {n}")
+        if n % 5 == 0:
+            tracker.observe('transcript', 'en', "please hold the line")
+    assert tracker.top(1)[0][2] == "please hold the line"
+
+
+def test_guaranteed_count_gates_warming():
+    tracker = PhraseTracker(capacity=1, min_count=2)
+    tracker.observe('transcript', 'en', "hello")
+    tracker.observe('transcript', 'en', "hello")
+    tracker.observe('transcript', 'en', "goodbye")    # count 3, but only 1 for sure
+    assert tracker.top(5) == []
+    assert tracker.top(5, min_count=0)[0][2:] == ("goodbye", 3, 2)
+
+
+def test_counts_survive_a_restart(tmp_path):
+    path = str(tmp_path / 'phrases.json')
+    tracker = PhraseTracker(path=path, min_count=1)
+    for _ in range(3):
+        tracker.observe('translation', 'hi', "धन्यवाद")
+    tracker.save()
+    reloaded = PhraseTracker(path=path, min_count=1)
+    assert reloaded.top(1) == [('translation', 'hi', "धन्यवाद", 3, 0)]
+    assert reloaded.observed == 3
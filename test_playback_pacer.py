@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Tests for backlog-aware speaking rates
+Run with: python -m pytest test_playback_pacer.py
+"""
+
+import pytest
+
+from playback_pacer import PlaybackPacer
+
+LISTENER = ('translator-CA1', 'receiver')
+
+
+def pacer():
+    return PlaybackPacer(base_rate=1.0, max_rate=1.5, target_lag=2.0, max_lag=6.0)
+
+
+def test_base_rate_while_listener_keeps_up():
+    p = pacer()
+    p.scheduled(LISTENER, 1.5)
+    assert p.speaking_rate(LISTENER) == 1.0
+    assert p.adjusted == 0
+
+
+def test_clips_queue_behind_each_other():
+    p = pacer()
+    p.scheduled(LISTENER, 3.0)
+    assert p.scheduled(LISTENER, 1.0) == pytest.approx(4.0, abs=0.05)
+
+
+def test_rate_rises_with_backlog_and_is_capped():
+    p = pacer()
+    p.scheduled(LISTENER, 4.0)   # halfway from target_lag to max_lag
+    assert p.speaking_rate(LISTENER) == pytest.approx(1.25, abs=0.01)
+    p.scheduled(LISTENER, 10.0)
+    assert p.speaking_rate(LISTENER) == 1.5
+    assert p.adjusted == 2
+
+
+def test_forget_drops_only_that_conference():
+    p = pacer()
+    p.scheduled(LISTENER, 5.0)
+    p.scheduled(('translator-CA2', 'caller'), 5.0)
+    p.forget('translator-CA1')
+    assert p.backlog(LISTENER) == 0
+    assert p.backlog(('translator-CA2', 'caller')) > 4.0
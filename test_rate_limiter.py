@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tests for client-side quota limiting
+Run with: python -m pytest test_rate_limiter.py
+"""
+
+import time
+import threading
+
+import pytest
+
+from rate_limiter import (RateLimiter, QuotaScheduler, QuotaExceededError,
+                          PRIORITY_FINAL, PRIORITY_BACKGROUND)
+
+
+def test_burst_then_refuses_without_waiting():
+    limiter = RateLimiter('translate.requests', per_minute=120, burst=2)
+    assert limiter.acquire(timeout=0)
+    assert limiter.acquire(timeout=0)
+    assert not limiter.acquire(timeout=0)
+    assert (limiter.granted, limiter.rejected) == (2, 1)
+
+
+def test_waits_for_refill():
+    limiter = RateLimiter('translate.requests', per_minute=600, burst=1)    # 10 per second
+    limiter.acquire()
+    started = time.time()
+    assert limiter.acquire(timeout=1.0)
+    assert 0.05 < time.time() - started < 0.5
+
+
+def test_release_gives_tokens_back():
+    limiter = RateLimiter('tts.requests', per_minute=60, burst=1)
+    limiter.acquire()
+    limiter.release()
+    assert limiter.acquire(timeout=0)
+
+
+def test_finals_are_served_before_background():
+    limiter = RateLimiter('tts.requests', per_minute=600, burst=1)
+    limiter.acquire()
+    served = []
+
+    def wait_for_quota(name, priority):
+        limiter.acquire(priority=priority, timeout=2.0)
+        served.append(name)
+
+    background = threading.Thread(target=wait_for_quota, args=('background', PRIORITY_BACKGROUND))
+    background.start()
+    time.sleep(0.01)
+    final = threading.Thread(target=wait_for_quota, args=('final', PRIORITY_FINAL))
+    final.start()
+    background.join()
+    final.join()
+    assert served == ['final', 'background']
+
+
+def test_scheduler_takes_requests_and_characters_together():
+    quota = QuotaScheduler()
+    quota.add('translate', 'requests', 600, burst=5)
+    quota.add('translate', 'characters', 600, burst=100)
+    quota.acquire('translate', 80, timeout=0)
+    with pytest.raises(QuotaExceededError):
+        quota.acquire('translate', 80, timeout=0)
+    # the request token taken before the characters ran out was given back
+    assert quota.limiters[('translate', 'requests')].tokens == pytest.approx(4, abs=0.1)
+
+    quota.release('translate', 80)
+    quota.acquire('translate', 80, timeout=0)
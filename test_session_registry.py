@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests for the live session registry's indexes, stream handover and reaping
+Run with: python -m pytest test_session_registry.py
+"""
+
+import queue
+
+from session_registry import SessionRegistry
+
+
+def registry_with_call():
+    registry = SessionRegistry(ttl=3600, idle_timeout=60)
+    session = registry.open('translator-CA1')
+    registry.bind_call(session, 'caller', 'CA1')
+    registry.bind_call(session, 'receiver', 'CA2')
+    return registry, session
+
+
+def test_sessions_are_found_by_call_and_stream_sid():
+    registry, session = registry_with_call()
+    audio = queue.Queue()
+    registry.bind_stream(session, 'receiver', audio)
+    registry.stream_started(session, 'receiver', 'MZ1')
+    assert registry.by_call_sid('CA2') == (session, 'receiver')
+    assert registry.by_stream_sid('MZ1') == (session, 'receiver')
+    assert registry.by_call_sid('CA9') == (None, None)
+
+
+def test_new_stream_replaces_and_stops_the_old_one():
+    registry, session = registry_with_call()
+    old, new = queue.Queue(), queue.Queue()
+    registry.bind_stream(session, 'caller', old)
+    registry.bind_stream(session, 'caller', new)
+    assert old.get_nowait() is None    # the shutdown signal
+    assert registry.is_streaming('translator-CA1', 'caller', new)
+
+    # the old websocket closing late leaves the new stream alone
+    registry.unbind_stream(session, 'caller', old)
+    assert registry.is_streaming('translator-CA1', 'caller', new)
+
+
+def test_close_unindexes_and_stops_streams():
+    registry, session = registry_with_call()
+    audio = queue.Queue()
+    registry.bind_stream(session, 'caller', audio)
+    assert registry.close('translator-CA1') is session
+    assert audio.get_nowait() is None
+    assert 'translator-CA1' not in registry
+    assert registry.by_call_sid('CA1') == (None, None)
+    assert registry.close('translator-CA1') is None
+
+
+def test_reaper_ends_idle_and_expired_sessions():
+    reaped = []
+    registry = SessionRegistry(ttl=3600, idle_timeout=60, on_reap=lambda session, reason: reaped.append(
+        (session.conference_name, reason)))
+    idle = registry.open('translator-idle')
+    idle.last_seen -= 120
+    old = registry.open('translator-old')
+    old.created -= 7200
+    registry.open('translator-live')
+
+    registry.reap()
+
+    assert sorted(reaped) == [('translator-idle', 'idle'), ('translator-old', 'ttl')]
+    assert list(registry.sessions) == ['translator-live']
+    assert registry.reaped == {'idle': 1, 'ttl': 1}
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Tests for per-language transcript cleanup
+Run with: python -m pytest test_text_normalizer.py
+"""
+
+import json
+
+from text_normalizer import TextNormalizer
+
+
+def test_fillers_are_removed_with_their_punctuation():
+    normalizer = TextNormalizer()
+    assert normalizer.normalize("um, I want to uh pay the bill", 'en') == "I want to pay the bill"
+    assert normalizer.normalize("उम्म मुझे बिल भरना है", 'hi') == "मुझे बिल भरना है"
+    assert normalizer.fillers_removed == 3
+
+
+def test_filler_inside_a_word_is_kept():
+    assert TextNormalizer().normalize("the summer drum", 'en') == "The summer drum"
+
+
+def test_stutters_collapse_but_doubled_words_stay():
+    normalizer = TextNormalizer()
+    assert normalizer.normalize("I I I want to go", 'en') == "I I want to go"
+    assert normalizer.normalize("bye bye", 'en') == "Bye bye"
+    assert normalizer.normalize("धीरे धीरे बोलिए", 'hi') == "धीरे धीरे बोलिए"
+    assert normalizer.repeats_removed == 1
+
+
+def test_numbers_are_never_collapsed():
+    assert TextNormalizer().normalize("my number is 9 9 9 8 1", 'en') == "My number is 9 9 9 8 1"
+
+
+def test_digits_and_separators():
+    normalizer = TextNormalizer()
+    assert normalizer.normalize("मेरा नंबर १२३ है", 'hi') == "मेरा नंबर 123 है"
+    assert normalizer.normalize("that is 1,250 rupees , ok ??", 'en') == "That is 1250 rupees, ok?"
+
+
+def test_nothing_but_fillers_empties_the_utterance():
+    normalizer = TextNormalizer()
+    assert normalizer.normalize("Um... uh.", 'en') == ''
+    assert normalizer.emptied == 1
+
+
+def test_unknown_language_only_gets_generic_cleanup():
+    assert TextNormalizer().normalize("um  um  um hola", 'es') == "um um um hola"
+
+
+def test_rules_from_file_override_defaults(tmp_path):
+    path = tmp_path / 'rules.json'
+    path.write_text(json.dumps({'en': {'fillers': ['like'], 'capitalize': False}}), encoding='utf-8')
+    normalizer = TextNormalizer.from_file(str(path))
+    assert normalizer.normalize("it was like um great", 'en') == "it was um great"
+
+
+def test_compare_counts_repeats_before_and_after_normalizing():
+    normalizer = TextNormalizer()
+    for raw in ("um I want to pay the bill", "I want to pay the bill", "uh, I want to pay the bill"):
+        normalizer.compare(raw, normalizer.normalize(raw, 'en'), 'en')
+    snapshot = normalizer.snapshot()
+    assert snapshot['finals_compared'] == 3
+    assert (snapshot['exact_hit_rate_raw'], snapshot['exact_hit_rate']) == (0, 0.667)
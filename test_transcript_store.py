@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Tests for transcript search by phrase, phone number and time
+Run with: python -m pytest test_transcript_store.py
+
+The writer thread is not started; queued rows are written synchronously.
+"""
+
+import time
+
+import pytest
+
+from transcript_store import TranscriptStore
+
+
+def write_queued(store):
+    db = store.connect()
+    try:
+        store._write(db, list(store.queue))
+        store.queue.clear()
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = TranscriptStore(str(tmp_path / 'transcripts.db'))
+    store.call_started('translator-CA1', '+14155550100', '+919800000001')
+    store.record('translator-CA1', 'caller', 'transcript', 'en', "I will pay the electricity bill tomorrow")
+    store.record('translator-CA1', 'receiver', 'translation', 'hi', "मैं कल बिजली का बिल भर दूँगा",
+                 "I will pay the electricity bill tomorrow")
+    store.call_started('translator-CA2', '+14155550199', '+919800000001')
+    store.record('translator-CA2', 'receiver', 'transcript', 'hi', "मैं घर पर हूँ")
+    store.record('translator-CA2', 'caller', 'transcript', 'en', "Where is the bill")
+    store.call_ended('translator-CA2')
+    write_queued(store)
+    return store
+
+
+def texts(rows):
+    return [row['text'] for row in rows]
+
+
+def test_phrase_search_is_exact_phrase(store):
+    assert texts(store.search(phrase='electricity bill')) == ["I will pay the electricity bill tomorrow"]
+    assert texts(store.search(phrase='bill electricity')) == []
+
+
+def test_hindi_words_keep_their_vowel_signs(store):
+    assert texts(store.search(phrase='हूँ')) == ["मैं घर पर हूँ"]
+    assert texts(store.search(phrase='बिजली')) == ["मैं कल बिजली का बिल भर दूँगा"]
+
+
+def test_number_matches_either_party(store):
+    assert len(store.search(number='+919800000001')) == 4
+    rows = store.search(number='+14155550100')
+    assert {row['conference'] for row in rows} == {'translator-CA1'}
+    assert rows[0]['caller_number'] == '+14155550100'
+
+
+def test_filters_combine_and_newest_come_first(store):
+    rows = store.search(phrase='bill', since=time.time() - 60, limit=10)
+    assert texts(rows) == ["Where is the bill", "I will pay the electricity bill tomorrow"]
+    assert store.search(phrase='bill', until=time.time() - 60) == []
+    assert len(store.search(limit=2)) == 2
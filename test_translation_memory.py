@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for the translation memory's near-match guards
+Run with: python -m pytest test_translation_memory.py
+
+The sentence pairs are long enough that their trigram similarity (0.86-0.92)
+is far above the LSH banding threshold, so the near-duplicate is reliably a
+candidate and the guard under test decides.
+"""
+
+from translation_memory import TranslationMemory, meaning, normalize
+
+NOT_COMING = "I will not be able to come to the office tomorrow morning"
+NOT_CANCEL = "Please do not cancel my order for the blue shirt today"
+MR_SHARMA = "Mr Sharma is waiting for you at the main gate of the building"
+HOUSE_12 = "My house number is 12 on the main road near the old temple"
+TELL_HIM = "Please tell him that the delivery will reach the main office by the evening"
+I_PAID = "I have already paid the full amount for the order through the bank"
+IS_CONFIRMED = "Your booking for the hotel room near the railway station is confirmed"
+CAN_COME = "He can come to the office on the weekend to collect all of the documents"
+
+
+def memory():
+    tm = TranslationMemory(threshold=0.8)
+    tm.add(NOT_COMING, 'en', 'hi', "मैं कल सुबह ऑफिस नहीं आ पाऊँगा")
+    tm.add(NOT_CANCEL, 'en', 'hi', "कृपया आज नीली शर्ट का मेरा ऑर्डर रद्द न करें")
+    tm.add(MR_SHARMA, 'en', 'hi', "श्री शर्मा इमारत के मुख्य द्वार पर आपका इंतज़ार कर रहे हैं")
+    tm.add(HOUSE_12, 'en', 'hi', "मेरा मकान नंबर पुराने मंदिर के पास मुख्य सड़क पर 12 है")
+    tm.add(TELL_HIM, 'en', 'hi', "कृपया उसे बताइए कि डिलीवरी शाम तक मुख्य ऑफिस पहुँच जाएगी")
+    tm.add(I_PAID, 'en', 'hi', "मैंने ऑर्डर की पूरी रकम बैंक से पहले ही चुका दी है")
+    tm.add(IS_CONFIRMED, 'en', 'hi', "रेलवे स्टेशन के पास होटल के कमरे की आपकी बुकिंग पक्की है")
+    tm.add(CAN_COME, 'en', 'hi', "वह सारे दस्तावेज़ लेने सप्ताहांत में ऑफिस आ सकता है")
+    return tm
+
+
+def test_negations_are_part_of_meaning():
+    assert meaning(normalize("Please do not cancel"))[0] == ('not',)
+    assert meaning(normalize("I don't want it"))[0] == ("n't",)
+    assert meaning(normalize("मैं नहीं आऊँगा"))[0] == ('नहीं',)
+    assert meaning(normalize("I will come"))[0] == ()
+
+
+def test_dropped_negation_never_matches():
+    tm = memory()
+    assert tm.lookup("I will be able to come to the office tomorrow morning", 'en', 'hi') is None
+    assert tm.lookup("Please do cancel my order for the blue shirt today", 'en', 'hi') is None
+    assert tm.rejected_negations == 2
+    assert tm.hits['fuzzy'] == 0
+
+
+def test_title_change_never_matches():
+    tm = memory()
+    assert tm.lookup("Mrs Sharma is waiting for you at the main gate of the building", 'en', 'hi') is None
+    assert tm.rejected_content == 1
+
+
+def test_pronoun_change_never_matches():
+    tm = memory()
+    assert tm.lookup("Please tell her that the delivery will reach the main office by the evening", 'en', 'hi') is None
+    assert tm.lookup("You have already paid the full amount for the order through the bank", 'en', 'hi') is None
+    assert tm.rejected_content == 2
+
+
+def test_tense_and_modal_change_never_matches():
+    tm = memory()
+    assert tm.lookup("Your booking for the hotel room near the railway station was confirmed", 'en', 'hi') is None
+    assert tm.lookup("He must come to the office on the weekend to collect all of the documents", 'en', 'hi') is None
+    assert tm.rejected_content == 2
+    assert tm.hits['fuzzy'] == 0
+
+
+def test_number_change_never_matches():
+    tm = memory()
+    assert tm.lookup("My house number is 21 on the main road near the old temple", 'en', 'hi') is None
+    assert tm.rejected_numbers == 1
+
+
+def test_article_and_politeness_change_still_matches():
+    tm = memory()
+    text = "Mr Sharma is waiting for you at the main gate of the building okay"
+    assert tm.lookup(text, 'en', 'hi') == "श्री शर्मा इमारत के मुख्य द्वार पर आपका इंतज़ार कर रहे हैं"
+    text = "Tell him that the delivery will reach the main office by evening"
+    assert tm.lookup(text, 'en', 'hi') == "कृपया उसे बताइए कि डिलीवरी शाम तक मुख्य ऑफिस पहुँच जाएगी"
+    assert tm.hits['fuzzy'] == 2
+
+
+def test_exact_match_ignores_case_and_punctuation():
+    tm = memory()
+    assert tm.lookup("please do NOT cancel my order for the blue shirt today!", 'en', 'hi') == \
+        "कृपया आज नीली शर्ट का मेरा ऑर्डर रद्द न करें"
+    assert tm.hits['exact'] == 1
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Per-language cleanup of transcripts before they are translated
+Speech recognition output carries fillers ("um", "उम्म"), stutter repeats
+("I I I want") and inconsistent digits, spacing and punctuation. All of it
+is billed by Translate and again by TTS once translated, and it splits
+otherwise identical sentences across cache entries. The normalizer strips
+fillers and disfluent repeats, turns Devanagari digits into ASCII and drops
+thousands separators, and tidies whitespace, punctuation and the leading
+capital. Rules are per language and can be overridden from a JSON file.
+Only runs of three or more of the same word are stutters: doubled words
+are usually meant ("bye bye", "very very good", Hindi "धीरे धीरे"), and
+numbers are never collapsed (dictated phone numbers repeat digits).
+"""
+
+import re
+import json
+import threading
+from itertools import groupby
+from collections import OrderedDict
+
+from translation_memory import normalize as memory_key
+
+# Letters and digits including Devanagari vowel signs (not \w), excluding the dandas
+WORD = '[\\w\u0900-\u0963\u0966-\u097F]'
+PUNCTUATION = ',.!?।'
+DEVANAGARI_DIGITS = str.maketrans('०१२३४५६७८९', '0123456789')
+THOUSANDS = re.compile(r'(?<=\d),(?=\d{3}(?!\d))')
+SPACE_BEFORE_PUNCTUATION = re.compile(f"\\s+([{PUNCTUATION}])")
+REPEATED_PUNCTUATION = re.compile(f"([{PUNCTUATION}])[{PUNCTUATION}]+")
+SEPARATORS = re.compile(f"[^{WORD[1:-1]}]+")
+
+# fillers: dropped wherever they stand as whole words; max_repeat: longest run of one word kept
+# "haan"/"हाँ" (yes) and "like" carry meaning too often to be defaults.
+DEFAULT_RULES = {
+    'en': {'fillers': ['um', 'umm', 'uh', 'uhh', 'uhm', 'er', 'erm', 'hmm', 'mm', 'mhm'],
+           'max_repeat': 2, 'capitalize': True},
+    'hi': {'fillers': ['उम', 'उम्म', 'अं', 'अम्म', 'हम्म', 'um', 'umm', 'uh', 'hmm'],
+           'max_repeat': 2, 'capitalize': False},
+}
+
+
+class LanguageRules:
+    def __init__(self, fillers=(), max_repeat=1, capitalize=False):
+        alternatives = '|'.join(re.escape(filler) for filler in sorted(fillers, key=len, reverse=True))
+        # a filler plus the comma or stop that set it off
+        self.fillers = re.compile(f"(?<!{WORD})(?:{alternatives})(?!{WORD})[,.]?", re.IGNORECASE) if fillers else None
+        self.max_repeat = max_repeat
+        self.capitalize = capitalize
+
+
+class TextNormalizer:
+    def __init__(self, rules=None, compare_window=5000):
+        merged = {language: dict(settings) for language, settings in DEFAULT_RULES.items()}
+        for language, settings in (rules or {}).items():
+            merged.setdefault(language, {}).update(settings)
+        self.rules = {language: LanguageRules(**settings) for language, settings in merged.items()}
+        self.lock = threading.Lock()
+
+        # Translation memory keys of recent raw and of recent normalized finals, to compare
+        # how often each would repeat an earlier sentence exactly (the memory's exact hits)
+        self.compare_window = compare_window
+        self.seen = {'raw': OrderedDict(), 'normalized': OrderedDict()}
+
+        self.utterances = 0
+        self.changed = 0
+        self.emptied = 0
+        self.chars_in = 0
+        self.chars_out = 0
+        self.fillers_removed = 0
+        self.repeats_removed = 0
+        self.compared = 0
+        self.raw_hits = 0
+        self.hits = 0
+
+    @classmethod
+    def from_file(cls, path):
+        """JSON file: {"en": {"fillers": [...], "max_repeat": 2, "capitalize": true}, "hi": {...}}"""
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def collapse_repeats(self, words, max_repeat):
+        """Keep the last max_repeat words of each run of the same word; returns (words, words removed)"""
+        kept = []
+        removed = 0
+        for key, run in groupby(words, key=lambda word: SEPARATORS.sub('', word.lower())):
+            run = list(run)
+            if key and not key.isdigit() and len(run) > max_repeat:
+                removed += len(run) - max_repeat
+                run = run[-max_repeat:]
+            kept.extend(run)
+        return kept, removed
+
+    def normalize(self, text, language):
+        """Cleaned-up text to translate; empty when the utterance was nothing but fillers"""
+        rules = self.rules.get(language)
+        fillers = repeats = 0
+
+        cleaned = THOUSANDS.sub('', text.translate(DEVANAGARI_DIGITS))
+        if rules and rules.fillers:
+            cleaned, fillers = rules.fillers.subn('', cleaned)
+        words = cleaned.split()
+        if rules:
+            words, repeats = self.collapse_repeats(words, rules.max_repeat)
+        cleaned = ' '.join(words)
+        cleaned = SPACE_BEFORE_PUNCTUATION.sub(r'\1', cleaned)
+        cleaned = REPEATED_PUNCTUATION.sub(r'\1', cleaned).lstrip(' ,.')
+        if rules and rules.capitalize and cleaned[:1].islower():
+            cleaned = cleaned[0].upper() + cleaned[1:]
+        if not SEPARATORS.sub('', cleaned):
+            cleaned = ''
+
+        with self.lock:
+            self.utterances += 1
+            self.chars_in += len(text)
+            self.chars_out += len(cleaned)
+            self.fillers_removed += fillers
+            self.repeats_removed += repeats
+            self.emptied += not cleaned
+            self.changed += cleaned != text
+        return cleaned
+
+    def _repeats(self, kind, key):
+        seen = self.seen[kind]
+        hit = key in seen
+        seen[key] = True
+        seen.move_to_end(key)
+        if len(seen) > self.compare_window:
+            seen.popitem(last=False)
+        return hit
+
+    def compare(self, raw, cleaned, language):
+        """Count whether a final, raw and normalized, repeats a recent final exactly as the translation memory keys it"""
+        raw_key, key = (language, memory_key(raw)), (language, memory_key(cleaned))
+        with self.lock:
+            self.compared += 1
+            self.raw_hits += self._repeats('raw', raw_key)
+            self.hits += self._repeats('normalized', key)
+
+    def snapshot(self):
+        raw_rate = self.raw_hits / self.compared if self.compared else 0
+        rate = self.hits / self.compared if self.compared else 0
+        return {
+            'utterances': self.utterances,
+            'changed': self.changed,
+            'emptied': self.emptied,
+            'fillers_removed': self.fillers_removed,
+            'repeats_removed': self.repeats_removed,
+            'chars_in': self.chars_in,
+            'chars_saved': self.chars_in - self.chars_out,
+            'chars_saved_pct': round(100 * (self.chars_in - self.chars_out) / self.chars_in, 1) if self.chars_in else 0,
+            'finals_compared': self.compared,
+            'exact_hit_rate_raw': round(raw_rate, 3),
+            'exact_hit_rate': round(rate, 3),
+            'exact_hit_rate_change': round(rate - raw_rate, 3)
+        }
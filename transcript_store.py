@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Searchable store of past calls' transcripts and translations
+Final transcripts and their translations go into a local SQLite database
+with an FTS5 full-text index (unicode61 tokenizer with Devanagari vowel
+signs kept inside words, so Hindi and English are both searchable). Live calls only append to a deque; a background
+OS thread inserts the rows in batched transactions, so indexing never runs
+on a call's thread. Queries combine a phrase, a phone number and a date
+range. SQLite builds without FTS5 fall back to a LIKE scan.
+"""
+
+import time
+import sqlite3
+import unicodedata
+from collections import deque
+
+try:
+    from gevent import monkey
+    _start_thread = monkey.get_original('_thread', 'start_new_thread')
+    _sleep = monkey.get_original('time', 'sleep')
+except ImportError:
+    import _thread
+    _start_thread = _thread.start_new_thread
+    _sleep = time.sleep
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS calls (
+    conference TEXT PRIMARY KEY,
+    caller_number TEXT,
+    receiver_number TEXT,
+    tenant TEXT,
+    started REAL,
+    ended REAL
+);
+CREATE INDEX IF NOT EXISTS calls_caller ON calls (caller_number);
+CREATE INDEX IF NOT EXISTS calls_receiver ON calls (receiver_number);
+CREATE TABLE IF NOT EXISTS utterances (
+    id INTEGER PRIMARY KEY,
+    conference TEXT NOT NULL,
+    ts REAL NOT NULL,
+    role TEXT,
+    kind TEXT,
+    lang TEXT,
+    text TEXT NOT NULL,
+    source TEXT
+);
+CREATE INDEX IF NOT EXISTS utterances_ts ON utterances (ts);
+CREATE INDEX IF NOT EXISTS utterances_conference ON utterances (conference, ts);
+"""
+
+# unicode61 splits words at combining marks, which would cut हूँ and है down to the same ह
+DEVANAGARI_MARKS = ''.join(chr(c) for c in range(0x0900, 0x0980) if unicodedata.category(chr(c)) in ('Mn', 'Mc'))
+
+FTS_SCHEMA = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS utterances_fts USING fts5(
+    text, content='utterances', content_rowid='id', tokenize="unicode61 tokenchars '{DEVANAGARI_MARKS}'"
+);
+CREATE TRIGGER IF NOT EXISTS utterances_fts_insert AFTER INSERT ON utterances BEGIN
+    INSERT INTO utterances_fts (rowid, text) VALUES (new.id, new.text);
+END;
+"""
+
+_CALL, _ENDED, _UTTERANCE = range(3)
+
+
+class TranscriptStore:
+    def __init__(self, path, batch_size=500, flush_interval=1.0, max_queue=50000):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+
+        db = self.connect()
+        try:
+            db.execute('PRAGMA journal_mode=WAL')  # searches read while the writer inserts
+            db.executescript(SCHEMA)
+            try:
+                db.executescript(FTS_SCHEMA)
+                self.fts = True
+            except sqlite3.OperationalError:
+                self.fts = False
+                print(f"⚠️  SQLite has no FTS5, transcript search will scan")
+        finally:
+            db.close()
+
+        self.queue = deque()
+        self.started = False
+
+        self.stored = 0
+        self.batches = 0
+        self.dropped = 0
+        self.write_errors = 0
+        self.queries = 0
+
+    def connect(self):
+        return sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+
+    def _put(self, record):
+        if len(self.queue) >= self.max_queue:
+            self.dropped += 1
+            return
+        self.queue.append(record)
+
+    def call_started(self, conference, caller_number, receiver_number, tenant=None):
+        self._put((_CALL, (conference, caller_number, receiver_number, tenant, time.time())))
+
+    def call_ended(self, conference):
+        self._put((_ENDED, (time.time(), conference)))
+
+    def record(self, conference, role, kind, lang, text, source=None):
+        """A final transcript (kind='transcript') or its translation (kind='translation')"""
+        self._put((_UTTERANCE, (conference, time.time(), role, kind, lang, text, source)))
+
+    def _write(self, db, batch):
+        with db:
+            for kind, row in batch:
+                if kind == _UTTERANCE:
+                    db.execute('INSERT INTO utterances (conference, ts, role, kind, lang, text, source) '
+                               'VALUES (?, ?, ?, ?, ?, ?, ?)', row)
+                    self.stored += 1
+                elif kind == _CALL:
+                    db.execute('INSERT OR REPLACE INTO calls (conference, caller_number, receiver_number, tenant, started) '
+                               'VALUES (?, ?, ?, ?, ?)', row)
+                else:
+                    db.execute('UPDATE calls SET ended = ? WHERE conference = ?', row)
+        self.batches += 1
+
+    def _writer(self):
+        db = self.connect()
+        while True:
+            _sleep(self.flush_interval)
+            while self.queue:
+                batch = []
+                while self.queue and len(batch) < self.batch_size:
+                    batch.append(self.queue.popleft())
+                try:
+                    self._write(db, batch)
+                except sqlite3.Error as e:
+                    self.write_errors += 1
+                    print(f"⚠️  Transcript batch of {len(batch)} lost: {e}")
+
+    def start(self):
+        if not self.started:
+            self.started = True
+            _start_thread(self._writer, ())
+
+    def search(self, phrase=None, number=None, since=None, until=None, conference=None, limit=50):
+        """
+        Utterances matching all given filters, newest first: `phrase` is matched as an
+        exact phrase in the text, `number` against either party's phone number and
+        `since`/`until` (epoch seconds) bound the utterance time
+        """
+        clauses, params = [], []
+        joins = 'LEFT JOIN calls c ON c.conference = u.conference'
+        if phrase:
+            if self.fts:
+                joins += ' JOIN utterances_fts f ON f.rowid = u.id'
+                clauses.append('utterances_fts MATCH ?')
+                params.append('"' + phrase.replace('"', '""') + '"')
+            else:
+                clauses.append('u.text LIKE ?')
+                params.append(f"%{phrase}%")
+        if number:
+            clauses.append('u.conference IN (SELECT conference FROM calls WHERE caller_number = ? '
+                           'UNION SELECT conference FROM calls WHERE receiver_number = ?)')
+            params += [number, number]
+        if since is not None:
+            clauses.append('u.ts >= ?')
+            params.append(since)
+        if until is not None:
+            clauses.append('u.ts < ?')
+            params.append(until)
+        if conference:
+            clauses.append('u.conference = ?')
+            params.append(conference)
+
+        query = (f"SELECT u.conference, u.ts, u.role, u.kind, u.lang, u.text, u.source, "
+                 f"c.caller_number, c.receiver_number FROM utterances u {joins}"
+                 f"{' WHERE ' + ' AND '.join(clauses) if clauses else ''} ORDER BY u.ts DESC LIMIT ?")
+        params.append(min(int(limit), 500))
+
+        self.queries += 1
+        db = self.connect()
+        try:
+            rows = db.execute(query, params).fetchall()
+        finally:
+            db.close()
+        fields = ('conference', 'ts', 'role', 'kind', 'lang', 'text', 'source', 'caller_number', 'receiver_number')
+        return [dict(zip(fields, row)) for row in rows]
+
+    def snapshot(self):
+        return {
+            'path': self.path,
+            'full_text_index': self.fts,
+            'queued': len(self.queue),
+            'stored': self.stored,
+            'batches': self.batches,
+            'dropped': self.dropped,
+            'write_errors': self.write_errors,
+            'queries': self.queries
+        }
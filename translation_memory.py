@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Local translation memory consulted before the Translate API
+Lookups try, in order: the curated glossary (exact phrase after
+normalization), sentences translated before (exact), then near-identical
+sentences. Near matches are found with MinHash over character trigrams and
+banded locality-sensitive hashing, then verified by exact Jaccard
+similarity against the threshold. A near match must also say the same
+thing: sentences whose numbers (house numbers, amounts, times), negations
+(not, never, नहीं, मत...) or content words differ never match each other.
+Only articles, politeness words and fillers may differ; pronouns, tenses
+and modals (him/her, I/you, is/was, can/must) change the meaning.
+"""
+
+import re
+import json
+import random
+import threading
+from zlib import crc32
+from collections import OrderedDict
+
+# Anything but word characters and Devanagari (whose vowel signs are not \w), plus the dandas
+SEPARATORS = re.compile('(?:[^\\w\u0900-\u0963\u0966-\u097F]|_)+')
+NUMBER = re.compile(r'\d+')
+
+NEGATIONS = frozenset(['not', 'no', 'never', 'nor', 'nothing', 'nobody', 'none', "n't",
+                       'nahi', 'nahin', 'nai', 'mat', 'na', 'नहीं', 'नही', 'मत', 'न', 'ना'])
+# Words a near match may differ in: articles, politeness words and fillers. Everything else,
+# pronouns, auxiliaries and modals included (her/him, I/you, is/was, can/must), must match exactly
+IGNORABLE_WORDS = frozenset('''
+    a an the please pls kindly okay ok oh um umm uh hmm
+    कृपया प्लीज़ जी ओके उम हम्म
+'''.split())
+
+
+def meaning(normalized):
+    """(negations, content words) of a normalized sentence; normalize() has split "don't" into "don t\""""
+    words = normalized.split()
+    negations = [word for word in words if word in NEGATIONS]
+    negations += ["n't" for before, word in zip(words, words[1:]) if word == 't' and before.endswith('n')]
+    content = frozenset(word for word in words
+                        if word not in IGNORABLE_WORDS and word not in NEGATIONS and word != 't' and not word.isdigit())
+    return tuple(sorted(negations)), content
+
+
+def normalize(text):
+    """Lowercase and turn punctuation, symbols and runs of spaces into single spaces"""
+    return SEPARATORS.sub(' ', text.lower()).strip()
+
+
+def shingles(normalized, size=3):
+    padded = f" {normalized} "
+    return frozenset(padded[i:i + size] for i in range(max(1, len(padded) - size + 1)))
+
+
+class Entry:
+    __slots__ = ('pair', 'normalized', 'shingles', 'numbers', 'negations', 'content', 'translation', 'buckets')
+
+    def __init__(self, pair, normalized, grams, translation, buckets):
+        self.pair = pair
+        self.normalized = normalized
+        self.shingles = grams
+        self.numbers = tuple(NUMBER.findall(normalized))
+        self.negations, self.content = meaning(normalized)
+        self.translation = translation
+        self.buckets = buckets
+
+
+class TranslationMemory:
+    def __init__(self, threshold=0.85, num_perm=32, bands=8, max_entries=5000, seed=7):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_entries = max_entries
+        generator = random.Random(seed)
+        self.masks = [generator.getrandbits(64) for _ in range(num_perm)]
+
+        self.glossary = {}              # (source, target) -> {normalized phrase: translation}
+        self.entries = OrderedDict()    # (source, target, normalized) -> Entry, least recently used first
+        self.buckets = {}               # (source, target, band, band signature) -> set of entry keys
+        self.lock = threading.Lock()
+
+        self.hits = {'glossary': 0, 'exact': 0, 'fuzzy': 0}
+        self.misses = 0
+        self.rejected_numbers = 0
+        self.rejected_negations = 0
+        self.rejected_content = 0
+
+    def load_glossary(self, path):
+        """JSON file: {"en:hi": {"phrase": "translation", ...}, "hi:en": {...}}"""
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        for pair, phrases in data.items():
+            source, target = pair.split(':')
+            table = self.glossary.setdefault((source, target), {})
+            for phrase, translation in phrases.items():
+                table[normalize(phrase)] = translation
+        return sum(len(table) for table in self.glossary.values())
+
+    def signature(self, grams):
+        """MinHash signature; each XOR mask stands in for one random permutation of the shingle hashes"""
+        hashes = [crc32(gram.encode()) for gram in grams]  # stable across processes, unlike hash()
+        return [min([h ^ mask for h in hashes]) for mask in self.masks]
+
+    def band_keys(self, pair, grams):
+        signature = self.signature(grams)
+        return [pair + (band, tuple(signature[band * self.rows:(band + 1) * self.rows]))
+                for band in range(self.bands)]
+
+    def lookup(self, text, source, target):
+        """Stored translation for text, or None; the match kind is counted in hits"""
+        pair = (source, target)
+        normalized = normalize(text)
+        glossary = self.glossary.get(pair)
+        if glossary and normalized in glossary:
+            self.hits['glossary'] += 1
+            return glossary[normalized]
+
+        with self.lock:
+            entry = self.entries.get(pair + (normalized,))
+            if entry is not None:
+                self.entries.move_to_end(pair + (normalized,))
+                self.hits['exact'] += 1
+                return entry.translation
+
+        grams = shingles(normalized)
+        numbers = tuple(NUMBER.findall(normalized))
+        negations, content = meaning(normalized)
+        keys = self.band_keys(pair, grams)
+        best, best_similarity = None, self.threshold
+        with self.lock:
+            candidates = set()
+            for key in keys:
+                candidates.update(self.buckets.get(key, ()))
+            for candidate in candidates:
+                entry = self.entries[candidate]
+                overlap = len(grams & entry.shingles)
+                similarity = overlap / (len(grams) + len(entry.shingles) - overlap)
+                if similarity < best_similarity:
+                    continue
+                if entry.numbers != numbers:
+                    self.rejected_numbers += 1
+                    continue
+                if entry.negations != negations:
+                    self.rejected_negations += 1
+                    continue
+                if entry.content != content:
+                    self.rejected_content += 1
+                    continue
+                best, best_similarity = entry, similarity
+            if best is not None:
+                self.entries.move_to_end(pair + (best.normalized,))
+                self.hits['fuzzy'] += 1
+                return best.translation
+        self.misses += 1
+        return None
+
+    def add(self, text, source, target, translation):
+        pair = (source, target)
+        normalized = normalize(text)
+        if not normalized or not translation:
+            return
+        grams = shingles(normalized)
+        key = pair + (normalized,)
+        buckets = self.band_keys(pair, grams)
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = Entry(pair, normalized, grams, translation, buckets)
+            for bucket in buckets:
+                self.buckets.setdefault(bucket, set()).add(key)
+            while len(self.entries) > self.max_entries:
+                self._remove(next(iter(self.entries)))
+
+    def _remove(self, key):
+        entry = self.entries.pop(key)
+        for bucket in entry.buckets:
+            members = self.buckets.get(bucket)
+            if members:
+                members.discard(key)
+                if not members:
+                    del self.buckets[bucket]
+
+    def snapshot(self):
+        lookups = sum(self.hits.values()) + self.misses
+        return {
+            'entries': len(self.entries),
+            'glossary_terms': sum(len(table) for table in self.glossary.values()),
+            'hits': dict(self.hits),
+            'misses': self.misses,
+            'api_calls_avoided': sum(self.hits.values()),
+            'hit_rate': round(sum(self.hits.values()) / lookups, 3) if lookups else 0,
+            'rejected_number_mismatch': self.rejected_numbers,
+            'rejected_negation_mismatch': self.rejected_negations,
+            'rejected_content_mismatch': self.rejected_content,
+            'threshold': self.threshold
+        }
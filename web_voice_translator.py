@@ -54,6 +54,12 @@ HTML_TEMPLATE = """
         .info { background: #d1ecf1; color: #0c5460; }
         textarea { width: 100%; height: 100px; margin: 10px 0; }
         audio { width: 100%; margin: 10px 0; }
+        input, select { padding: 8px; margin: 5px 0; }
+        #captions { background: white; height: 300px; overflow-y: auto; padding: 10px; border-radius: 5px; font-size: 15px; }
+        .caption { margin: 6px 0; }
+        .caption .role { font-weight: bold; margin-right: 6px; }
+        .caption.interim { color: #888; font-style: italic; }
+        .caption.translation { color: #0c5460; padding-left: 20px; }
     </style>
 </head>
 <body>
@@ -76,6 +82,19 @@ HTML_TEMPLATE = """
         <audio id="textAudioPlayer" controls style="display:none;"></audio>
     </div>
     
+    <div class="container">
+        <h3>📺 Live Captions</h3>
+        <input id="captionServer" placeholder="Translator server URL" value="{{ captions_server }}" style="width: 60%;">
+        <input id="captionToken" type="password" placeholder="Token (if required)">
+        <button onclick="loadConferences()">Load Calls</button>
+        <br>
+        <select id="conferenceSelect" style="width: 60%;"></select>
+        <button id="watchBtn" onclick="watchCaptions()">Watch</button>
+        <button id="stopWatchBtn" onclick="stopCaptions()" disabled>Stop</button>
+        <div id="captionStatus" class="status info">Load active calls from the translator server</div>
+        <div id="captions"></div>
+    </div>
+    
     <div class="container">
         <h3>📊 System Status</h3>
         <div id="systemStatus">Loading...</div>
@@ -229,6 +248,85 @@ HTML_TEMPLATE = """
             }
         }
 
+        // Live captions (server-sent events from the translator server's /captions feed)
+        let captionSource = null;
+        const interimLines = {};
+
+        function captionUrl(path) {
+            const base = document.getElementById('captionServer').value.trim().replace(/[/]$/, '');
+            const token = document.getElementById('captionToken').value.trim();
+            return `${base}${path}` + (token ? `?token=${encodeURIComponent(token)}` : '');
+        }
+
+        async function loadConferences() {
+            try {
+                const response = await fetch(captionUrl('/captions'));
+                const result = await response.json();
+                if (!response.ok) throw new Error(result.error);
+                const select = document.getElementById('conferenceSelect');
+                select.innerHTML = '';
+                result.conferences.forEach(call => {
+                    const option = document.createElement('option');
+                    option.value = call.conference;
+                    option.textContent = `${call.caller || 'unknown caller'} - ${new Date(call.started * 1000).toLocaleTimeString()}`;
+                    select.appendChild(option);
+                });
+                document.getElementById('captionStatus').innerHTML =
+                    `<div class="status info">${result.conferences.length} active call(s)</div>`;
+            } catch (error) {
+                document.getElementById('captionStatus').innerHTML = `<div class="status error">Error: ${error.message}</div>`;
+            }
+        }
+
+        function addCaption(event, kind) {
+            const data = JSON.parse(event.data);
+            const box = document.getElementById('captions');
+            let line = kind === 'interim' || kind === 'transcript' ? interimLines[data.role] : null;
+            if (!line) {
+                line = document.createElement('div');
+                box.appendChild(line);
+            }
+            line.className = `caption ${kind}`;
+            line.innerHTML = '';
+            const role = document.createElement('span');
+            role.className = 'role';
+            role.textContent = kind === 'translation' ? `→ ${data.role}:` : `${data.role}:`;
+            line.appendChild(role);
+            line.appendChild(document.createTextNode(data.text));
+            interimLines[data.role] = kind === 'interim' ? line : null;
+            box.scrollTop = box.scrollHeight;
+        }
+
+        function watchCaptions() {
+            const conference = document.getElementById('conferenceSelect').value;
+            if (!conference) return;
+            stopCaptions();
+            document.getElementById('captions').innerHTML = '';
+            captionSource = new EventSource(captionUrl(`/captions/${encodeURIComponent(conference)}`));
+            ['interim', 'transcript', 'translation'].forEach(kind =>
+                captionSource.addEventListener(kind, event => addCaption(event, kind)));
+            captionSource.addEventListener('gap', event => {
+                document.getElementById('captionStatus').innerHTML =
+                    `<div class="status error">Skipped ${JSON.parse(event.data).dropped} caption(s) to catch up</div>`;
+            });
+            captionSource.addEventListener('end', () => {
+                stopCaptions();
+                document.getElementById('captionStatus').innerHTML = '<div class="status info">Call ended</div>';
+            });
+            document.getElementById('watchBtn').disabled = true;
+            document.getElementById('stopWatchBtn').disabled = false;
+            document.getElementById('captionStatus').innerHTML = '<div class="status success">🔴 Live</div>';
+        }
+
+        function stopCaptions() {
+            if (captionSource) {
+                captionSource.close();
+                captionSource = null;
+            }
+            document.getElementById('watchBtn').disabled = false;
+            document.getElementById('stopWatchBtn').disabled = true;
+        }
+
         // Initialize
         checkStatus();
         setInterval(checkStatus, 30000); // Check status every 30 seconds
@@ -239,7 +337,7 @@ HTML_TEMPLATE = """
 
 @app.route('/')
 def home():
-    return render_template_string(HTML_TEMPLATE)
+    return render_template_string(HTML_TEMPLATE, captions_server=os.environ.get('CAPTIONS_SERVER', ''))
 
 @app.route('/health')
 def health():